@@ -1,6 +1,12 @@
 from django.contrib import admin
-from .models import User, UserProfile, BillingInfo
+from .models import User, UserProfile, BillingInfo, SavedChart
 
 admin.site.register(User)
 admin.site.register(UserProfile)
-admin.site.register(BillingInfo)
\ No newline at end of file
+admin.site.register(BillingInfo)
+
+@admin.register(SavedChart)
+class SavedChartAdmin(admin.ModelAdmin):
+    list_display = ('title', 'user', 'chart_type', 'data_size', 'created_at')
+    search_fields = ('title', 'user__username')
+    list_filter = ('chart_type', 'created_at')
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import zipfile
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+
+try:
+    from openpyxl.utils.exceptions import InvalidFileException
+except ImportError:  # 未安装 openpyxl 时 read_excel 抛出 ImportError，不会出现该异常
+    InvalidFileException = ValueError
+
+
+class ChartAggregationService:
+    """图表数据聚合服务
+
+    读取上传的 CSV / XLSX（只读取用到的列），在服务端用 pandas 完成分组、分箱、透视和滑动窗口，
+    返回可直接绘图的 [{'x', 'y'}] 序列；连续型 x 的序列用 LTTB 降采样到 max_points 个点。
+    对已上传文件的聚合结果按 文件+修改时间+参数 缓存，同一数据集只计算一次。
+    """
+
+    OPERATIONS = ('series', 'groupby', 'bin', 'pivot', 'rolling')
+    AGGREGATIONS = ('sum', 'mean', 'count', 'min', 'max', 'median')
+    DEFAULT_POINTS = 1000
+    MAX_POINTS = 10000
+    MAX_BINS = 1000
+    MAX_SERIES = 20
+    CACHE_TIMEOUT = 3600
+
+    # ---- 读取 ----
+
+    def _read(self, source, filename: str, columns: List[str], sheet=None) -> pd.DataFrame:
+        extension = os.path.splitext(filename or '')[1].lower()
+        if extension in ('.xlsx', '.xls'):
+            return pd.read_excel(source, sheet_name=sheet or 0, usecols=columns)
+        if extension in ('.csv', '.txt', ''):
+            return pd.read_csv(source, usecols=columns, encoding_errors='replace')
+        raise ValueError('不支持的文件格式，请上传 CSV 或 XLSX')
+
+    def _numeric_x(self, values: pd.Series) -> Optional[np.ndarray]:
+        """x 为数值或日期时返回可计算面积的数值数组，否则返回 None"""
+        if pd.api.types.is_numeric_dtype(values):
+            return values.to_numpy(dtype=float)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values.to_numpy(dtype='datetime64[ns]').astype('int64').astype(float)
+        return None
+
+    def _coerce_x(self, values: pd.Series) -> pd.Series:
+        """文本列中的数字或日期转换为对应类型，便于排序和降采样"""
+        if values.dtype != object and not pd.api.types.is_string_dtype(values):
+            return values
+        numeric = pd.to_numeric(values, errors='coerce')
+        if numeric.notna().mean() >= 0.9:
+            return numeric
+        dates = pd.to_datetime(values, errors='coerce', format='mixed')
+        if dates.notna().mean() >= 0.9:
+            return dates
+        return values
+
+    def _to_points(self, x: pd.Series, y: pd.Series) -> List[Dict]:
+        x_values = x.dt.strftime('%Y-%m-%d %H:%M:%S') if pd.api.types.is_datetime64_any_dtype(x) else x
+        return [
+            {'x': x_value, 'y': None if pd.isna(y_value) else y_value}
+            for x_value, y_value in zip(x_values.tolist(), y.astype(float).round(6).tolist())
+        ]
+
+    # ---- 降采样 ----
+
+    def lttb(self, x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+        """Largest-Triangle-Three-Buckets 降采样，返回保留点的下标
+
+        首尾点保留，中间按 threshold - 2 个桶划分，每个桶选与上一个选中点、下一个桶均值
+        构成三角形面积最大的点。桶内计算向量化，循环次数等于输出点数。
+        """
+        length = len(x)
+        if threshold >= length or threshold < 3:
+            return np.arange(length)
+
+        edges = np.linspace(1, length - 1, threshold - 1).astype(int)
+        selected = np.empty(threshold, dtype=int)
+        selected[0], selected[-1] = 0, length - 1
+        previous = 0
+        for bucket in range(threshold - 2):
+            start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+            if bucket + 2 < len(edges):
+                next_start, next_end = edges[bucket + 1], max(edges[bucket + 2], edges[bucket + 1] + 1)
+            else:
+                next_start, next_end = length - 1, length
+            average_x, average_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+            areas = np.abs(
+                (x[previous] - average_x) * (y[start:end] - y[previous])
+                - (x[previous] - x[start:end]) * (average_y - y[previous])
+            )
+            previous = start + int(np.argmax(areas))
+            selected[bucket + 1] = previous
+        return selected
+
+    def _downsample(self, x: pd.Series, y: pd.Series, max_points: int):
+        numeric_x = self._numeric_x(x)
+        if len(x) <= max_points:
+            return x, y
+        if numeric_x is None:
+            # 类别型 x 无法插值，保留数值最大的 max_points 个
+            keep = y.astype(float).fillna(float('-inf')).nlargest(max_points).index.sort_values()
+            return x.loc[keep], y.loc[keep]
+        index = self.lttb(numeric_x, np.nan_to_num(y.to_numpy(dtype=float)), max_points)
+        return x.iloc[index], y.iloc[index]
+
+    # ---- 聚合 ----
+
+    def _series(self, name: str, x: pd.Series, y: pd.Series, max_points: int) -> Dict:
+        x, y = self._downsample(x.reset_index(drop=True), y.reset_index(drop=True), max_points)
+        return {'name': name, 'data': self._to_points(x, y)}
+
+    def _aggregate(self, frame: pd.DataFrame, params: Dict) -> List[Dict]:
+        operation, x, y, agg = params['operation'], params['x'], params.get('y'), params['agg']
+        max_points = params['max_points']
+        frame = frame.dropna(subset=[x])
+        frame[x] = self._coerce_x(frame[x])
+        frame = frame.dropna(subset=[x])
+        if y is None:
+            # 没有数值列时统计行数
+            frame = frame.assign(_count=1)
+            y, agg = '_count', 'sum' if agg == 'count' else agg
+        frame[y] = pd.to_numeric(frame[y], errors='coerce')
+        label = params.get('y') or '数量'
+
+        if operation == 'series':
+            frame = frame.sort_values(x)
+            return [self._series(label, frame[x], frame[y], max_points)]
+
+        if operation == 'rolling':
+            frame = frame.sort_values(x)
+            rolled = frame[y].rolling(params['window'], min_periods=1).agg(agg)
+            return [self._series(f'{label}（{params["window"]}点{agg}）', frame[x], rolled, max_points)]
+
+        if operation == 'bin':
+            values = pd.to_numeric(frame[x], errors='coerce')
+            if values.isna().all():
+                raise ValueError('分箱需要数值型的 x 列')
+            bins = pd.cut(values, params['bins'])
+            grouped = frame[y].groupby(bins, observed=False).agg(agg)
+            labels = pd.Series([f'{interval.left:g}~{interval.right:g}' for interval in grouped.index])
+            return [{'name': label, 'data': self._to_points(labels, grouped.reset_index(drop=True))}]
+
+        if operation == 'pivot':
+            by = params['by']
+            table = frame.pivot_table(index=x, columns=by, values=y, aggfunc=agg, observed=False)
+            # 只保留合计最大的 MAX_SERIES 个系列
+            columns = table.sum().nlargest(self.MAX_SERIES).index
+            x_values = pd.Series(table.index)
+            return [self._series(str(column), x_values, table[column].reset_index(drop=True), max_points)
+                    for column in columns]
+
+        grouped = frame.groupby(x, sort=True)[y].agg(agg)
+        return [self._series(label, pd.Series(grouped.index), grouped.reset_index(drop=True), max_points)]
+
+    def parse_params(self, data) -> Dict:
+        """校验聚合参数，错误时返回 {'error': ...}"""
+        params = {
+            'operation': data.get('operation') or 'series',
+            'x': (data.get('x') or '').strip(),
+            'y': (data.get('y') or '').strip() or None,
+            'by': (data.get('by') or '').strip() or None,
+            'agg': data.get('agg') or 'sum',
+            'sheet': data.get('sheet') or None,
+        }
+        if params['operation'] not in self.OPERATIONS:
+            return {'error': f"不支持的操作，可选：{', '.join(self.OPERATIONS)}"}
+        if params['agg'] not in self.AGGREGATIONS:
+            return {'error': f"不支持的聚合方式，可选：{', '.join(self.AGGREGATIONS)}"}
+        if not params['x']:
+            return {'error': '请指定 x 列'}
+        if params['operation'] in ('series', 'rolling') and not params['y']:
+            return {'error': '请指定 y 列'}
+        if params['operation'] == 'pivot' and not params['by']:
+            return {'error': '透视需要指定 by 列'}
+        try:
+            params['max_points'] = min(max(int(data.get('max_points') or self.DEFAULT_POINTS), 3), self.MAX_POINTS)
+            params['bins'] = min(max(int(data.get('bins') or 10), 1), self.MAX_BINS)
+            params['window'] = max(int(data.get('window') or 7), 1)
+        except (TypeError, ValueError):
+            return {'error': 'max_points、bins、window 必须为整数'}
+        return params
+
+    def aggregate(self, source, filename: str, params: Dict) -> Dict:
+        """聚合文件数据，source 为文件路径或上传的文件对象"""
+        columns = list(dict.fromkeys(column for column in (params['x'], params['y'], params['by']) if column))
+        try:
+            frame = self._read(source, filename, columns, params['sheet'])
+        except ImportError:
+            return {'error': '服务器未安装 Excel 读取组件（openpyxl），请上传 CSV'}
+        except (ValueError, zipfile.BadZipFile, InvalidFileException) as exc:
+            # pandas 在列不存在时抛出 ValueError，损坏或截断的 XLSX 抛出 BadZipFile
+            return {'error': f'读取数据失败: {exc}'}
+
+        rows = len(frame)
+        try:
+            series = self._aggregate(frame, params)
+        except (ValueError, TypeError) as exc:
+            return {'error': f'聚合失败: {exc}'}
+        return {'success': True, 'rows': rows, 'series': series}
+
+    def aggregate_file(self, path: str, params: Dict) -> Dict:
+        """聚合已上传的文件，结果按 文件+修改时间+参数 缓存"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return {'error': '文件不存在'}
+        key_source = json.dumps([path, stat.st_mtime_ns, stat.st_size, params], sort_keys=True, default=str)
+        cache_key = f'chart_aggregation:{hashlib.md5(key_source.encode("utf-8")).hexdigest()}'
+        result = cache.get(cache_key)
+        if result is None:
+            result = self.aggregate(path, os.path.basename(path), params)
+            if 'success' in result:
+                cache.set(cache_key, result, self.CACHE_TIMEOUT)
+        return result
+
+# 创建全局实例
+chart_aggregation_service = ChartAggregationService()
@@ -0,0 +1,116 @@
+import hashlib
+from datetime import datetime
+from django.db.models import Count, Max
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class _NotModified(Exception):
+    """校验器命中，直接返回304"""
+
+
+class ConditionalGetMixin:
+    """读接口的条件请求（ETag / Last-Modified）
+
+    认证和权限检查之后、渲染响应之前，用一次聚合查询计算校验器：
+    - 列表：过滤后查询集的 max(updated_at) 与行数
+    - 详情：该行的 updated_at
+    再与请求的查询参数和当前用户一起哈希为弱 ETag。
+    If-None-Match 命中（详情接口没有 If-None-Match 时 If-Modified-Since 不早于最后修改时间）返回304，
+    不会为了计算哈希而序列化整个响应体。
+    列表删除行后 max(updated_at) 不变，只有包含行数的 ETag 能发现变化，
+    因此列表不输出 Last-Modified，也不按 If-Modified-Since 返回304。
+
+    只用 F() 更新计数列的写操作需要同时更新 updated_at，才能让校验器失效；
+    浏览量缓冲刷新不更新 updated_at，弱 ETag 允许这部分数据短暂滞后。
+    """
+
+    conditional_actions = ('list', 'retrieve')
+
+    def get_conditional_aggregates(self, is_detail: bool):
+        """计算校验器的聚合表达式，子类可追加关联表的字段"""
+        if is_detail:
+            return {'last_modified': Max('updated_at')}
+        return {'last_modified': Max('updated_at'), 'count': Count('pk')}
+
+    def use_conditional(self, request) -> bool:
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        action = getattr(self, 'action', None)
+        return action is None or action in self.conditional_actions
+
+    def _is_detail(self) -> bool:
+        lookup_url_kwarg = getattr(self, 'lookup_url_kwarg', None) or getattr(self, 'lookup_field', 'pk')
+        return lookup_url_kwarg in self.kwargs
+
+    def get_conditional_validators(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        is_detail = self._is_detail()
+        if is_detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        validators = queryset.order_by().aggregate(**self.get_conditional_aggregates(is_detail))
+        if is_detail and validators.get('last_modified') is None:
+            # 对象不存在，交给正常流程返回404
+            return None
+        return validators
+
+    def _make_etag(self, request, validators) -> str:
+        user = getattr(request, 'user', None)
+        parts = [
+            self.get_queryset().model._meta.label,
+            request.get_full_path(),
+            str(getattr(user, 'pk', None)),
+        ] + [f'{key}={validators[key]}' for key in sorted(validators)]
+        return 'W/"%s"' % hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def _last_modified(self, validators):
+        timestamps = [value for value in validators.values() if isinstance(value, datetime)]
+        return max(timestamps) if timestamps else None
+
+    def _is_not_modified(self, request, etag, last_modified) -> bool:
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            if if_none_match.strip() == '*':
+                return True
+            # 弱比较：忽略 W/ 前缀
+            etags = {tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(if_none_match)}
+            return etag[2:] in etags
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since and last_modified is not None:
+            since = parse_http_date_safe(if_modified_since)
+            return since is not None and int(last_modified.timestamp()) <= since
+        return False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional_headers = None
+        if not self.use_conditional(request):
+            return
+        validators = self.get_conditional_validators()
+        if validators is None:
+            return
+        etag = self._make_etag(request, validators)
+        last_modified = self._last_modified(validators) if self._is_detail() else None
+        self._conditional_headers = (etag, last_modified)
+        if self._is_not_modified(request, etag, last_modified):
+            raise _NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        headers = getattr(self, '_conditional_headers', None)
+        if headers and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            etag, last_modified = headers
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            # 响应包含当前用户的投票、收藏等状态
+            patch_vary_headers(response, ['Authorization'])
+        return response
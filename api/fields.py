@@ -0,0 +1,40 @@
+import json
+import zlib
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class CompressedJSONField(models.BinaryField):
+    """以 zlib 压缩存储的 JSON 字段
+
+    适合只按主键整体读写、不需要在数据库中查询内容的大块 JSON（例如图表数据）。
+    列表查询应 defer 该字段，避免读出和解压不需要的数据。
+    """
+
+    def __init__(self, *args, level: int = 6, **kwargs):
+        self.level = level
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.level != 6:
+            kwargs['level'] = self.level
+        return name, path, args, kwargs
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        raw = json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+        return super().get_prep_value(zlib.compress(raw.encode('utf-8'), self.level))
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return json.loads(zlib.decompress(bytes(value)).decode('utf-8'))
+
+    def to_python(self, value):
+        # 表单和反序列化传入的已是 Python 对象
+        return value
+
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj), cls=DjangoJSONEncoder, ensure_ascii=False)
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.view_count_service import view_count_service
+
+
+class Command(BaseCommand):
+    help = '把 Redis 中缓冲的浏览量批量写回数据库（建议由定时任务每分钟执行；内存模式下只能由各进程自己写回）'
+
+    def handle(self, *args, **options):
+        updated = view_count_service.flush()
+        self.stdout.write(self.style.SUCCESS(f'已写回 {updated} 条记录的浏览量'))
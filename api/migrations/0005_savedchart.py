@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:43
+
+import api.fields
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_literature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedChart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255, verbose_name='标题')),
+                ('chart_type', models.CharField(max_length=50, verbose_name='图表类型')),
+                ('config', models.JSONField(blank=True, default=dict, verbose_name='图表配置')),
+                ('data', api.fields.CompressedJSONField(verbose_name='图表数据')),
+                ('data_size', models.PositiveIntegerField(default=0, verbose_name='数据点数')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_charts', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '保存的图表',
+                'verbose_name_plural': '保存的图表',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='api_savedch_user_id_a8d339_idx')],
+            },
+        ),
+    ]
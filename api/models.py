@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from .fields import CompressedJSONField
 
 class User(AbstractUser):
     email = models.EmailField(unique=True, verbose_name='邮箱')
@@ -42,6 +43,11 @@ class UserProfile(models.Model):
     receive_cooperation_invitations = models.BooleanField(default=False, verbose_name='同意收到科研合作邀请')
 
 class Literature(models.Model):
+    """旧文献表（已废弃）
+
+    文献统一存放在 literature.Literature，已有数据用 manage.py migrate_api_literature
+    分批迁移（可中断后继续），迁移完成后删除本表。新代码不要再使用。
+    """
     title = models.CharField(max_length=500, verbose_name='标题')
     authors = models.TextField(verbose_name='作者')
     abstract = models.TextField(blank=True, verbose_name='摘要')
@@ -78,3 +84,25 @@ class BillingInfo(models.Model):
 
     def __str__(self):
         return self.institution_name
+
+class SavedChart(models.Model):
+    """用户保存的科研图表（见 ResearchToolsViewSet），图表数据压缩存储"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_charts', verbose_name='用户')
+    title = models.CharField(max_length=255, verbose_name='标题')
+    chart_type = models.CharField(max_length=50, verbose_name='图表类型')
+    config = models.JSONField(default=dict, blank=True, verbose_name='图表配置')
+    data = CompressedJSONField(verbose_name='图表数据')
+    data_size = models.PositiveIntegerField(default=0, verbose_name='数据点数')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        verbose_name = '保存的图表'
+        verbose_name_plural = '保存的图表'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.user.username} - {self.title}'
@@ -0,0 +1,115 @@
+from typing import Iterable, Optional, Set, Tuple
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def parse_projection(request) -> Tuple[Optional[Set[str]], Set[str]]:
+    """解析 ?fields=a,b 和 ?exclude=c，返回 (需要的字段或None, 排除的字段)"""
+    if request is None:
+        return None, set()
+    params = getattr(request, 'query_params', request.GET)
+
+    def split(name):
+        values = set()
+        for value in params.getlist(name):
+            values.update(item.strip() for item in value.split(',') if item.strip())
+        return values
+
+    fields = split('fields')
+    return (fields or None), split('exclude')
+
+
+def project_names(names: Iterable[str], fields: Optional[Set[str]], exclude: Set[str]):
+    """按投影参数筛选字段名，保持原有顺序"""
+    return [name for name in names if (fields is None or name in fields) and name not in exclude]
+
+
+class FieldProjectionMixin:
+    """序列化器字段投影
+
+    根据请求的 ?fields= / ?exclude= 裁剪顶层序列化器的字段（many=True 时裁剪子序列化器），
+    嵌套的序列化器不受影响。只裁剪 GET/HEAD 请求，写请求带 ?fields= 时仍校验和保存全部字段。
+    SerializerMethodField 等无法推断数据来源的字段在 Meta.projection_sources 中声明所需的模型列，
+    供视图下推 .only()。
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        is_top_level = parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+        if not is_top_level:
+            return fields
+
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return fields
+        requested, exclude = parse_projection(request)
+        if requested is None and not exclude:
+            return fields
+        keep = set(project_names(fields, requested, exclude))
+        for name in list(fields):
+            if name not in keep:
+                fields.pop(name)
+        return fields
+
+
+class ProjectionViewMixin:
+    """视图侧的投影下推
+
+    - wants_field(name)：响应是否包含该字段，用于跳过不需要的 prefetch
+    - project_queryset(queryset)：按保留的序列化器字段推导模型列并 .only()
+    只对 list/retrieve 生效，写操作仍加载完整对象。
+    """
+
+    projection_actions = ('list', 'retrieve')
+
+    def get_projection(self):
+        if getattr(self, 'action', None) not in self.projection_actions:
+            return None, set()
+        return parse_projection(self.request)
+
+    def wants_field(self, name: str) -> bool:
+        fields, exclude = self.get_projection()
+        return (fields is None or name in fields) and name not in exclude
+
+    def _projection_columns(self, serializer, queryset) -> Optional[Set[str]]:
+        """推导保留字段所需的模型列，无法推导时返回 None"""
+        model = queryset.model
+        select_related = queryset.query.select_related
+        sources = getattr(getattr(serializer, 'Meta', None), 'projection_sources', {})
+        columns = {model._meta.pk.name}
+        if isinstance(select_related, dict):
+            # select_related 的外键不能被延迟加载
+            columns.update(select_related)
+        for name, field in serializer.fields.items():
+            if name in sources:
+                columns.update(sources[name])
+                continue
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                return None
+            attrs = field.source.split('.')
+            try:
+                model_field = model._meta.get_field(attrs[0])
+            except FieldDoesNotExist:
+                # 注解或属性，无法确定依赖的列
+                return None
+            if model_field.many_to_many or not model_field.concrete:
+                # 反向关联和多对多由 prefetch 加载，不占本表的列
+                continue
+            columns.add(model_field.name)
+            if model_field.is_relation and len(attrs) > 1 and self._is_select_related(select_related, attrs[0]):
+                columns.add('__'.join(attrs))
+        return columns
+
+    def _is_select_related(self, select_related, name: str) -> bool:
+        return select_related is True or (isinstance(select_related, dict) and name in select_related)
+
+    def project_queryset(self, queryset):
+        fields, exclude = self.get_projection()
+        if fields is None and not exclude:
+            return queryset
+        serializer = self.get_serializer()
+        columns = self._projection_columns(serializer, queryset)
+        if columns is None:
+            return queryset
+        return queryset.only(*columns)
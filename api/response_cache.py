@@ -0,0 +1,127 @@
+import functools
+import hashlib
+import time
+from typing import Dict, Iterable
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import post_save, post_delete
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ResponseCacheService:
+    """视图响应缓存
+
+    缓存键由视图、路径参数、排序后的查询参数、用户范围和所依赖模型的代数组成。
+    模型的 post_save / post_delete 信号（见 watch）让该模型的代数加一，
+    旧的缓存键不再被命中，过期后自然淘汰，不需要枚举删除。
+    绕过信号的写操作（update()、bulk_create()）需要手动调用 bump。
+
+    代数计数器保存在缓存里，只有共享的缓存后端（redis、file）才能让一个进程的失效对所有进程生效。
+    locmem 后端每个进程各有一份计数器，其他进程在缓存过期前仍返回旧数据，
+    因此 locmem 下缓存有效期不超过 RESPONSE_CACHE_LOCAL_TIMEOUT。
+    """
+
+    KEY_PREFIX = 'response_cache'
+
+    def __init__(self):
+        self.alias = getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')
+        self.default_timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+        self.local_timeout = getattr(settings, 'RESPONSE_CACHE_LOCAL_TIMEOUT', 60)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _timeout(self, timeout: int = None) -> int:
+        """缓存有效期，进程内缓存的代数不跨进程同步，有效期不超过 local_timeout"""
+        timeout = self.default_timeout if timeout is None else timeout
+        if isinstance(self.cache, LocMemCache):
+            return min(timeout, self.local_timeout)
+        return timeout
+
+    def _label(self, model) -> str:
+        return model if isinstance(model, str) else model._meta.label_lower
+
+    def _generation_key(self, label: str) -> str:
+        return f'{self.KEY_PREFIX}:gen:{label}'
+
+    def generations(self, models: Iterable) -> Dict[str, int]:
+        """获取模型的当前代数"""
+        keys = {self._generation_key(self._label(model)): self._label(model) for model in models}
+        values = self.cache.get_many(list(keys))
+        for key in keys:
+            if key not in values:
+                # 用时间戳作初始值，计数器被淘汰后重建也不会和旧值重复
+                self.cache.add(key, time.time_ns(), None)
+                values[key] = self.cache.get(key)
+        return {keys[key]: value for key, value in values.items()}
+
+    def bump(self, *models):
+        """模型数据变化，使依赖它的缓存失效"""
+        for model in models:
+            key = self._generation_key(self._label(model))
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, time.time_ns(), None)
+
+    def watch(self, *models):
+        """模型保存或删除时自动失效"""
+        for model in models:
+            label = self._label(model)
+            receiver = functools.partial(self._on_change, label)
+            post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f'{self.KEY_PREFIX}:save:{label}')
+            post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f'{self.KEY_PREFIX}:delete:{label}')
+
+    def _on_change(self, label, sender, **kwargs):
+        self.bump(label)
+
+    def _scope(self, request, scope: str) -> str:
+        if scope == 'public':
+            return 'public'
+        user = getattr(request, 'user', None)
+        return f'user:{user.pk}' if user is not None and user.is_authenticated else 'user:anonymous'
+
+    def make_key(self, request, view_name: str, kwargs: Dict, models: Iterable, scope: str) -> str:
+        params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+        generations = sorted(self.generations(models).items())
+        parts = [view_name, repr(sorted(kwargs.items())), repr(params), self._scope(request, scope), repr(generations)]
+        digest = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+        return f'{self.KEY_PREFIX}:{view_name}:{digest}'
+
+    def cached(self, models: Iterable = (), timeout: int = None, scope: str = 'user'):
+        """缓存视图方法的 GET 响应
+
+        models: 响应所依赖的模型，任一模型变化都会使缓存失效
+        scope: 'public' 表示所有用户共享同一份缓存，'user' 按用户区分
+        只缓存 200 响应，连同视图方法设置的响应头（ETag、Cache-Control 等）一起缓存，
+        认证和权限检查仍在视图方法之前执行。
+        """
+        models = tuple(models)
+
+        def decorator(method):
+            @functools.wraps(method)
+            def wrapper(view, request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return method(view, request, *args, **kwargs)
+                view_name = f'{type(view).__module__}.{type(view).__qualname__}.{method.__name__}'
+                key = self.make_key(request, view_name, kwargs, models, scope)
+                cached_response = self.cache.get(key)
+                if cached_response is not None:
+                    response = Response(cached_response['data'])
+                    for header, value in cached_response['headers'].items():
+                        response[header] = value
+                    return response
+                response = method(view, request, *args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    # Content-Type 由渲染器决定，不随缓存保存
+                    headers = {header: value for header, value in response.items() if header.lower() != 'content-type'}
+                    self.cache.set(key, {'data': response.data, 'headers': headers}, self._timeout(timeout))
+                return response
+            return wrapper
+        return decorator
+
+# 创建全局实例
+response_cache = ResponseCacheService()
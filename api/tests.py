@@ -1,8 +1,27 @@
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from rest_framework.test import APIClient
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
 from rest_framework import status
 
+from literature.file_upload_service import file_upload_service
+from .chart_aggregation_service import chart_aggregation_service
+from .models import SavedChart
+from .response_cache import response_cache
+
 User = get_user_model()
 
 
@@ -32,3 +51,165 @@ class UserRegistrationTest(TestCase):
         response = self.client.post('/api/register/', incomplete_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(User.objects.count(), 0)
+
+
+class SavedChartTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='charter', email='charter@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+
+    def test_chart_crud(self):
+        """测试图表按主键保存、分页列表、详情和删除，数据压缩存储"""
+        data = [{'x': f'数据{i}', 'y': i} for i in range(2000)]
+        ids = []
+        for index in range(3):
+            response = self.client.post('/api/research/charts/', {
+                'title': f'图表{index}', 'data': data, 'chart_type': 'bar', 'config': {'x_label': 'X'}
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.append(response.data['data']['id'])
+
+        self.client.delete(f'/api/research/charts/{ids[0]}/')
+        response = self.client.post('/api/research/charts/', {'title': '新图表', 'data': data[:5], 'chart_type': 'line'},
+                                    format='json')
+        self.assertNotIn(response.data['data']['id'], ids)
+
+        response = self.client.get('/api/research/charts/', {'page': 1, 'size': 2})
+        page = response.data['data']
+        self.assertEqual((page['total'], len(page['list'])), (3, 2))
+        self.assertEqual(page['list'][0]['title'], '新图表')
+        self.assertNotIn('data', page['list'][0])
+
+        response = self.client.get(f'/api/research/charts/{ids[1]}/')
+        self.assertEqual((response.data['data']['data'], response.data['data']['data_size']), (data, 2000))
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT data FROM {SavedChart._meta.db_table} WHERE id = %s', [ids[1]])
+            stored = bytes(cursor.fetchone()[0])
+        self.assertLess(len(stored), len(json.dumps(data, ensure_ascii=False)) // 5)
+
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(f'/api/research/charts/{ids[1]}/').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.delete(f'/api/research/charts/{ids[1]}/').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ChartAggregationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', email='analyst@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        lines = ['date,category,value']
+        for day in range(3000):
+            lines.append(f"{date(2020, 1, 1) + timedelta(days=day)},{'AB'[day % 2]},{day % 10}")
+        self.csv = '\n'.join(lines).encode('utf-8')
+
+    def aggregate(self, **params):
+        params['file'] = SimpleUploadedFile('data.csv', self.csv, content_type='text/csv')
+        response = self.client.post('/api/research/charts/aggregate/', params, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data['data']['series']
+
+    def test_lttb_keeps_extremes(self):
+        """测试 LTTB 保留首尾点和尖峰"""
+        x = np.arange(10000, dtype=float)
+        y = np.sin(x / 100)
+        y[5000] = 50
+        index = chart_aggregation_service.lttb(x, y, 100)
+        self.assertEqual((len(index), index[0], index[-1]), (100, 0, 9999))
+        self.assertIn(5000, index)
+        self.assertTrue((np.diff(index) > 0).all())
+
+    def test_aggregate_operations(self):
+        """测试序列降采样、分组、分箱、透视和滑动窗口"""
+        series = self.aggregate(x='date', y='value', max_points=200)
+        self.assertEqual(len(series[0]['data']), 200)
+        self.assertEqual(series[0]['data'][0]['x'], '2020-01-01 00:00:00')
+
+        series = self.aggregate(operation='groupby', x='category', y='value', agg='sum')
+        self.assertEqual(series[0]['data'], [{'x': 'A', 'y': 6000.0}, {'x': 'B', 'y': 7500.0}])
+
+        series = self.aggregate(operation='bin', x='value', bins=2, agg='count')
+        self.assertEqual([point['y'] for point in series[0]['data']], [1500.0, 1500.0])
+
+        series = self.aggregate(operation='pivot', x='value', by='category', y='value', agg='count')
+        self.assertEqual({item['name'] for item in series}, {'A', 'B'})
+
+        series = self.aggregate(operation='rolling', x='date', y='value', window=10, agg='mean', max_points=5000)
+        self.assertEqual(series[0]['data'][-1]['y'], 4.5)
+
+        response = self.client.post('/api/research/charts/aggregate/', {
+            'file': SimpleUploadedFile('data.csv', self.csv), 'x': 'missing', 'y': 'value'
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_aggregate_corrupt_xlsx(self):
+        """测试损坏的 XLSX 返回读取失败而不是500"""
+        upload = SimpleUploadedFile('data.xlsx', b'PK\x03\x04' + b'\x00' * 20)
+        with mock.patch.object(pd, 'read_excel', side_effect=zipfile.BadZipFile('File is not a zip file')):
+            response = self.client.post('/api/research/charts/aggregate/', {
+                'file': upload, 'x': 'date', 'y': 'value'
+            }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['message'].startswith('读取数据失败'))
+
+    def test_aggregate_uploaded_file_is_cached(self):
+        """测试引用自己上传的文件时结果被缓存，其他用户不能引用"""
+        upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_dir, True)
+        with mock.patch.object(file_upload_service, 'upload_dir', upload_dir):
+            response = self.client.post('/api/literature/upload/', {
+                'file': SimpleUploadedFile('data.csv', self.csv, content_type='text/csv')
+            }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        params = {
+            'filename': f"../{response.data['data']['filename']}",
+            'operation': 'groupby', 'x': 'category', 'y': 'value',
+        }
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        with mock.patch.object(file_upload_service, 'upload_dir', upload_dir), \
+                mock.patch.object(chart_aggregation_service, '_read', wraps=chart_aggregation_service._read) as read:
+            first = self.client.post('/api/research/charts/aggregate/', params, format='json')
+            second = self.client.post('/api/research/charts/aggregate/', params, format='json')
+            self.client.force_authenticate(other)
+            refused = self.client.post('/api/research/charts/aggregate/', params, format='json')
+        self.assertEqual(first.status_code, status.HTTP_200_OK, first.data)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(read.call_count, 1)
+        self.assertEqual(refused.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        self.calls = 0
+        test = self
+
+        class CachedView(APIView):
+            permission_classes = []
+
+            @response_cache.cached(models=[SavedChart], timeout=3600, scope='public')
+            def get(self, request):
+                test.calls += 1
+                response = Response({'calls': test.calls})
+                response['Cache-Control'] = 'max-age=60'
+                response['ETag'] = '"v1"'
+                return response
+
+        self.view = CachedView.as_view()
+        self.factory = APIRequestFactory()
+
+    def test_cache_hit_keeps_headers(self):
+        """测试缓存命中时保留原响应设置的响应头"""
+        self.view(self.factory.get('/cached/')).render()
+        response = self.view(self.factory.get('/cached/'))
+        response.render()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(response.data, {'calls': 1})
+        self.assertEqual(response['Cache-Control'], 'max-age=60')
+        self.assertEqual(response['ETag'], '"v1"')
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_locmem_timeout_is_capped(self):
+        """测试 locmem 后端下缓存有效期不超过 RESPONSE_CACHE_LOCAL_TIMEOUT"""
+        self.assertEqual(response_cache._timeout(43200), response_cache.local_timeout)
+        self.assertEqual(response_cache._timeout(10), min(10, response_cache.local_timeout))
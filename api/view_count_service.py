@@ -0,0 +1,165 @@
+import time
+import threading
+import uuid
+from collections import Counter
+from typing import Dict
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Case, When, Value, IntegerField
+import redis
+
+
+class ViewCountService:
+    """浏览量缓冲服务
+
+    每次浏览只在Redis（不可用时为进程内字典）中累加增量，
+    由定时任务（manage.py flush_view_counts）或进程内定时刷新，
+    用一条 UPDATE ... CASE 语句批量写回数据库。
+    热门内容在高并发访问下每个刷新周期只产生一次数据库写入。
+
+    Redis 模式下刷新时把缓冲 key 原子重命名为唯一的 :flushing:<id> key，再在一个事务里读出并删除，
+    上次刷新中断遗留的 :flushing key 在下次刷新时一并写回，不会被覆盖或重复计数。
+    内存模式只适用于单进程部署：增量保存在各自进程内，只能由该进程的后台线程定时写回，
+    flush_view_counts 命令无法刷新其他进程；多进程部署必须配置 Redis。
+    """
+
+    KEY_PREFIX = 'view_counts:'
+    FLUSH_BATCH_SIZE = 500
+
+    def __init__(self):
+        self.flush_interval = getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 60)
+        self._lock = threading.Lock()
+        self._memory_storage: Dict[str, Counter] = {}
+        self._last_flush = time.monotonic()
+        self._flusher = None
+        try:
+            redis_url = getattr(settings, 'REDIS_URL', 'redis://localhost:6379/0')
+            self.redis_client = redis.Redis.from_url(redis_url, decode_responses=True)
+            self.redis_client.ping()
+        except (redis.ConnectionError, redis.TimeoutError, ValueError):
+            # 如果Redis不可用，使用内存存储
+            self.redis_client = None
+
+    def _label(self, model) -> str:
+        return model._meta.label
+
+    def increment(self, model, pk: int, amount: int = 1) -> int:
+        """累加浏览量，返回尚未写回数据库的增量"""
+        label = self._label(model)
+        if self.redis_client:
+            return int(self.redis_client.hincrby(self.KEY_PREFIX + label, pk, amount))
+
+        with self._lock:
+            counter = self._memory_storage.setdefault(label, Counter())
+            counter[pk] += amount
+            pending = counter[pk]
+            if self._flusher is None:
+                self._start_flusher()
+
+        # 没有Redis时各进程自行定时刷新
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return pending
+
+    def _start_flusher(self):
+        """内存模式下启动后台刷新线程，进程空闲时缓冲的增量也会按时写回"""
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True, name='view-count-flusher')
+        self._flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if time.monotonic() - self._last_flush < self.flush_interval:
+                continue
+            try:
+                self.flush()
+            except Exception:
+                # 增量已放回缓冲区，下个周期重试
+                pass
+            finally:
+                connections.close_all()
+
+    def get_pending(self, model, pk: int) -> int:
+        """获取尚未写回数据库的增量"""
+        label = self._label(model)
+        if self.redis_client:
+            return int(self.redis_client.hget(self.KEY_PREFIX + label, pk) or 0)
+        with self._lock:
+            return self._memory_storage.get(label, Counter()).get(pk, 0)
+
+    def _drain(self) -> Dict[str, Dict[int, int]]:
+        """取出并清空所有缓冲的增量"""
+        drained = {}
+        if self.redis_client:
+            for key in self.redis_client.scan_iter(match=self.KEY_PREFIX + '*'):
+                label, separator, _ = key[len(self.KEY_PREFIX):].partition(':flushing')
+                if separator:
+                    # 之前中断的刷新遗留的 key
+                    flushing_key = key
+                else:
+                    flushing_key = f"{key}:flushing:{uuid.uuid4().hex}"
+                    try:
+                        # 重命名是原子操作，刷新期间的新浏览会写入新的key
+                        self.redis_client.rename(key, flushing_key)
+                    except redis.ResponseError:
+                        continue
+                # 读出和删除在同一事务中，并发的刷新不会重复写回同一批增量
+                pipe = self.redis_client.pipeline(transaction=True)
+                pipe.hgetall(flushing_key)
+                pipe.delete(flushing_key)
+                values, _ = pipe.execute()
+                counts = drained.setdefault(label, Counter())
+                for pk, count in values.items():
+                    counts[int(pk)] += int(count)
+        else:
+            with self._lock:
+                drained = {label: dict(counter) for label, counter in self._memory_storage.items() if counter}
+                self._memory_storage = {}
+        return drained
+
+    def _restore(self, label: str, counts: Dict[int, int]):
+        """写回失败时把增量放回缓冲区"""
+        if self.redis_client:
+            pipe = self.redis_client.pipeline()
+            for pk, count in counts.items():
+                pipe.hincrby(self.KEY_PREFIX + label, pk, count)
+            pipe.execute()
+        else:
+            with self._lock:
+                self._memory_storage.setdefault(label, Counter()).update(counts)
+
+    def flush(self) -> int:
+        """把缓冲的浏览量批量写回数据库，返回更新的行数"""
+        self._last_flush = time.monotonic()
+        updated = 0
+        pending = [
+            (label, [(pk, count) for pk, count in counts.items() if count])
+            for label, counts in self._drain().items()
+        ]
+        while pending:
+            label, items = pending[0]
+            model = apps.get_model(label)
+            try:
+                while items:
+                    batch = items[:self.FLUSH_BATCH_SIZE]
+                    increment = Case(
+                        *[When(pk=pk, then=Value(count)) for pk, count in batch],
+                        default=Value(0),
+                        output_field=IntegerField()
+                    )
+                    updated += model.objects.filter(
+                        pk__in=[pk for pk, _ in batch]
+                    ).update(view_count=F('view_count') + increment)
+                    items = items[self.FLUSH_BATCH_SIZE:]
+            except Exception:
+                # 未写回的增量放回缓冲区，等待下次刷新
+                self._restore(label, dict(items))
+                for rest_label, rest_items in pending[1:]:
+                    self._restore(rest_label, dict(rest_items))
+                raise
+            pending.pop(0)
+        return updated
+
+# 创建全局实例
+view_count_service = ViewCountService()
@@ -8,7 +8,7 @@ import math
 from difflib import SequenceMatcher
 import requests
 from bs4 import BeautifulSoup
-from .models import Literature, LiteratureUser
+from literature.models import Literature, LiteratureUser
 
 class PlagiarismCheckViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
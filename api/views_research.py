@@ -2,114 +2,112 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db import models
-from .models import User, Literature, LiteratureUser
-from .serializers import UserSerializer
+from literature.chunked_upload_service import chunked_upload_service
+from literature.file_upload_service import file_upload_service
+from literature.library_stats_service import library_stats_service
+from .chart_aggregation_service import chart_aggregation_service
+from .models import SavedChart
+from .utils import ApiResponse
 import json
+import os
+import numpy as np
 
 class ResearchToolsViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
 
-    def list(self, request):
-        """获取用户保存的图表列表"""
-        charts = request.user.saved_charts or []
-        return Response({
-            'success': True,
-            'data': charts
-        })
+    # 列表每页数量上限
+    MAX_PAGE_SIZE = 100
+
+    def _chart(self, chart: SavedChart, include_data: bool = True) -> dict:
+        item = {
+            'id': chart.id,
+            'title': chart.title,
+            'chart_type': chart.chart_type,
+            'config': chart.config,
+            'data_size': chart.data_size,
+            'created_at': chart.created_at.isoformat(),
+        }
+        if include_data:
+            item['data'] = chart.data
+        return item
+
+    def _get_chart(self, request, pk):
+        try:
+            return SavedChart.objects.get(pk=int(pk), user=request.user)
+        except (TypeError, ValueError, SavedChart.DoesNotExist):
+            return None
 
-    def create(self, request):
-        """保存新图表"""
+    def list(self, request):
+        """获取用户保存的图表列表（分页，不含图表数据）"""
         try:
-            title = request.data.get('title')
-            chart_data = request.data.get('data')
-            chart_type = request.data.get('chart_type')
-            config = request.data.get('config', {})
+            page = max(int(request.query_params.get('page', 1)), 1)
+            size = min(max(int(request.query_params.get('size', 20)), 1), self.MAX_PAGE_SIZE)
+        except ValueError:
+            return ApiResponse.error('分页参数格式错误')
 
-            if not title or not chart_data or not chart_type:
-                return Response({
-                    'success': False,
-                    'message': '缺少必要参数'
-                }, status=status.HTTP_400_BAD_REQUEST)
+        charts = SavedChart.objects.filter(user=request.user).defer('data')
+        total = charts.count()
+        items = [self._chart(chart, include_data=False) for chart in charts[(page - 1) * size:page * size]]
+        return ApiResponse.paginated(items, total, page, size)
 
-            # 获取用户现有图表
-            saved_charts = request.user.saved_charts or []
-            
-            # 创建新图表
-            new_chart = {
-                'id': len(saved_charts) + 1,
-                'title': title,
-                'data': chart_data,
-                'chart_type': chart_type,
-                'config': config,
-                'created_at': str(models.DateTimeField().value_from_object(request.user))
-            }
-            
-            saved_charts.append(new_chart)
-            request.user.saved_charts = saved_charts
-            request.user.save()
+    def create(self, request):
+        """保存新图表"""
+        title = request.data.get('title')
+        chart_data = request.data.get('data')
+        chart_type = request.data.get('chart_type')
+        config = request.data.get('config') or {}
 
-            return Response({
-                'success': True,
-                'message': '图表保存成功',
-                'data': new_chart
-            })
-
-        except Exception as e:
+        if not title or not chart_data or not chart_type:
             return Response({
                 'success': False,
-                'message': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                'message': '缺少必要参数'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        chart = SavedChart.objects.create(
+            user=request.user,
+            title=str(title)[:255],
+            chart_type=str(chart_type)[:50],
+            config=config,
+            data=chart_data,
+            data_size=len(chart_data) if isinstance(chart_data, (list, dict)) else 0
+        )
+
+        return Response({
+            'success': True,
+            'message': '图表保存成功',
+            'data': self._chart(chart)
+        })
 
     def retrieve(self, request, pk=None):
         """获取单个图表详情"""
-        try:
-            charts = request.user.saved_charts or []
-            chart = next((c for c in charts if c['id'] == int(pk)), None)
-            
-            if not chart:
-                return Response({
-                    'success': False,
-                    'message': '图表不存在'
-                }, status=status.HTTP_404_NOT_FOUND)
-
-            return Response({
-                'success': True,
-                'data': chart
-            })
-
-        except Exception as e:
+        chart = self._get_chart(request, pk)
+        if chart is None:
             return Response({
                 'success': False,
-                'message': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                'message': '图表不存在'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'success': True,
+            'data': self._chart(chart)
+        })
 
     def destroy(self, request, pk=None):
         """删除图表"""
         try:
-            charts = request.user.saved_charts or []
-            chart_index = next((i for i, c in enumerate(charts) if c['id'] == int(pk)), None)
-            
-            if chart_index is None:
-                return Response({
-                    'success': False,
-                    'message': '图表不存在'
-                }, status=status.HTTP_404_NOT_FOUND)
-
-            deleted_chart = charts.pop(chart_index)
-            request.user.saved_charts = charts
-            request.user.save()
-
-            return Response({
-                'success': True,
-                'message': '图表删除成功'
-            })
-
-        except Exception as e:
+            deleted, _ = SavedChart.objects.filter(pk=int(pk), user=request.user).delete()
+        except (TypeError, ValueError):
+            deleted = 0
+        if not deleted:
             return Response({
                 'success': False,
-                'message': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                'message': '图表不存在'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'success': True,
+            'message': '图表删除成功'
+        })
 
     @action(detail=False, methods=['get'])
     def templates(self, request):
@@ -204,53 +202,47 @@ class ResearchToolsViewSet(viewsets.ViewSet):
                 'message': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['post'])
+    def aggregate(self, request):
+        """服务端聚合图表数据
+
+        上传 CSV/XLSX（file）或引用自己上传的文件（filename），参数：
+        operation（series/groupby/bin/pivot/rolling）、x、y、by、agg、bins、window、max_points、sheet。
+        返回降采样后的序列，客户端不再需要下载和处理原始数据。
+        """
+        params = chart_aggregation_service.parse_params(request.data)
+        if 'error' in params:
+            return Response({'success': False, 'message': params['error']}, status=status.HTTP_400_BAD_REQUEST)
+
+        file = request.FILES.get('file')
+        filename = request.data.get('filename', '')
+        if file is not None:
+            result = chart_aggregation_service.aggregate(file, file.name, params)
+        elif filename:
+            # 只取文件名部分，防止路径穿越；只能引用自己上传的文件
+            filename = os.path.basename(filename)
+            if chunked_upload_service.file_owner(filename) != request.user.id:
+                return Response({'success': False, 'message': '文件不存在'}, status=status.HTTP_404_NOT_FOUND)
+            path = os.path.join(file_upload_service.upload_dir, filename)
+            result = chart_aggregation_service.aggregate_file(path, params)
+        else:
+            return Response({'success': False, 'message': '请上传数据文件或指定已上传的文件'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if 'error' in result:
+            return Response({'success': False, 'message': result['error']}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'success': True,
+            'data': {'rows': result['rows'], 'series': result['series']}
+        })
+
     @action(detail=False, methods=['get'])
     def statistics_data(self, request):
         """获取科研统计数据"""
         try:
-            # 获取用户文献统计
-            user_literatures = LiteratureUser.objects.filter(user=request.user)
-            
-            # 按年份统计
-            yearly_stats = (
-                user_literatures
-                .annotate(year=models.ExtractYear('created_at'))
-                .values('year')
-                .annotate(count=models.Count('id'))
-                .order_by('year')
-            )
-            
-            # 按领域统计
-            field_stats = (
-                user_literatures
-                .values('literature__category')
-                .annotate(count=models.Count('id'))
-                .order_by('-count')
-            )
-            
-            # 按期刊统计
-            journal_stats = (
-                user_literatures
-                .values('literature__journal__name')
-                .annotate(count=models.Count('id'))
-                .order_by('-count')[:10]
-            )
-            
-            data = {
-                'yearly_data': [
-                    {'x': str(stat['year']), 'y': stat['count']}
-                    for stat in yearly_stats if stat['year']
-                ],
-                'field_data': [
-                    {'x': stat['literature__category'] or '未分类', 'y': stat['count']}
-                    for stat in field_stats
-                ],
-                'journal_data': [
-                    {'x': stat['literature__journal__name'], 'y': stat['count']}
-                    for stat in journal_stats
-                ]
-            }
-            
+            # 按加入年份、领域、期刊的计数预先汇总在 LibraryStats，只读一行
+            data = library_stats_service.dashboard(request.user.pk)
+
             return Response({
                 'success': True,
                 'data': data
@@ -1,10 +1,12 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count, Sum, Avg
+from django.db.models.functions import TruncDate
+from django.utils import timezone
 from django.utils.dateparse import parse_date
-from datetime import datetime, timedelta
-from .models import Literature, User, UserProfile
-from .serializers import LiteratureSerializer
+from datetime import datetime, time, timedelta
+from literature.models import Literature
+from .models import User, UserProfile
 from .utils import ApiResponse
 
 
@@ -35,40 +37,40 @@ class StatisticsView(APIView):
                 end_date = datetime.now().date()
                 start_date = end_date - timedelta(days=30)
 
-            # 基础统计数据
-            total_literature = Literature.objects.filter(
-                created_at__date__range=[start_date, end_date]
-            ).count()
-
-            total_views = Literature.objects.filter(
-                created_at__date__range=[start_date, end_date]
-            ).aggregate(total_views=Sum('view_count'))['total_views'] or 0
+            # 用日期时间范围而不是 created_at__date，查询可以走 created_at 索引
+            period = Literature.objects.filter(
+                created_at__gte=timezone.make_aware(datetime.combine(start_date, time.min)),
+                created_at__lt=timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+            )
 
-            total_downloads = Literature.objects.filter(
-                created_at__date__range=[start_date, end_date]
-            ).aggregate(total_downloads=Sum('download_count'))['total_downloads'] or 0
+            # 基础统计数据
+            totals = period.aggregate(
+                total_literature=Count('id'), total_views=Sum('view_count'), total_downloads=Sum('download_count')
+            )
+            total_literature = totals['total_literature']
+            total_views = totals['total_views'] or 0
+            total_downloads = totals['total_downloads'] or 0
 
             total_users = User.objects.filter(
                 date_joined__date__range=[start_date, end_date]
             ).count()
 
-            # 每日上传趋势
+            # 每日上传趋势（一次分组查询）
+            daily_counts = dict(
+                period.annotate(day=TruncDate('created_at')).values('day')
+                .annotate(count=Count('id')).values_list('day', 'count')
+            )
             weekly_uploads = []
             current_date = start_date
             while current_date <= end_date:
-                count = Literature.objects.filter(
-                    created_at__date=current_date
-                ).count()
                 weekly_uploads.append({
                     'date': current_date.strftime('%Y-%m-%d'),
-                    'count': count
+                    'count': daily_counts.get(current_date, 0)
                 })
                 current_date += timedelta(days=1)
 
             # 领域分布
-            field_queryset = Literature.objects.filter(
-                created_at__date__range=[start_date, end_date]
-            )
+            field_queryset = period
             
             if selected_field != 'all':
                 field_queryset = field_queryset.filter(category__icontains=selected_field)
@@ -89,9 +91,7 @@ class StatisticsView(APIView):
                 field_distribution = [{'field': '暂无数据', 'count': 0}]
 
             # 热门论文
-            top_papers = Literature.objects.filter(
-                created_at__date__range=[start_date, end_date]
-            ).order_by('-view_count')[:10]
+            top_papers = period.order_by('-view_count')[:10]
 
             top_papers_data = []
             for paper in top_papers:
@@ -1,15 +1,30 @@
+from django import forms
 from django.contrib import admin
 from .models import Tag, Question, Answer, Vote, Collection
+from .tag_service import tag_resolver
+
+
+class QuestionAdminForm(forms.ModelForm):
+    new_tags = forms.CharField(
+        label='新增标签',
+        required=False,
+        help_text='多个标签用逗号分隔，不存在的标签会自动创建'
+    )
+
+    class Meta:
+        model = Question
+        fields = '__all__'
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ['name', 'color', 'created_at']
+    list_display = ['name', 'color', 'question_count', 'created_at']
     list_filter = ['color', 'created_at']
     search_fields = ['name']
     ordering = ['-created_at']
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
+    form = QuestionAdminForm
     list_display = ['title', 'author', 'view_count', 'upvote_count', 'created_at']
     list_filter = ['created_at', 'updated_at']
     search_fields = ['title', 'content']
@@ -18,6 +33,13 @@ class QuestionAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        names = form.cleaned_data.get('new_tags', '').replace('，', ',').split(',')
+        tags = tag_resolver.resolve(names)
+        if tags:
+            form.instance.tags.add(*tags)
+
 @admin.register(Answer)
 class AnswerAdmin(admin.ModelAdmin):
     list_display = ['question', 'author', 'is_accepted', 'upvote_count', 'created_at']
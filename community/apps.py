@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class CommunityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'community'
\ No newline at end of file
+    name = 'community'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,87 @@
+import math
+from datetime import timedelta
+from typing import Iterable, Optional
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Question
+
+
+class HotRankService:
+    """问题热度排序服务
+
+    热度 = 互动分 / (发布小时数 + 2) ^ GRAVITY，
+    互动分综合赞同、反对、回答、收藏和浏览量。
+    结果存入带索引的 Question.hot_score 列，热门列表只需按索引范围扫描：
+    - 投票、收藏、回答等事件发生时增量刷新对应问题
+    - 定时任务（manage.py refresh_hot_scores）对活跃窗口内的问题整体衰减
+    """
+
+    UPVOTE_WEIGHT = 1.0
+    DOWNVOTE_WEIGHT = 1.0
+    ANSWER_WEIGHT = 2.0
+    COLLECT_WEIGHT = 2.0
+    VIEW_WEIGHT = 0.5
+    GRAVITY = 1.5
+    BATCH_SIZE = 500
+
+    def __init__(self):
+        self.window_days = getattr(settings, 'HOT_RANK_WINDOW_DAYS', 30)
+
+    def compute(self, upvotes: int, downvotes: int, answers: int, collects: int,
+                views: int, created_at, now=None) -> float:
+        """计算单个问题的热度"""
+        now = now or timezone.now()
+        points = (
+            1
+            + self.UPVOTE_WEIGHT * upvotes
+            - self.DOWNVOTE_WEIGHT * downvotes
+            + self.ANSWER_WEIGHT * answers
+            + self.COLLECT_WEIGHT * collects
+            + self.VIEW_WEIGHT * math.log1p(views)
+        )
+        age_hours = max((now - created_at).total_seconds() / 3600, 0)
+        return max(points, 0) / math.pow(age_hours + 2, self.GRAVITY)
+
+    def _rescore(self, queryset, now) -> int:
+        rows = queryset.annotate(answer_total=Count('answers')).values_list(
+            'id', 'upvote_count', 'downvote_count', 'answer_total',
+            'collect_count', 'view_count', 'created_at'
+        )
+        questions = [
+            Question(pk=pk, hot_score=self.compute(up, down, answers, collects, views, created_at, now))
+            for pk, up, down, answers, collects, views, created_at in rows
+        ]
+        # bulk_update 生成 UPDATE ... CASE 语句，且不会改动 updated_at
+        Question.objects.bulk_update(questions, ['hot_score'], batch_size=self.BATCH_SIZE)
+        return len(questions)
+
+    def refresh(self, question_ids: Iterable[int]) -> int:
+        """事件触发时增量刷新指定问题的热度"""
+        question_ids = list(question_ids)
+        if not question_ids:
+            return 0
+        return self._rescore(Question.objects.filter(pk__in=question_ids).order_by(), timezone.now())
+
+    def decay_all(self, now: Optional[object] = None) -> int:
+        """定时衰减：重算活跃窗口内的问题，窗口外的热度清零"""
+        now = now or timezone.now()
+        cutoff = now - timedelta(days=self.window_days)
+
+        refreshed = 0
+        active_ids = Question.objects.filter(created_at__gte=cutoff).order_by('pk').values_list('pk', flat=True)
+        batch = []
+        for pk in active_ids.iterator(chunk_size=self.BATCH_SIZE):
+            batch.append(pk)
+            if len(batch) >= self.BATCH_SIZE:
+                refreshed += self._rescore(Question.objects.filter(pk__in=batch).order_by(), now)
+                batch = []
+        if batch:
+            refreshed += self._rescore(Question.objects.filter(pk__in=batch).order_by(), now)
+
+        Question.objects.filter(created_at__lt=cutoff).exclude(hot_score=0).update(hot_score=0)
+        return refreshed
+
+# 创建全局实例
+hot_rank_service = HotRankService()
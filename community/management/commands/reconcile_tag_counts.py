@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from community.tag_service import tag_stats_service
+
+
+class Command(BaseCommand):
+    help = '按问题-标签关联表校准标签问题数（建议由定时任务每天执行）'
+
+    def handle(self, *args, **options):
+        updated = tag_stats_service.reconcile()
+        self.stdout.write(self.style.SUCCESS(f'已校准 {updated} 个标签的问题数'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from community.hot_rank_service import hot_rank_service
+
+
+class Command(BaseCommand):
+    help = '重算问题热度（时间衰减，建议由定时任务每10分钟执行）'
+
+    def handle(self, *args, **options):
+        refreshed = hot_rank_service.decay_all()
+        self.stdout.write(self.style.SUCCESS(f'已刷新 {refreshed} 个问题的热度'))
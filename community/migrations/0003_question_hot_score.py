@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0002_alter_answer_options_alter_collection_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='hot_score',
+            field=models.FloatField(default=0, help_text='由 hot_rank_service 维护的时间衰减热度', verbose_name='热度'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['hot_score', 'created_at'], name='community_q_hot_sco_6eaf62_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_question_count(apps, schema_editor):
+    Tag = apps.get_model('community', 'Tag')
+    Question = apps.get_model('community', 'Question')
+    through = Question.tags.through
+    counts = through.objects.filter(tag_id=OuterRef('pk')).order_by().values('tag_id').annotate(
+        total=Count('question_id')
+    ).values('total')
+    Tag.objects.update(question_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0003_question_hot_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='question_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, verbose_name='问题数'),
+        ),
+        migrations.RunPython(backfill_question_count, migrations.RunPython.noop),
+    ]
@@ -8,6 +8,7 @@ User = get_user_model()
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True, verbose_name='标签名称')
     color = models.CharField(max_length=7, default='#007bff', verbose_name='标签颜色')
+    question_count = models.PositiveIntegerField(default=0, db_index=True, verbose_name='问题数')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     
     def __str__(self):
@@ -30,12 +31,14 @@ class Question(models.Model):
     upvote_count = models.PositiveIntegerField(default=0, verbose_name='赞同次数')
     downvote_count = models.PositiveIntegerField(default=0, verbose_name='反对次数')
     collect_count = models.PositiveIntegerField(default=0, verbose_name='收藏次数')
+    hot_score = models.FloatField(default=0, verbose_name='热度', help_text='由 hot_rank_service 维护的时间衰减热度')
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['author', 'created_at']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['hot_score', 'created_at']),
         ]
         verbose_name = '问题'
         verbose_name_plural = '问题'
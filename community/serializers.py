@@ -1,11 +1,15 @@
 from rest_framework import serializers
 from django.contrib.contenttypes.models import ContentType
+from django.db import models
 from .models import Question, Answer, Tag, Vote, Collection
+from .tag_service import tag_resolver
+from api.projection import FieldProjectionMixin
 
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
-        fields = ['id', 'name', 'color', 'created_at']
+        fields = ['id', 'name', 'color', 'question_count', 'created_at']
+        read_only_fields = ['question_count']
 
 class AnswerSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.username', read_only=True)
@@ -24,28 +28,81 @@ class AnswerSerializer(serializers.ModelSerializer):
         # 这里可以返回用户头像URL
         return None
 
-class QuestionListSerializer(serializers.ModelSerializer):
+class UserInteractionMixin:
+    """当前用户投票/收藏状态的批量加载
+
+    序列化一页数据时，第一次访问就为 root.instance 中的全部对象
+    一次性查询当前用户的投票和收藏，结果缓存在序列化上下文中，
+    查询次数与每页条数无关。
+    """
+
+    def _get_user_interactions(self):
+        state = self.context.get('_user_interactions')
+        if state is not None:
+            return state
+
+        state = {'votes': {}, 'collected': set()}
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            instances = self.root.instance
+            if instances is None or isinstance(instances, models.Model):
+                instances = [instances]
+            object_ids = [obj.pk for obj in instances if isinstance(obj, self.Meta.model)]
+            content_type = ContentType.objects.get_for_model(self.Meta.model)
+            state['votes'] = dict(Vote.objects.filter(
+                user=user,
+                content_type=content_type,
+                object_id__in=object_ids
+            ).values_list('object_id', 'vote_type'))
+            state['collected'] = set(Collection.objects.filter(
+                user=user,
+                content_type=content_type,
+                object_id__in=object_ids
+            ).values_list('object_id', flat=True))
+
+        self.context['_user_interactions'] = state
+        return state
+
+    def get_is_collected(self, obj):
+        return obj.pk in self._get_user_interactions()['collected']
+
+    def get_user_vote(self, obj):
+        return self._get_user_interactions()['votes'].get(obj.pk)
+
+class QuestionListSerializer(FieldProjectionMixin, UserInteractionMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.username', read_only=True)
     author_avatar = serializers.SerializerMethodField()
     tags = TagSerializer(many=True, read_only=True)
     answer_count = serializers.SerializerMethodField()
+    is_collected = serializers.SerializerMethodField()
+    user_vote = serializers.SerializerMethodField()
     
     class Meta:
         model = Question
         fields = [
             'id', 'title', 'author_name', 'author_avatar', 'tags', 'created_at',
             'view_count', 'upvote_count', 'downvote_count', 'collect_count',
-            'answer_count'
+            'answer_count', 'is_collected', 'user_vote'
         ]
+        projection_sources = {
+            'author_avatar': [],
+            'answer_count': [],
+            'is_collected': [],
+            'user_vote': [],
+        }
     
     def get_author_avatar(self, obj):
         # 这里可以返回用户头像URL
         return None
     
     def get_answer_count(self, obj):
+        # 优先使用查询集上的 Count('answers') 注解
+        if hasattr(obj, 'answer_count'):
+            return obj.answer_count
         return obj.answers.count()
 
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(FieldProjectionMixin, UserInteractionMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.username', read_only=True)
     author_avatar = serializers.SerializerMethodField()
     tags = TagSerializer(many=True, read_only=True)
@@ -62,37 +119,19 @@ class QuestionSerializer(serializers.ModelSerializer):
             'answers', 'is_collected', 'user_vote'
         ]
         read_only_fields = ['author', 'created_at', 'updated_at']
+        projection_sources = {
+            'author_avatar': [],
+            'is_collected': [],
+            'user_vote': [],
+        }
     
     def get_author_avatar(self, obj):
         # 这里可以返回用户头像URL
         return None
-    
-    def get_is_collected(self, obj):
-        user = self.context['request'].user
-        if user.is_authenticated:
-            content_type = ContentType.objects.get_for_model(Question)
-            return Collection.objects.filter(
-                user=user,
-                content_type=content_type,
-                object_id=obj.id
-            ).exists()
-        return False
-    
-    def get_user_vote(self, obj):
-        user = self.context['request'].user
-        if user.is_authenticated:
-            content_type = ContentType.objects.get_for_model(Question)
-            vote = Vote.objects.filter(
-                user=user,
-                content_type=content_type,
-                object_id=obj.id
-            ).first()
-            return vote.vote_type if vote else None
-        return None
 
 class QuestionCreateSerializer(serializers.ModelSerializer):
     tags = serializers.ListField(
-        child=serializers.CharField(),
+        child=serializers.CharField(max_length=50),
         write_only=True,
         required=False
     )
@@ -103,15 +142,11 @@ class QuestionCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         tags_data = validated_data.pop('tags', [])
-        question = Question.objects.create(
-            author=self.context['request'].user,
-            **validated_data
-        )
+        validated_data.setdefault('author', self.context['request'].user)
+        question = Question.objects.create(**validated_data)
         
-        # 处理标签
-        for tag_name in tags_data:
-            tag, created = Tag.objects.get_or_create(name=tag_name)
-            question.tags.add(tag)
+        # 批量解析标签，查询次数不随标签数量增长
+        question.tags.set(tag_resolver.resolve(tags_data))
         
         return question
 
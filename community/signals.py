@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.db.models.functions import Now
+from django.dispatch import receiver
+
+from .models import Question, Answer, Tag
+from .hot_rank_service import hot_rank_service
+from .tag_service import tag_stats_service
+from api.response_cache import response_cache
+
+
+# 标签列表的响应缓存随标签变化失效
+response_cache.watch(Tag)
+
+
+def _refresh_on_commit(question_id):
+    transaction.on_commit(lambda: hot_rank_service.refresh([question_id]))
+
+
+@receiver(post_save, sender=Question)
+def init_question_hot_score(sender, instance, created, **kwargs):
+    """新问题创建后计算初始热度"""
+    if created:
+        _refresh_on_commit(instance.pk)
+
+
+def _touch_question(question_id):
+    """回答变化时更新问题的 updated_at，使条件请求的校验器失效"""
+    Question.objects.filter(pk=question_id).update(updated_at=Now())
+
+
+@receiver(post_save, sender=Answer)
+def refresh_hot_score_on_answer_created(sender, instance, created, **kwargs):
+    """新增回答后刷新所属问题的热度"""
+    if created:
+        _touch_question(instance.question_id)
+        _refresh_on_commit(instance.question_id)
+
+
+@receiver(post_delete, sender=Answer)
+def refresh_hot_score_on_answer_deleted(sender, instance, **kwargs):
+    """删除回答后刷新所属问题的热度"""
+    _touch_question(instance.question_id)
+    _refresh_on_commit(instance.question_id)
+
+
+@receiver(m2m_changed, sender=Question.tags.through)
+def update_tag_question_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """问题与标签关联变化时增量维护 Tag.question_count，并更新问题的 updated_at"""
+    if action in ('pre_remove', 'pre_clear'):
+        # 删除前记录实际存在的关联，pk_set 中可能包含并未关联的对象
+        links = sender.objects.filter(**{'question_id' if not reverse else 'tag_id': instance.pk})
+        if action == 'pre_remove':
+            links = links.filter(**{'tag_id__in' if not reverse else 'question_id__in': pk_set})
+        instance._removed_tag_links = list(links.values_list('question_id', 'tag_id'))
+        return
+
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            question_ids = [instance.pk]
+        elif action == 'post_add':
+            question_ids = pk_set
+        else:
+            question_ids = [question_id for question_id, _ in getattr(instance, '_removed_tag_links', [])]
+        if question_ids:
+            Question.objects.filter(pk__in=question_ids).update(updated_at=Now())
+
+    if action == 'post_add' and pk_set:
+        if reverse:
+            tag_stats_service.apply_delta([instance.pk], len(pk_set))
+        else:
+            tag_stats_service.apply_delta(pk_set, 1)
+    elif action in ('post_remove', 'post_clear'):
+        removed = getattr(instance, '_removed_tag_links', [])
+        instance._removed_tag_links = []
+        if reverse:
+            tag_stats_service.apply_delta([instance.pk], -len(removed))
+        else:
+            tag_stats_service.apply_delta([tag_id for _, tag_id in removed], -1)
+
+
+@receiver(pre_delete, sender=Question)
+def decrement_tag_count_on_question_delete(sender, instance, **kwargs):
+    """删除问题时关联行被级联删除，不会触发 m2m_changed"""
+    tag_ids = list(Tag.objects.filter(question=instance).values_list('pk', flat=True))
+    tag_stats_service.apply_delta(tag_ids, -1)
@@ -0,0 +1,99 @@
+from typing import Iterable, List
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Tag, Question
+from api.response_cache import response_cache
+
+
+class TagStatsService:
+    """标签统计服务
+
+    Tag.question_count 是反规范化的问题数，由 m2m_changed 信号增量维护，
+    定时任务（manage.py reconcile_tag_counts）按关联表重新校准。
+    热门标签列表缓存在Django缓存中，标签关联变化时失效。
+    """
+
+    POPULAR_CACHE_KEY = 'community:popular_tags'
+    POPULAR_LIMIT = 10
+
+    def __init__(self):
+        self.cache_timeout = getattr(settings, 'POPULAR_TAGS_CACHE_TIMEOUT', 300)
+
+    def get_popular(self) -> List[Tag]:
+        """获取热门标签（缓存）"""
+        tags = cache.get(self.POPULAR_CACHE_KEY)
+        if tags is None:
+            tags = list(Tag.objects.order_by('-question_count', 'id')[:self.POPULAR_LIMIT])
+            cache.set(self.POPULAR_CACHE_KEY, tags, self.cache_timeout)
+        return tags
+
+    def invalidate(self):
+        """热门标签缓存和标签列表的响应缓存失效"""
+        cache.delete(self.POPULAR_CACHE_KEY)
+        # 问题数通过 update() 维护，不会触发 post_save
+        response_cache.bump(Tag)
+
+    def apply_delta(self, tag_ids: Iterable[int], delta: int):
+        """调整标签问题数"""
+        tag_ids = list(tag_ids)
+        if not tag_ids or not delta:
+            return
+        if delta > 0:
+            expression = F('question_count') + delta
+        else:
+            expression = Greatest(F('question_count') + delta, 0)
+        Tag.objects.filter(pk__in=tag_ids).update(question_count=expression)
+        self.invalidate()
+
+    def reconcile(self) -> int:
+        """按关联表重新计算所有标签的问题数"""
+        through = Question.tags.through
+        counts = through.objects.filter(tag_id=OuterRef('pk')).order_by().values('tag_id').annotate(
+            total=Count('question_id')
+        ).values('total')
+        updated = Tag.objects.update(question_count=Coalesce(Subquery(counts), 0))
+        self.invalidate()
+        return updated
+
+
+class TagResolver:
+    """批量标签解析
+
+    把一组标签名解析为 Tag 对象：一次 name__in 查询已有标签，
+    一次 bulk_create(ignore_conflicts=True) 创建缺失标签（并发创建同名标签不会报错），
+    再补查一次新建标签的主键。查询次数与标签数量无关，
+    可用于问题创建、后台管理和批量导入。
+    """
+
+    def normalize(self, names: Iterable[str]) -> List[str]:
+        """去除空白和重复，保持原有顺序"""
+        normalized = []
+        seen = set()
+        for name in names:
+            name = (name or '').strip()
+            if name and name not in seen:
+                seen.add(name)
+                normalized.append(name)
+        return normalized
+
+    def resolve(self, names: Iterable[str]) -> List[Tag]:
+        """按输入顺序返回标签，不存在的自动创建"""
+        names = self.normalize(names)
+        if not names:
+            return []
+
+        tags = {tag.name: tag for tag in Tag.objects.filter(name__in=names)}
+        missing = [name for name in names if name not in tags]
+        if missing:
+            Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+            response_cache.bump(Tag)
+            tags.update({tag.name: tag for tag in Tag.objects.filter(name__in=missing)})
+
+        return [tags[name] for name in names if name in tags]
+
+# 创建全局实例
+tag_stats_service = TagStatsService()
+tag_resolver = TagResolver()
@@ -0,0 +1,402 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from api.view_count_service import view_count_service
+from .hot_rank_service import hot_rank_service
+from .tag_service import tag_resolver
+from .models import Question, Answer, Tag, Vote
+
+User = get_user_model()
+
+
+class VoteTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.voter = User.objects.create_user(username='voter', email='voter@example.com', password='pass12345')
+        self.question = Question.objects.create(title='问题', content='内容', author=self.author)
+        self.answer = Answer.objects.create(question=self.question, author=self.author, content='回答')
+        self.client.force_authenticate(self.voter)
+
+    def test_question_vote_toggle_and_switch(self):
+        """测试投票、改投和取消投票时计数正确"""
+        url = f'/api/community/questions/{self.question.id}/'
+
+        response = self.client.post(url + 'upvote/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['upvote_count'], 1)
+        self.assertEqual(response.data['user_vote'], 'up')
+
+        response = self.client.post(url + 'downvote/')
+        self.assertEqual(response.data['upvote_count'], 0)
+        self.assertEqual(response.data['downvote_count'], 1)
+
+        response = self.client.post(url + 'downvote/')
+        self.assertEqual(response.data['downvote_count'], 0)
+        self.assertIsNone(response.data['user_vote'])
+        self.assertFalse(Vote.objects.exists())
+
+        self.question.refresh_from_db()
+        self.assertEqual((self.question.upvote_count, self.question.downvote_count), (0, 0))
+
+    def test_answer_vote_only_touches_counters(self):
+        """测试回答投票只更新计数列"""
+        Answer.objects.filter(pk=self.answer.pk).update(content='已编辑')
+
+        response = self.client.post(f'/api/community/answers/{self.answer.id}/upvote/')
+        self.assertEqual(response.data['upvote_count'], 1)
+
+        self.answer.refresh_from_db()
+        self.assertEqual(self.answer.upvote_count, 1)
+        self.assertEqual(self.answer.content, '已编辑')
+
+    def test_collect_toggle(self):
+        """测试收藏与取消收藏"""
+        url = f'/api/community/questions/{self.question.id}/collect/'
+        self.assertEqual(self.client.post(url).data['collect_count'], 1)
+        response = self.client.post(url)
+        self.assertEqual(response.data['collect_count'], 0)
+        self.assertFalse(response.data['is_collected'])
+
+
+class ViewCountTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='pass12345')
+        self.question = Question.objects.create(title='问题', content='内容', author=self.user)
+        self.client.force_authenticate(self.user)
+        patcher = mock.patch.object(view_count_service, 'redis_client', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(view_count_service._drain)
+
+    def test_views_are_buffered_until_flush(self):
+        """测试浏览量先缓冲，刷新时一次性写回"""
+        url = f'/api/community/questions/{self.question.id}/increment_view/'
+        for expected in range(1, 4):
+            response = self.client.post(url)
+            self.assertEqual(response.data['view_count'], expected)
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.view_count, 0)
+
+        view_count_service.flush()
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.view_count, 3)
+        self.assertEqual(view_count_service.get_pending(Question, self.question.id), 0)
+
+
+    def test_redis_flush_recovers_interrupted_flush(self):
+        """测试 Redis 模式下上次刷新遗留的 :flushing key 一并写回且不被覆盖"""
+        redis_client = _FakeRedis()
+        key = view_count_service.KEY_PREFIX + Question._meta.label
+        redis_client.hashes[f'{key}:flushing:old'] = {str(self.question.id): '5'}
+        with mock.patch.object(view_count_service, 'redis_client', redis_client):
+            view_count_service.increment(Question, self.question.id, 2)
+            self.assertEqual(view_count_service.flush(), 1)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.view_count, 7)
+        self.assertEqual(redis_client.hashes, {})
+
+
+class _FakeRedis:
+    """测试用的最小 Redis 哈希实现"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hincrby(self, key, field, amount):
+        values = self.hashes.setdefault(key, {})
+        values[str(field)] = str(int(values.get(str(field), 0)) + amount)
+        return int(values[str(field)])
+
+    def scan_iter(self, match):
+        return [key for key in list(self.hashes) if key.startswith(match.rstrip('*'))]
+
+    def rename(self, key, new_key):
+        self.hashes[new_key] = self.hashes.pop(key)
+
+    def pipeline(self, transaction=True):
+        client, results = self, []
+
+        class Pipeline:
+            def hgetall(self, key):
+                results.append(dict(client.hashes.get(key, {})))
+
+            def delete(self, key):
+                results.append(int(client.hashes.pop(key, None) is not None))
+
+            def execute(self):
+                return results
+
+        return Pipeline()
+
+
+class QuestionQueryCountTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='asker', email='asker@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.tag = Tag.objects.create(name='生物信息')
+        # 预热ContentType缓存，避免首次查询影响计数
+        ContentType.objects.get_for_model(Question)
+
+    def create_questions(self, count):
+        for i in range(count):
+            question = Question.objects.create(title=f'问题{i}', content='内容', author=self.user)
+            question.tags.add(self.tag)
+            Answer.objects.create(question=question, author=self.user, content='回答')
+            Vote.objects.create(
+                user=self.user,
+                content_type=ContentType.objects.get_for_model(Question),
+                object_id=question.id,
+                vote_type='up'
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context), response
+
+    def test_list_query_count_is_constant(self):
+        """测试问题列表查询次数与每页条数无关"""
+        self.create_questions(2)
+        small_count, _ = self.count_queries('/api/community/questions/')
+
+        self.create_questions(8)
+        large_count, response = self.count_queries('/api/community/questions/')
+
+        self.assertEqual(small_count, large_count)
+        # 条件请求校验器、分页计数、问题、标签、投票、收藏
+        self.assertEqual(large_count, 6)
+        first = response.data['results'][0]
+        self.assertEqual(first['answer_count'], 1)
+        self.assertEqual(first['user_vote'], 'up')
+        self.assertFalse(first['is_collected'])
+
+    def test_detail_query_count_is_constant(self):
+        """测试问题详情查询次数与回答数量无关"""
+        self.create_questions(1)
+        question = Question.objects.get()
+        url = f'/api/community/questions/{question.id}/'
+        small_count, _ = self.count_queries(url)
+
+        for i in range(5):
+            author = User.objects.create_user(username=f'u{i}', email=f'u{i}@example.com', password='pass12345')
+            Answer.objects.create(question=question, author=author, content='回答')
+        large_count, response = self.count_queries(url)
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(response.data['answers']), 6)
+        self.assertEqual(response.data['user_vote'], 'up')
+
+
+class HotRankTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='hot', email='hot@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+
+    def test_hot_feed_orders_by_engagement_and_decays(self):
+        """测试热门列表按互动分排序，旧问题热度衰减"""
+        quiet = Question.objects.create(title='冷门', content='内容', author=self.user)
+        busy = Question.objects.create(title='热门', content='内容', author=self.user)
+        old = Question.objects.create(title='旧问题', content='内容', author=self.user)
+        Question.objects.filter(pk=busy.pk).update(upvote_count=5, collect_count=2)
+        Question.objects.filter(pk=old.pk).update(
+            upvote_count=5, collect_count=2,
+            created_at=timezone.now() - timedelta(days=7)
+        )
+        Answer.objects.create(question=busy, author=self.user, content='回答')
+        hot_rank_service.decay_all()
+
+        response = self.client.get('/api/community/questions/', {'hot': 1})
+        titles = [item['title'] for item in response.data['results']]
+        self.assertEqual(titles, ['热门', '冷门', '旧问题'])
+
+    def test_vote_refreshes_hot_score(self):
+        """测试投票后即时刷新热度"""
+        question = Question.objects.create(title='问题', content='内容', author=self.user)
+        hot_rank_service.refresh([question.pk])
+        question.refresh_from_db()
+        before = question.hot_score
+
+        self.client.post(f'/api/community/questions/{question.id}/upvote/')
+        question.refresh_from_db()
+        self.assertGreater(question.hot_score, before)
+
+
+class TagCountTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='tagger', email='tagger@example.com', password='pass12345')
+        self.python = Tag.objects.create(name='Python')
+        self.r = Tag.objects.create(name='R')
+        cache.clear()
+
+    def test_question_count_follows_m2m_changes(self):
+        """测试标签问题数随关联增删同步"""
+        first = Question.objects.create(title='问题1', content='内容', author=self.user)
+        second = Question.objects.create(title='问题2', content='内容', author=self.user)
+        first.tags.add(self.python, self.r)
+        second.tags.add(self.python)
+        self.r.question_set.add(second)
+
+        first.tags.remove(self.r)
+        second.tags.remove(self.r)
+        second.tags.remove(self.r)  # 重复删除不重复扣减
+        self.python.refresh_from_db()
+        self.r.refresh_from_db()
+        self.assertEqual((self.python.question_count, self.r.question_count), (2, 0))
+
+        first.delete()
+        second.tags.clear()
+        self.python.refresh_from_db()
+        self.assertEqual(self.python.question_count, 0)
+
+    def test_popular_tags_cache_invalidated_on_change(self):
+        """测试热门标签缓存在关联变化后失效"""
+        question = Question.objects.create(title='问题', content='内容', author=self.user)
+        question.tags.add(self.r)
+        response = self.client.get('/api/community/tags/popular/')
+        self.assertEqual(response.data[0]['name'], 'R')
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/community/tags/popular/')
+
+        other = Question.objects.create(title='问题2', content='内容', author=self.user)
+        question.tags.add(self.python)
+        other.tags.add(self.python)
+        response = self.client.get('/api/community/tags/popular/')
+        self.assertEqual(response.data[0]['name'], 'Python')
+        self.assertEqual(response.data[0]['question_count'], 2)
+
+    def test_tag_list_response_cache(self):
+        """测试标签列表的响应缓存随标签和问题数变化失效"""
+        response = self.client.get('/api/community/tags/', {'page': 1})
+        self.assertEqual(response.data['count'], 2)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/community/tags/', {'page': 1})
+        self.assertEqual(cached.data, response.data)
+
+        Tag.objects.create(name='Go')
+        response = self.client.get('/api/community/tags/', {'page': 1})
+        self.assertEqual(response.data['count'], 3)
+
+        # 问题数通过 update() 维护，同样需要失效
+        question = Question.objects.create(title='问题', content='内容', author=self.user)
+        question.tags.add(self.python)
+        response = self.client.get('/api/community/tags/', {'page': 1})
+        counts = {tag['name']: tag['question_count'] for tag in response.data['results']}
+        self.assertEqual(counts['Python'], 1)
+
+
+class TagResolverTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='writer', email='writer@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        Tag.objects.create(name='Python')
+
+    def test_resolve_keeps_order_and_creates_missing(self):
+        """测试批量解析保持顺序、去重并创建缺失标签"""
+        with self.assertNumQueries(3):
+            tags = tag_resolver.resolve([' R ', 'Python', 'R', '', '测序'])
+        self.assertEqual([tag.name for tag in tags], ['R', 'Python', '测序'])
+        self.assertTrue(all(tag.pk for tag in tags))
+        self.assertEqual(Tag.objects.count(), 3)
+
+    def test_create_question_query_count_independent_of_tags(self):
+        """测试创建问题的查询次数与标签数量无关"""
+        def create(tags):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post('/api/community/questions/', {
+                    'title': '问题', 'content': '内容', 'tags': tags
+                }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(context), response
+
+        small_count, _ = create(['Python', '新标签'])
+        large_count, response = create(['Python'] + [f'标签{i}' for i in range(10)])
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(response.data['tags']), 11)
+        self.assertEqual(Tag.objects.get(name='Python').question_count, 2)
+
+
+class QuestionProjectionTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='viewer', email='viewer@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.question = Question.objects.create(title='问题', content='很长的内容' * 100, author=self.user)
+        Answer.objects.create(question=self.question, author=self.user, content='回答')
+
+    def test_list_fields_are_projected_into_sql(self):
+        """测试 ?fields= 裁剪响应字段并只查询需要的列"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/community/questions/', {'fields': 'id,title,author_name'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'author_name'})
+        question_sql = [query['sql'] for query in context if 'FROM "community_question"' in query['sql']][-1]
+        self.assertNotIn('"community_question"."content"', question_sql)
+
+    def test_detail_exclude_skips_prefetch(self):
+        """测试排除回答时不再预取回答"""
+        url = f'/api/community/questions/{self.question.id}/'
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'exclude': 'answers,tags'})
+        self.assertNotIn('answers', response.data)
+        self.assertIn('content', response.data)
+        self.assertFalse(any('community_answer' in query['sql'] for query in context))
+
+    def test_write_ignores_fields_param(self):
+        """测试写请求带 ?fields= 时仍校验和保存全部字段"""
+        url = f'/api/community/questions/{self.question.id}/?fields=id'
+        response = self.client.patch(url, {'title': '新标题'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.title, '新标题')
+        self.assertIn('content', response.data)
+
+
+class ConditionalRequestTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='poller', email='poller@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.question = Question.objects.create(title='问题', content='内容', author=self.user)
+
+    def test_detail_revalidates_after_vote_and_answer(self):
+        """测试详情 ETag 命中返回304，投票或新回答后失效"""
+        url = f'/api/community/questions/{self.question.id}/'
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        Question.objects.filter(pk=self.question.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        etag = self.client.get(url)['ETag']
+        self.client.post(url + 'upvote/')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['upvote_count'], 1)
+
+        Question.objects.filter(pk=self.question.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        etag = self.client.get('/api/community/questions/')['ETag']
+        Answer.objects.create(question=self.question, author=self.user, content='回答')
+        response = self.client.get('/api/community/questions/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
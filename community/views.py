@@ -3,18 +3,27 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Max, Prefetch
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Question, Answer, Tag, Vote, Collection
+from .vote_service import vote_service
+from .hot_rank_service import hot_rank_service
+from .tag_service import tag_stats_service
+from api.view_count_service import view_count_service
+from api.projection import ProjectionViewMixin
+from api.conditional import ConditionalGetMixin
+from api.response_cache import response_cache
 from .serializers import (
     QuestionSerializer, 
     AnswerSerializer, 
     TagSerializer,
-    QuestionListSerializer
+    QuestionListSerializer,
+    QuestionCreateSerializer
 )
 
-class QuestionViewSet(viewsets.ModelViewSet):
+class QuestionViewSet(ConditionalGetMixin, ProjectionViewMixin, viewsets.ModelViewSet):
     queryset = Question.objects.all()
     serializer_class = QuestionSerializer
     permission_classes = [IsAuthenticated]
@@ -29,13 +38,15 @@ class QuestionViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['author']
     search_fields = ['title', 'content']
-    ordering_fields = ['created_at', 'upvote_count', 'view_count']
+    ordering_fields = ['created_at', 'upvote_count', 'view_count', 'hot_score']
     ordering = ['-created_at']
 
     def get_serializer_class(self):
         """根据动作类型返回对应的序列化器"""
         if self.action == 'list':
             return QuestionListSerializer
+        if self.action == 'create':
+            return QuestionCreateSerializer
         return QuestionSerializer
 
     def get_queryset(self):
@@ -60,102 +71,79 @@ class QuestionViewSet(viewsets.ModelViewSet):
         if self.request.query_params.get('my'):
             queryset = queryset.filter(author=self.request.user)
         
-        # 热门问题（基于浏览量和赞同数）
-        if self.request.query_params.get('hot'):
-            queryset = queryset.annotate(
-                hot_score=Count('view_count') + Count('upvote_count')
-            ).order_by('-hot_score')
-        
-        return queryset.select_related('author').prefetch_related('tags')
+        # 只加载响应中需要的关联（?fields= / ?exclude=）
+        queryset = queryset.select_related('author')
+        if self.wants_field('tags'):
+            queryset = queryset.prefetch_related('tags')
+        if self.action == 'list':
+            if self.wants_field('answer_count'):
+                queryset = queryset.annotate(answer_count=Count('answers', distinct=True))
+        elif self.action == 'retrieve' and self.wants_field('answers'):
+            queryset = queryset.prefetch_related(
+                Prefetch('answers', queryset=Answer.objects.select_related('author'))
+            )
+        return self.project_queryset(queryset)
+
+    def use_conditional(self, request):
+        """热门排序随定时衰减变化，不参与条件请求"""
+        return super().use_conditional(request) and not request.query_params.get('hot')
+
+    def get_conditional_aggregates(self, is_detail):
+        aggregates = super().get_conditional_aggregates(is_detail)
+        if is_detail and self.wants_field('answers'):
+            aggregates['answers_modified'] = Max('answers__updated_at')
+        return aggregates
+
+    def filter_queryset(self, queryset):
+        """热门问题按预先计算的 hot_score 索引排序"""
+        queryset = super().filter_queryset(queryset)
+        ordering_param = api_settings.ORDERING_PARAM
+        if self.request.query_params.get('hot') and not self.request.query_params.get(ordering_param):
+            queryset = queryset.order_by('-hot_score', '-created_at')
+        return queryset
 
     def perform_create(self, serializer):
         """创建新问题"""
         serializer.save(author=self.request.user)
 
+    def create(self, request, *args, **kwargs):
+        """创建问题后返回完整的问题详情"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        data = QuestionSerializer(serializer.instance, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
     @action(detail=True, methods=['post'])
     def upvote(self, request, pk=None):
         """赞同问题"""
         question = self.get_object()
-        content_type = ContentType.objects.get_for_model(Question)
-        
-        vote, created = Vote.objects.get_or_create(
-            user=request.user,
-            content_type=content_type,
-            object_id=question.id,
-            defaults={'vote_type': 'up'}
-        )
-        
-        if not created:
-            if vote.vote_type == 'up':
-                vote.delete()
-                question.upvote_count = max(0, question.upvote_count - 1)
-            else:
-                vote.vote_type = 'up'
-                vote.save()
-                question.upvote_count += 1
-                question.downvote_count = max(0, question.downvote_count - 1)
-        else:
-            question.upvote_count += 1
-        
-        question.save()
-        return Response({'upvote_count': question.upvote_count})
+        result = vote_service.toggle_vote(request.user, question, 'up')
+        hot_rank_service.refresh([question.pk])
+        return Response(result)
 
     @action(detail=True, methods=['post'])
     def downvote(self, request, pk=None):
         """反对问题"""
         question = self.get_object()
-        content_type = ContentType.objects.get_for_model(Question)
-        
-        vote, created = Vote.objects.get_or_create(
-            user=request.user,
-            content_type=content_type,
-            object_id=question.id,
-            defaults={'vote_type': 'down'}
-        )
-        
-        if not created:
-            if vote.vote_type == 'down':
-                vote.delete()
-                question.downvote_count = max(0, question.downvote_count - 1)
-            else:
-                vote.vote_type = 'down'
-                vote.save()
-                question.downvote_count += 1
-                question.upvote_count = max(0, question.upvote_count - 1)
-        else:
-            question.downvote_count += 1
-        
-        question.save()
-        return Response({'downvote_count': question.downvote_count})
+        result = vote_service.toggle_vote(request.user, question, 'down')
+        hot_rank_service.refresh([question.pk])
+        return Response(result)
 
     @action(detail=True, methods=['post'])
     def collect(self, request, pk=None):
         """收藏问题"""
         question = self.get_object()
-        content_type = ContentType.objects.get_for_model(Question)
-        
-        collection, created = Collection.objects.get_or_create(
-            user=request.user,
-            content_type=content_type,
-            object_id=question.id
-        )
-        
-        if not created:
-            collection.delete()
-            question.collect_count = max(0, question.collect_count - 1)
-        else:
-            question.collect_count += 1
-        
-        question.save()
-        return Response({'collect_count': question.collect_count})
+        result = vote_service.toggle_collection(request.user, question)
+        hot_rank_service.refresh([question.pk])
+        return Response(result)
 
     @action(detail=True, methods=['post'])
     def increment_view(self, request, pk=None):
         """增加浏览量"""
         question = self.get_object()
-        question.view_count += 1
-        question.save()
-        return Response({'view_count': question.view_count})
+        pending = view_count_service.increment(Question, question.pk)
+        return Response({'view_count': question.view_count + pending})
 
 class AnswerViewSet(viewsets.ModelViewSet):
     serializer_class = AnswerSerializer
@@ -175,8 +163,8 @@ class AnswerViewSet(viewsets.ModelViewSet):
         - 详情视图：返回所有回答
         """
         if self.action == 'list':
-            return Answer.objects.filter(question_id=self.kwargs['pk'])
-        return Answer.objects.all()
+            return Answer.objects.filter(question_id=self.kwargs['pk']).select_related('author')
+        return Answer.objects.select_related('author')
 
     def perform_create(self, serializer):
         """创建新回答"""
@@ -208,69 +196,30 @@ class AnswerViewSet(viewsets.ModelViewSet):
     def upvote(self, request, pk=None):
         """赞同回答"""
         answer = self.get_object()
-        content_type = ContentType.objects.get_for_model(Answer)
-        
-        vote, created = Vote.objects.get_or_create(
-            user=request.user,
-            content_type=content_type,
-            object_id=answer.id,
-            defaults={'vote_type': 'up'}
-        )
-        
-        if not created:
-            if vote.vote_type == 'up':
-                vote.delete()
-                answer.upvote_count = max(0, answer.upvote_count - 1)
-            else:
-                vote.vote_type = 'up'
-                vote.save()
-                answer.upvote_count += 1
-                answer.downvote_count = max(0, answer.downvote_count - 1)
-        else:
-            answer.upvote_count += 1
-        
-        answer.save()
-        return Response({'upvote_count': answer.upvote_count})
+        return Response(vote_service.toggle_vote(request.user, answer, 'up'))
 
     @action(detail=True, methods=['post'])
     def downvote(self, request, question_pk=None, pk=None):
         """反对回答"""
         answer = self.get_object()
-        content_type = ContentType.objects.get_for_model(Answer)
-        
-        vote, created = Vote.objects.get_or_create(
-            user=request.user,
-            content_type=content_type,
-            object_id=answer.id,
-            defaults={'vote_type': 'down'}
-        )
-        
-        if not created:
-            if vote.vote_type == 'down':
-                vote.delete()
-                answer.downvote_count = max(0, answer.downvote_count - 1)
-            else:
-                vote.vote_type = 'down'
-                vote.save()
-                answer.downvote_count += 1
-                answer.upvote_count = max(0, answer.upvote_count - 1)
-        else:
-            answer.downvote_count += 1
-        
-        answer.save()
-        return Response({'downvote_count': answer.downvote_count})
+        return Response(vote_service.toggle_vote(request.user, answer, 'down'))
 
 class TagViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [AllowAny]
-    
+
+    @response_cache.cached(models=[Tag], scope='public')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @response_cache.cached(models=[Tag], scope='public')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=['get'])
     def popular(self, request):
         """获取热门标签"""
-        popular_tags = Tag.objects.annotate(
-            question_count=Count('question')
-        ).order_by('-question_count')[:10]
-        
+        popular_tags = tag_stats_service.get_popular()
         serializer = self.get_serializer(popular_tags, many=True)
         return Response(serializer.data)
\ No newline at end of file
@@ -0,0 +1,129 @@
+from typing import Dict, Optional
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+
+from .models import Vote, Collection
+
+
+class VoteService:
+    """投票/收藏服务
+
+    通过通用的 Vote/Collection 模型为问题和回答提供统一的切换逻辑。
+    整个切换在一个事务内完成：锁定当前用户的投票记录，
+    计数器只用 F() 表达式增减对应列，不再读出整行再 save()，
+    并发投票不会丢失更新，也不会改写无关字段。
+    """
+
+    COUNTER_FIELDS = {
+        'up': 'upvote_count',
+        'down': 'downvote_count',
+    }
+
+    def _lock_vote(self, user, content_type, object_id) -> Optional[Vote]:
+        return Vote.objects.select_for_update().filter(
+            user=user,
+            content_type=content_type,
+            object_id=object_id
+        ).first()
+
+    def _adjust_counters(self, model, object_id, increments: Dict[str, int]):
+        """按增量更新计数列，减少时不低于0"""
+        updates = {}
+        for field, delta in increments.items():
+            if delta > 0:
+                updates[field] = F(field) + delta
+            elif delta < 0:
+                updates[field] = Greatest(F(field) - (-delta), 0)
+        if updates:
+            # 同时更新 updated_at，使条件请求的校验器失效
+            updates['updated_at'] = Now()
+            model.objects.filter(pk=object_id).update(**updates)
+
+    def toggle_vote(self, user, obj, vote_type: str) -> Dict:
+        """切换投票
+
+        - 未投票：新增投票
+        - 重复同类投票：取消投票
+        - 相反投票：改投，两个计数列同时调整
+        """
+        model = type(obj)
+        content_type = ContentType.objects.get_for_model(model)
+        counter = self.COUNTER_FIELDS[vote_type]
+        opposite = self.COUNTER_FIELDS['down' if vote_type == 'up' else 'up']
+
+        increments = {}
+        user_vote = None
+        with transaction.atomic():
+            vote = self._lock_vote(user, content_type, obj.pk)
+            if vote is None:
+                try:
+                    with transaction.atomic():
+                        Vote.objects.create(
+                            user=user,
+                            content_type=content_type,
+                            object_id=obj.pk,
+                            vote_type=vote_type
+                        )
+                    increments = {counter: 1}
+                    user_vote = vote_type
+                except IntegrityError:
+                    # 同一用户的并发请求已先插入，按已有投票处理
+                    vote = self._lock_vote(user, content_type, obj.pk)
+
+            if vote is not None:
+                if vote.vote_type == vote_type:
+                    vote.delete()
+                    increments = {counter: -1}
+                    user_vote = None
+                else:
+                    Vote.objects.filter(pk=vote.pk).update(vote_type=vote_type)
+                    increments = {counter: 1, opposite: -1}
+                    user_vote = vote_type
+
+            self._adjust_counters(model, obj.pk, increments)
+            counts = model.objects.filter(pk=obj.pk).values('upvote_count', 'downvote_count').first()
+
+        return {
+            'upvote_count': counts['upvote_count'],
+            'downvote_count': counts['downvote_count'],
+            'user_vote': user_vote,
+        }
+
+    def toggle_collection(self, user, obj) -> Dict:
+        """切换收藏"""
+        model = type(obj)
+        content_type = ContentType.objects.get_for_model(model)
+
+        with transaction.atomic():
+            deleted, _ = Collection.objects.filter(
+                user=user,
+                content_type=content_type,
+                object_id=obj.pk
+            ).delete()
+            if deleted:
+                is_collected = False
+                self._adjust_counters(model, obj.pk, {'collect_count': -1})
+            else:
+                try:
+                    with transaction.atomic():
+                        Collection.objects.create(
+                            user=user,
+                            content_type=content_type,
+                            object_id=obj.pk
+                        )
+                    self._adjust_counters(model, obj.pk, {'collect_count': 1})
+                except IntegrityError:
+                    # 并发请求已完成收藏
+                    pass
+                is_collected = True
+            collect_count = model.objects.filter(pk=obj.pk).values_list('collect_count', flat=True).first()
+
+        return {
+            'collect_count': collect_count,
+            'is_collected': is_collected,
+        }
+
+# 创建全局实例
+vote_service = VoteService()
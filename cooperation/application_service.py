@@ -0,0 +1,89 @@
+from typing import Dict, Iterable
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+from django.utils import timezone
+
+from .models import CooperationPost, CooperationApplication, CooperationStatus
+from .recommendation_service import recommendation_service
+
+
+class ApplicationService:
+    """合作申请服务
+
+    CooperationPost.application_count 是待审核申请数，只用 F() 增量维护，
+    不再 COUNT(*) 后 save() 整行。状态变化都用带条件的 UPDATE
+    （WHERE status='pending'）完成，不对帖子加 select_for_update，
+    同一帖子的大量申请只在计数行上短暂加锁，不会互相覆盖。
+    """
+
+    def _adjust_count(self, post_id: int, delta: int):
+        if delta > 0:
+            expression = F('application_count') + delta
+        else:
+            expression = Greatest(F('application_count') + delta, 0)
+        CooperationPost.objects.filter(pk=post_id).update(application_count=expression, updated_at=Now())
+
+    def apply(self, post: CooperationPost, applicant, **fields) -> Dict:
+        """提交申请"""
+        if post.publisher_id == applicant.pk:
+            return {'success': False, 'error': '不能申请自己的合作'}
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    application = CooperationApplication.objects.create(post=post, applicant=applicant, **fields)
+            except IntegrityError:
+                return {'success': False, 'error': '您已申请过该合作'}
+
+            # 条件更新：帖子在此期间被关闭时整个申请回滚
+            updated = CooperationPost.objects.filter(
+                pk=post.pk, status=CooperationStatus.PENDING
+            ).update(application_count=F('application_count') + 1, updated_at=Now())
+            if not updated:
+                transaction.set_rollback(True)
+                return {'success': False, 'error': '该合作已不接受申请'}
+
+        return {'success': True, 'application': application}
+
+    def withdraw(self, application: CooperationApplication):
+        """删除申请，待审核的申请同时扣减计数"""
+        with transaction.atomic():
+            current = CooperationApplication.objects.select_for_update().filter(
+                pk=application.pk
+            ).values_list('status', flat=True).first()
+            if current is None:
+                return
+            CooperationApplication.objects.filter(pk=application.pk).delete()
+            if current == 'pending':
+                self._adjust_count(application.post_id, -1)
+            else:
+                CooperationPost.objects.filter(pk=application.post_id).update(updated_at=Now())
+
+    def review(self, post: CooperationPost, application_ids: Iterable[int], action_type: str,
+               review_note: str = '') -> Dict:
+        """批量审核同一帖子下的待审核申请，返回实际审核的数量"""
+        application_ids = list(application_ids)
+        new_status = 'accepted' if action_type == 'accept' else 'rejected'
+
+        with transaction.atomic():
+            reviewed = CooperationApplication.objects.filter(
+                post=post, pk__in=application_ids, status='pending'
+            ).update(status=new_status, review_note=review_note, reviewed_at=timezone.now())
+            if reviewed:
+                self._adjust_count(post.pk, -reviewed)
+            started = 0
+            if reviewed and action_type == 'accept':
+                # 接受申请后合作开始进行
+                started = CooperationPost.objects.filter(
+                    pk=post.pk, status=CooperationStatus.PENDING
+                ).update(status=CooperationStatus.IN_PROGRESS, updated_at=Now())
+            if started:
+                # 条件更新不会触发 post_save，手动刷新推荐
+                post_id = post.pk
+                transaction.on_commit(lambda: recommendation_service.refresh_post(post_id))
+
+        return {'reviewed': reviewed, 'status': new_status}
+
+# 创建全局实例
+application_service = ApplicationService()
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class CooperationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'cooperation'
\ No newline at end of file
+    name = 'cooperation'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from cooperation.recommendation_service import recommendation_service
+
+
+class Command(BaseCommand):
+    help = (
+        '重建技能共现矩阵并全量重算合作推荐（建议由定时任务每天执行）；'
+        '--pending 只重算帖子变化后延后处理的用户（建议每几分钟执行）'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pending', action='store_true', help='只重算等待中的用户')
+
+    def handle(self, *args, **options):
+        if options['pending']:
+            written = recommendation_service.refresh_pending()
+        else:
+            written = recommendation_service.refresh_all()
+        self.stdout.write(self.style.SUCCESS(f'已写入 {written} 条合作推荐'))
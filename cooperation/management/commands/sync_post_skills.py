@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from cooperation.skill_match_service import skill_match_service
+
+
+class Command(BaseCommand):
+    help = '按 required_skills 重建合作帖子与技能的关联表（修复数据时执行，新增或改名技能会自动同步）'
+
+    def handle(self, *args, **options):
+        total = skill_match_service.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'已重建 {total} 条帖子技能关联'))
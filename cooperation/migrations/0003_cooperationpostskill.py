@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_post_skills(apps, schema_editor):
+    CooperationPost = apps.get_model('cooperation', 'CooperationPost')
+    CooperationPostSkill = apps.get_model('cooperation', 'CooperationPostSkill')
+    Skill = apps.get_model('cooperation', 'Skill')
+    skill_ids = dict(Skill.objects.values_list('name', 'pk'))
+    links = []
+    for post_id, required_skills in CooperationPost.objects.values_list('pk', 'required_skills').iterator():
+        names = {name for name in required_skills or [] if isinstance(name, str)}
+        links.extend(
+            CooperationPostSkill(post_id=post_id, skill_id=skill_ids[name])
+            for name in names if name in skill_ids
+        )
+    CooperationPostSkill.objects.bulk_create(links, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cooperation', '0002_alter_cooperationapplication_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CooperationPostSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='cooperation.cooperationpost', verbose_name='合作帖子')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_links', to='cooperation.skill', verbose_name='技能')),
+            ],
+            options={
+                'verbose_name': '合作帖子技能',
+                'verbose_name_plural': '合作帖子技能',
+                'indexes': [models.Index(fields=['skill', 'post'], name='cooperation_skill_i_e15009_idx')],
+                'unique_together': {('post', 'skill')},
+            },
+        ),
+        migrations.RunPython(backfill_post_skills, migrations.RunPython.noop),
+    ]
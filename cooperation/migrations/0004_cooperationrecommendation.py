@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('cooperation', '0003_cooperationpostskill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CooperationRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='推荐得分')),
+                ('rank', models.PositiveIntegerField(verbose_name='排名')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='计算时间')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='cooperation.cooperationpost', verbose_name='合作帖子')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooperation_recommendations', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '合作推荐',
+                'verbose_name_plural': '合作推荐',
+                'ordering': ['user', 'rank'],
+                'indexes': [models.Index(fields=['user', 'rank'], name='cooperation_user_id_931e57_idx')],
+                'unique_together': {('user', 'post')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_savedchart'),
+        ('cooperation', '0004_cooperationrecommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingRecommendationRefresh',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='加入时间')),
+            ],
+            options={
+                'verbose_name': '待重算推荐',
+                'verbose_name_plural': '待重算推荐',
+            },
+        ),
+    ]
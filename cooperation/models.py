@@ -230,4 +230,64 @@ class UserSkill(models.Model):
     class Meta:
         unique_together = ['user', 'skill']
         verbose_name = '用户技能'
-        verbose_name_plural = '用户技能'
\ No newline at end of file
+        verbose_name_plural = '用户技能'
+
+class CooperationPostSkill(models.Model):
+    """合作帖子与技能的关联表
+
+    由 required_skills 同步生成（见 skill_match_service），
+    技能过滤和推荐通过 (skill, post) 索引连接查询，不依赖数据库的JSON/数组运算。
+    """
+    post = models.ForeignKey(CooperationPost, on_delete=models.CASCADE, related_name='skill_links', verbose_name='合作帖子')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='post_links', verbose_name='技能')
+
+    class Meta:
+        unique_together = ['post', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'post']),
+        ]
+        verbose_name = '合作帖子技能'
+        verbose_name_plural = '合作帖子技能'
+
+    def __str__(self):
+        return f"{self.post_id} - {self.skill_id}"
+
+class CooperationRecommendation(models.Model):
+    """预先计算的个性化推荐
+
+    每个用户保留得分最高的若干条开放合作（见 recommendation_service），
+    推荐列表按 (user, rank) 索引直接读取。
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='cooperation_recommendations', verbose_name='用户')
+    post = models.ForeignKey(CooperationPost, on_delete=models.CASCADE, related_name='recommendations', verbose_name='合作帖子')
+    score = models.FloatField(verbose_name='推荐得分')
+    rank = models.PositiveIntegerField(verbose_name='排名')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='计算时间')
+
+    class Meta:
+        unique_together = ['user', 'post']
+        ordering = ['user', 'rank']
+        indexes = [
+            models.Index(fields=['user', 'rank']),
+        ]
+        verbose_name = '合作推荐'
+        verbose_name_plural = '合作推荐'
+
+    def __str__(self):
+        return f"{self.user_id} - {self.post_id} ({self.score:.3f})"
+
+class PendingRecommendationRefresh(models.Model):
+    """等待重算推荐的用户
+
+    帖子变化影响的用户超过请求内重算的上限时，其余用户记录在这里，
+    由 manage.py refresh_recommendations --pending 批量处理。
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='+', verbose_name='用户')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='加入时间')
+
+    class Meta:
+        verbose_name = '待重算推荐'
+        verbose_name_plural = '待重算推荐'
+
+    def __str__(self):
+        return str(self.user_id)
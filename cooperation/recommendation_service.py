@@ -0,0 +1,263 @@
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    CooperationPost, CooperationApplication, CooperationPostSkill,
+    CooperationRecommendation, CooperationStatus, PendingRecommendationRefresh, Skill, UserSkill
+)
+
+
+class SkillModel:
+    """一次计算所用的技能矩阵快照"""
+
+    def __init__(self, skill_index: Dict[int, int], user_ids: List[int], user_skills, post_ids: List[int],
+                 post_skills, cooccurrence):
+        self.skill_index = skill_index
+        self.user_ids = user_ids
+        self.user_skills = user_skills
+        self.post_ids = post_ids
+        self.post_skills = post_skills
+        self.cooccurrence = cooccurrence
+
+
+class RecommendationService:
+    """个性化合作推荐服务
+
+    1. 由 UserSkill 和帖子技能关联构建稀疏的技能共现矩阵（余弦归一化），
+       用来把用户技能扩展到相关技能
+    2. 用户画像（熟练度加权的技能 + 共现扩展）与开放帖子的技能向量相乘得到得分
+    3. 每个用户保留得分最高的 RECOMMENDATION_TOP_K 条，写入 CooperationRecommendation
+
+    共现矩阵只由定时任务（manage.py refresh_recommendations）全量重建并缓存，技能增删时失效；
+    开放帖子的技能关联同样缓存，帖子变化时失效。用户技能变化时只读取该用户的技能重算，
+    帖子变化时只重算技能相关的用户（见 signals），都不扫描全表。
+    帖子变化在请求内最多重算 inline_refresh_limit 个用户，其余用户记入 PendingRecommendationRefresh，
+    由 manage.py refresh_recommendations --pending 处理。
+    """
+
+    PROFICIENCY_WEIGHTS = {
+        'beginner': 0.25,
+        'intermediate': 0.5,
+        'advanced': 0.75,
+        'expert': 1.0,
+    }
+    EXPANSION_WEIGHT = 0.5
+    USER_BATCH_SIZE = 500
+    COOCCURRENCE_CACHE_KEY = 'recommendation:cooccurrence'
+    OPEN_POSTS_CACHE_KEY = 'recommendation:open_post_skills'
+    # 定时任务每天重建，留出余量
+    CACHE_TIMEOUT = 2 * 24 * 3600
+
+    def __init__(self):
+        self.top_k = getattr(settings, 'RECOMMENDATION_TOP_K', 50)
+        self.inline_refresh_limit = getattr(settings, 'RECOMMENDATION_INLINE_REFRESH_LIMIT', 200)
+
+    def _matrix(self, rows, row_index, skill_index, values=None):
+        data = values if values is not None else [1.0] * len(rows)
+        return sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64),
+             ([row_index[r] for r, _ in rows], [skill_index[s] for _, s in rows])),
+            shape=(len(row_index), len(skill_index))
+        )
+
+    def build_cooccurrence(self):
+        """全量读取用户技能和帖子技能，重建技能共现矩阵并缓存，返回 (skill_index, cooccurrence)"""
+        skill_index = {pk: i for i, pk in enumerate(Skill.objects.order_by('pk').values_list('pk', flat=True))}
+        user_rows = list(UserSkill.objects.values_list('user_id', 'skill_id'))
+        user_index = {pk: i for i, pk in enumerate(sorted({user_id for user_id, _ in user_rows}))}
+        post_rows = list(CooperationPostSkill.objects.values_list('post_id', 'skill_id'))
+        post_index = {pk: i for i, pk in enumerate(sorted({post_id for post_id, _ in post_rows}))}
+
+        # 共现矩阵同时考虑“同一用户掌握”和“同一帖子需要”的技能
+        user_binary = self._matrix(user_rows, user_index, skill_index)
+        post_binary = self._matrix(post_rows, post_index, skill_index)
+        counts = (user_binary.T @ user_binary + post_binary.T @ post_binary).tocsr()
+        norms = np.sqrt(counts.diagonal())
+        norms[norms == 0] = 1.0
+        scale = sparse.diags(1.0 / norms)
+        cooccurrence = (scale @ counts @ scale).tolil()
+        cooccurrence.setdiag(0)
+        cooccurrence = cooccurrence.tocsr()
+        cooccurrence.eliminate_zeros()
+
+        cache.set(self.COOCCURRENCE_CACHE_KEY, (skill_index, cooccurrence), self.CACHE_TIMEOUT)
+        return skill_index, cooccurrence
+
+    def cooccurrence(self):
+        """读取缓存的共现矩阵，不存在时重建一次"""
+        cached = cache.get(self.COOCCURRENCE_CACHE_KEY)
+        return cached if cached is not None else self.build_cooccurrence()
+
+    def invalidate_cooccurrence(self):
+        """技能增删后技能下标变化，缓存的共现矩阵失效"""
+        cache.delete(self.COOCCURRENCE_CACHE_KEY)
+
+    def open_post_rows(self) -> List:
+        """开放帖子的 (post_id, skill_id)，缓存到帖子变化为止"""
+        rows = cache.get(self.OPEN_POSTS_CACHE_KEY)
+        if rows is None:
+            rows = list(CooperationPostSkill.objects.filter(
+                post__status=CooperationStatus.PENDING
+            ).values_list('post_id', 'skill_id'))
+            cache.set(self.OPEN_POSTS_CACHE_KEY, rows, self.CACHE_TIMEOUT)
+        return rows
+
+    def invalidate_open_posts(self):
+        cache.delete(self.OPEN_POSTS_CACHE_KEY)
+
+    def build(self, user_ids: Optional[Iterable[int]] = None) -> SkillModel:
+        """用缓存的共现矩阵构建评分快照，user_ids 为空时包含所有有技能的用户"""
+        skill_index, cooccurrence = self.cooccurrence()
+
+        user_rows = UserSkill.objects.all()
+        if user_ids is not None:
+            user_rows = user_rows.filter(user_id__in=list(user_ids))
+        # 共现矩阵重建之后新增的技能暂时没有下标，下次重建前忽略
+        user_rows = [
+            row for row in user_rows.values_list('user_id', 'skill_id', 'proficiency_level') if row[1] in skill_index
+        ]
+        user_index = {pk: i for i, pk in enumerate(sorted({user_id for user_id, _, _ in user_rows}))}
+        user_skills = self._matrix(
+            [(u, s) for u, s, _ in user_rows], user_index, skill_index,
+            [self.PROFICIENCY_WEIGHTS.get(level, 0.25) for _, _, level in user_rows]
+        )
+
+        open_rows = [(p, s) for p, s in self.open_post_rows() if s in skill_index]
+        post_index = {pk: i for i, pk in enumerate(sorted({post_id for post_id, _ in open_rows}))}
+        post_skills = self._matrix(open_rows, post_index, skill_index)
+
+        return SkillModel(skill_index, list(user_index), user_skills, list(post_index), post_skills, cooccurrence)
+
+    def profiles(self, model: SkillModel):
+        """用户画像：自身技能加上按共现扩展的相关技能"""
+        skill_counts = np.asarray((model.user_skills > 0).sum(axis=1)).ravel()
+        skill_counts[skill_counts == 0] = 1
+        expanded = sparse.diags(1.0 / skill_counts) @ (model.user_skills @ model.cooccurrence)
+        return (model.user_skills + self.EXPANSION_WEIGHT * expanded).tocsr()
+
+    def score(self, model: SkillModel):
+        """计算用户 × 开放帖子得分矩阵（稀疏）"""
+        post_sizes = np.asarray(model.post_skills.sum(axis=1)).ravel()
+        post_sizes[post_sizes == 0] = 1
+        # 按帖子技能数开方归一化，避免列出大量技能的帖子占优
+        normalized_posts = sparse.diags(1.0 / np.sqrt(post_sizes)) @ model.post_skills
+        return (self.profiles(model) @ normalized_posts.T).tocsr()
+
+    def _excluded(self, user_ids: List[int], post_ids: List[int]) -> Dict[int, set]:
+        """用户自己发布或已申请的帖子不推荐"""
+        excluded = {user_id: set() for user_id in user_ids}
+        own = CooperationPost.objects.filter(
+            publisher_id__in=user_ids, pk__in=post_ids
+        ).values_list('publisher_id', 'pk')
+        applied = CooperationApplication.objects.filter(
+            applicant_id__in=user_ids, post_id__in=post_ids
+        ).values_list('applicant_id', 'post_id')
+        for user_id, post_id in list(own) + list(applied):
+            excluded[user_id].add(post_id)
+        return excluded
+
+    def _write(self, model: SkillModel, scores, user_ids: List[int]) -> int:
+        row_index = {pk: i for i, pk in enumerate(model.user_ids)}
+        excluded = self._excluded(user_ids, model.post_ids)
+
+        recommendations = []
+        for user_id in user_ids:
+            if user_id not in row_index:
+                continue
+            row = scores.getrow(row_index[user_id])
+            candidates = [
+                (value, model.post_ids[col]) for col, value in zip(row.indices, row.data)
+                if value > 0 and model.post_ids[col] not in excluded[user_id]
+            ]
+            candidates.sort(key=lambda item: (-item[0], -item[1]))
+            recommendations.extend(
+                CooperationRecommendation(user_id=user_id, post_id=post_id, score=float(value), rank=rank)
+                for rank, (value, post_id) in enumerate(candidates[:self.top_k], start=1)
+            )
+
+        with transaction.atomic():
+            CooperationRecommendation.objects.filter(user_id__in=user_ids).delete()
+            CooperationRecommendation.objects.bulk_create(recommendations, batch_size=self.USER_BATCH_SIZE)
+        return len(recommendations)
+
+    def refresh_users(self, user_ids: Iterable[int]) -> int:
+        """重算指定用户的推荐，返回写入的推荐数"""
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return 0
+        model = self.build(user_ids)
+        scores = self.score(model)
+        written = 0
+        for start in range(0, len(user_ids), self.USER_BATCH_SIZE):
+            written += self._write(model, scores, user_ids[start:start + self.USER_BATCH_SIZE])
+        return written
+
+    def refresh_post(self, post_id: int) -> int:
+        """帖子变化时重算技能相关的用户以及已推荐过该帖子的用户
+
+        已推荐过该帖子的用户优先在请求内重算（帖子关闭后尽快移出推荐），
+        超出 inline_refresh_limit 的用户延后处理。
+        """
+        self.invalidate_open_posts()
+        recommended = set(CooperationRecommendation.objects.filter(post_id=post_id).values_list('user_id', flat=True))
+        skill_ids = CooperationPostSkill.objects.filter(post_id=post_id).values('skill_id')
+        related = set(UserSkill.objects.filter(skill_id__in=skill_ids).values_list('user_id', flat=True))
+        user_ids = sorted(recommended) + sorted(related - recommended)
+        self.defer_users(user_ids[self.inline_refresh_limit:])
+        return self.refresh_users(user_ids[:self.inline_refresh_limit])
+
+    def defer_users(self, user_ids: Iterable[int]):
+        """记录等待重算推荐的用户"""
+        PendingRecommendationRefresh.objects.bulk_create(
+            [PendingRecommendationRefresh(user_id=user_id) for user_id in user_ids],
+            batch_size=self.USER_BATCH_SIZE, ignore_conflicts=True
+        )
+
+    def refresh_pending(self) -> int:
+        """分批重算等待中的用户，返回写入的推荐数"""
+        written = 0
+        while True:
+            user_ids = list(PendingRecommendationRefresh.objects.order_by('created_at').values_list(
+                'user_id', flat=True
+            )[:self.USER_BATCH_SIZE])
+            if not user_ids:
+                return written
+            # 先出队再重算，重算期间再次变化的用户会重新入队
+            PendingRecommendationRefresh.objects.filter(user_id__in=user_ids).delete()
+            written += self.refresh_users(user_ids)
+
+    def refresh_all(self) -> int:
+        """全量重建共现矩阵并重算所有有技能的用户，同时清空此前等待的用户"""
+        started_at = timezone.now()
+        self.build_cooccurrence()
+        self.invalidate_open_posts()
+        user_ids = set(UserSkill.objects.values_list('user_id', flat=True))
+        # 已没有技能的用户清空推荐
+        CooperationRecommendation.objects.exclude(user_id__in=user_ids).delete()
+        written = self.refresh_users(user_ids)
+        PendingRecommendationRefresh.objects.filter(created_at__lte=started_at).delete()
+        return written
+
+    def related_skills(self, user, limit: int = 10) -> List[Skill]:
+        """按共现关系推荐用户尚未掌握的技能，只读取该用户的技能和缓存的共现矩阵"""
+        skill_index, cooccurrence = self.cooccurrence()
+        owned = {
+            skill_index[skill_id]: self.PROFICIENCY_WEIGHTS.get(level, 0.25)
+            for skill_id, level in UserSkill.objects.filter(user=user).values_list('skill_id', 'proficiency_level')
+            if skill_id in skill_index
+        }
+        if not owned:
+            return []
+        weights = np.asarray(cooccurrence[list(owned)].T @ np.asarray(list(owned.values()))).ravel()
+        skill_ids = {i: pk for pk, i in skill_index.items()}
+        ranked = [i for i in np.argsort(-weights, kind='stable') if weights[i] > 0 and i not in owned][:limit]
+        skills = Skill.objects.in_bulk([skill_ids[i] for i in ranked])
+        return [skills[skill_ids[i]] for i in ranked if skill_ids[i] in skills]
+
+# 创建全局实例
+recommendation_service = RecommendationService()
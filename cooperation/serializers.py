@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import models
 from .models import CooperationPost, CooperationApplication, Skill, UserSkill
+from api.projection import FieldProjectionMixin
 
 User = get_user_model()
 
@@ -30,16 +32,48 @@ class CooperationApplicationSerializer(serializers.ModelSerializer):
             'available_start_date', 'status', 'review_note', 'created_at',
             'reviewed_at'
         ]
-        read_only_fields = ['applicant', 'created_at', 'reviewed_at', 'review_note']
+        read_only_fields = ['post', 'applicant', 'status', 'created_at', 'reviewed_at', 'review_note']
     
     def get_applicant_avatar(self, obj):
         return None
 
-class CooperationPostListSerializer(serializers.ModelSerializer):
+class SkillLoaderMixin:
+    """所需技能的批量加载
+
+    序列化一页合作帖子时，第一次访问就收集 root.instance 中全部帖子的
+    required_skills，用一次 name__in 查询取出技能，结果缓存在序列化上下文中，
+    查询次数与每页条数无关。
+    """
+
+    def _get_skill_map(self):
+        skill_map = self.context.get('_skill_map')
+        if skill_map is not None:
+            return skill_map
+
+        instances = self.root.instance
+        if instances is None or isinstance(instances, models.Model):
+            instances = [instances]
+        names = set()
+        for obj in instances:
+            if isinstance(obj, CooperationPost):
+                names.update(name for name in obj.required_skills or [] if isinstance(name, str))
+
+        skill_map = {}
+        if names:
+            skills = list(Skill.objects.filter(name__in=names))
+            skill_map = {skill.name: data for skill, data in zip(skills, SkillSerializer(skills, many=True).data)}
+
+        self.context['_skill_map'] = skill_map
+        return skill_map
+
+    def get_required_skills_display(self, obj):
+        skill_map = self._get_skill_map()
+        return [skill_map[name] for name in obj.required_skills or [] if name in skill_map]
+
+class CooperationPostListSerializer(FieldProjectionMixin, SkillLoaderMixin, serializers.ModelSerializer):
     publisher_name = serializers.CharField(source='publisher.username', read_only=True)
     publisher_avatar = serializers.SerializerMethodField()
     required_skills_display = serializers.SerializerMethodField()
-    application_count = serializers.SerializerMethodField()
     
     class Meta:
         model = CooperationPost
@@ -48,17 +82,16 @@ class CooperationPostListSerializer(serializers.ModelSerializer):
             'budget', 'difficulty_level', 'status', 'created_at', 'deadline',
             'required_skills_display', 'application_count', 'tags'
         ]
+        read_only_fields = ['application_count']
+        projection_sources = {
+            'publisher_avatar': [],
+            'required_skills_display': ['required_skills'],
+        }
     
     def get_publisher_avatar(self, obj):
         return None
-    
-    def get_required_skills_display(self, obj):
-        return obj.required_skills
-    
-    def get_application_count(self, obj):
-        return obj.applications.filter(status='pending').count()
 
-class CooperationPostSerializer(serializers.ModelSerializer):
+class CooperationPostSerializer(FieldProjectionMixin, SkillLoaderMixin, serializers.ModelSerializer):
     publisher_name = serializers.CharField(source='publisher.username', read_only=True)
     publisher_avatar = serializers.SerializerMethodField()
     applications = CooperationApplicationSerializer(many=True, read_only=True)
@@ -77,13 +110,13 @@ class CooperationPostSerializer(serializers.ModelSerializer):
             'publisher', 'created_at', 'updated_at', 'view_count',
             'application_count', 'applications'
         ]
+        projection_sources = {
+            'publisher_avatar': [],
+            'required_skills_display': ['required_skills'],
+        }
     
     def get_publisher_avatar(self, obj):
         return None
-    
-    def get_required_skills_display(self, obj):
-        skills = Skill.objects.filter(name__in=obj.required_skills)
-        return SkillSerializer(skills, many=True).data
 
 class CooperationPostCreateSerializer(serializers.ModelSerializer):
     tags = serializers.ListField(
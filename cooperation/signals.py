@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import CooperationPost, CooperationApplication, CooperationRecommendation, Skill, UserSkill
+from .skill_match_service import skill_match_service
+from .recommendation_service import recommendation_service
+from api.response_cache import response_cache
+
+
+# 技能列表的响应缓存随技能变化失效
+response_cache.watch(Skill)
+
+
+@receiver(post_save, sender=CooperationPost)
+def sync_post_skills(sender, instance, update_fields=None, **kwargs):
+    """帖子保存后同步技能关联表，并刷新相关用户的推荐"""
+    if update_fields is not None and not {'required_skills', 'status'} & set(update_fields):
+        return
+    if update_fields is None or 'required_skills' in update_fields:
+        skill_match_service.sync(instance)
+    post_id = instance.pk
+    transaction.on_commit(lambda: recommendation_service.refresh_post(post_id))
+
+
+@receiver(post_save, sender=UserSkill)
+@receiver(post_delete, sender=UserSkill)
+def refresh_recommendations_on_skill_change(sender, instance, **kwargs):
+    """用户技能变化后重算该用户的推荐"""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: recommendation_service.refresh_users([user_id]))
+
+
+@receiver(post_save, sender=CooperationApplication)
+def remove_applied_recommendation(sender, instance, created, **kwargs):
+    """已申请的合作从推荐中移除"""
+    if created:
+        CooperationRecommendation.objects.filter(user_id=instance.applicant_id, post_id=instance.post_id).delete()
+
+
+@receiver(pre_save, sender=Skill)
+def track_skill_name(sender, instance, **kwargs):
+    """记录技能名是否变化，改名后需要重新同步帖子关联"""
+    if instance._state.adding or instance.pk is None:
+        instance._name_changed = True
+        return
+    old_name = Skill.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+    instance._name_changed = old_name != instance.name
+
+
+@receiver(post_save, sender=Skill)
+def sync_skill_posts(sender, instance, created, **kwargs):
+    """新增或改名技能后同步提到该技能名的帖子，缓存的共现矩阵和开放帖子技能失效"""
+    if not getattr(instance, '_name_changed', created):
+        return
+    if skill_match_service.sync_skill(instance):
+        recommendation_service.invalidate_open_posts()
+    if created:
+        recommendation_service.invalidate_cooccurrence()
+
+
+@receiver(post_delete, sender=Skill)
+def invalidate_skill_caches(sender, instance, **kwargs):
+    """删除技能时帖子关联随外键级联删除，缓存的共现矩阵和开放帖子技能失效"""
+    recommendation_service.invalidate_cooccurrence()
+    recommendation_service.invalidate_open_posts()
@@ -0,0 +1,100 @@
+from typing import Iterable, List
+from django.db import transaction
+from django.db.models import Count
+
+from .models import CooperationPost, CooperationPostSkill, Skill
+
+
+class SkillMatchService:
+    """合作帖子技能匹配服务
+
+    required_skills 是JSON列表，无法建索引，且 __overlap 查询只在PostgreSQL数组字段上可用。
+    这里把帖子所需技能同步到 CooperationPostSkill 关联表：
+    - 保存帖子时按 required_skills 增量同步（见 signals）
+    - 技能过滤用 (skill, post) 索引上的子查询
+    - 推荐按命中的技能数排序
+    - 新增或改名技能时同步提到该技能名的帖子（sync_skill，见 signals），删除技能时关联随外键级联删除
+    manage.py sync_post_skills 全量重建，用于修复数据。
+    """
+
+    BATCH_SIZE = 500
+
+    def _names(self, required_skills) -> List[str]:
+        return [name for name in required_skills or [] if isinstance(name, str)]
+
+    def sync(self, post: CooperationPost):
+        """按 required_skills 同步单个帖子的技能关联"""
+        skill_ids = set(Skill.objects.filter(
+            name__in=self._names(post.required_skills)
+        ).values_list('pk', flat=True))
+        existing = set(CooperationPostSkill.objects.filter(post=post).values_list('skill_id', flat=True))
+
+        stale = existing - skill_ids
+        if stale:
+            CooperationPostSkill.objects.filter(post=post, skill_id__in=stale).delete()
+        missing = skill_ids - existing
+        if missing:
+            CooperationPostSkill.objects.bulk_create(
+                [CooperationPostSkill(post=post, skill_id=skill_id) for skill_id in missing],
+                ignore_conflicts=True
+            )
+
+    def sync_skill(self, skill: Skill) -> int:
+        """新增或改名技能后同步关联：补上提到该名称的帖子，去掉不再提到的帖子，返回变化的关联数"""
+        # required_skills 是JSON列表，各数据库上都没有可靠的包含查询，按主键顺序流式读取后在内存中判断；
+        # 新增和改名技能很少发生
+        mentioned = {
+            post_id for post_id, required_skills in CooperationPost.objects.order_by('pk').values_list(
+                'pk', 'required_skills'
+            ).iterator(chunk_size=self.BATCH_SIZE)
+            if skill.name in self._names(required_skills)
+        }
+        linked = set(CooperationPostSkill.objects.filter(skill=skill).values_list('post_id', flat=True))
+
+        stale = linked - mentioned
+        if stale:
+            CooperationPostSkill.objects.filter(skill=skill, post_id__in=stale).delete()
+        missing = mentioned - linked
+        if missing:
+            CooperationPostSkill.objects.bulk_create(
+                [CooperationPostSkill(post_id=post_id, skill=skill) for post_id in missing],
+                batch_size=self.BATCH_SIZE, ignore_conflicts=True
+            )
+        return len(stale) + len(missing)
+
+    def rebuild(self) -> int:
+        """按 required_skills 重建全部关联，返回关联数"""
+        skill_ids = dict(Skill.objects.values_list('name', 'pk'))
+        total = 0
+        with transaction.atomic():
+            CooperationPostSkill.objects.all().delete()
+            batch = []
+            posts = CooperationPost.objects.order_by('pk').values_list('pk', 'required_skills')
+            for post_id, required_skills in posts.iterator(chunk_size=self.BATCH_SIZE):
+                ids = {skill_ids[name] for name in self._names(required_skills) if name in skill_ids}
+                batch.extend(CooperationPostSkill(post_id=post_id, skill_id=skill_id) for skill_id in ids)
+                if len(batch) >= self.BATCH_SIZE:
+                    CooperationPostSkill.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                CooperationPostSkill.objects.bulk_create(batch)
+                total += len(batch)
+        return total
+
+    def filter_by_skills(self, queryset, names: Iterable[str]):
+        """筛选需要任一指定技能的帖子"""
+        post_ids = CooperationPostSkill.objects.filter(skill__name__in=list(names)).values('post_id')
+        return queryset.filter(pk__in=post_ids)
+
+    def rank_by_skills(self, queryset, skill_ids: Iterable[int]):
+        """按命中的技能数降序排列需要任一指定技能的帖子"""
+        # 先 filter 再 annotate，计数只统计命中的关联行
+        return queryset.filter(
+            skill_links__skill_id__in=list(skill_ids)
+        ).annotate(
+            matched_skill_count=Count('skill_links')
+        ).order_by('-matched_skill_count', '-created_at')
+
+# 创建全局实例
+skill_match_service = SkillMatchService()
@@ -0,0 +1,340 @@
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from .models import (
+    CooperationPost, CooperationApplication, CooperationPostSkill,
+    CooperationRecommendation, PendingRecommendationRefresh, Skill, UserSkill
+)
+from .recommendation_service import recommendation_service
+from .skill_match_service import skill_match_service
+
+User = get_user_model()
+
+
+class CooperationPostQueryCountTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='publisher', email='publisher@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        Skill.objects.create(name='Python', category='编程')
+        Skill.objects.create(name='R', category='编程')
+        Skill.objects.create(name='单细胞测序', category='实验')
+
+    def create_posts(self, count, skills):
+        for i in range(count):
+            post = CooperationPost.objects.create(
+                title=f'合作{i}',
+                content='内容',
+                cooperation_type='collab',
+                publisher=self.user,
+                reward_description='酬劳',
+                required_skills=skills,
+                application_count=1
+            )
+            applicant = User.objects.create_user(
+                username=f'applicant{post.id}', email=f'applicant{post.id}@example.com', password='pass12345'
+            )
+            CooperationApplication.objects.create(
+                post=post, applicant=applicant, cover_letter='申请', proposed_solution='方案'
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context), response
+
+    def test_list_query_count_is_constant(self):
+        """测试合作列表查询次数与每页条数无关"""
+        self.create_posts(2, ['Python'])
+        small_count, _ = self.count_queries('/api/cooperation/posts/')
+
+        self.create_posts(8, ['R', '未知技能', '单细胞测序'])
+        large_count, response = self.count_queries('/api/cooperation/posts/')
+
+        self.assertEqual(small_count, large_count)
+        # 条件请求校验器、分页计数、帖子、技能
+        self.assertEqual(large_count, 4)
+        first = response.data['results'][0]
+        self.assertEqual([skill['name'] for skill in first['required_skills_display']], ['R', '单细胞测序'])
+        self.assertEqual(first['application_count'], 1)
+
+    def test_detail_query_count_is_constant(self):
+        """测试合作详情查询次数与申请数量无关"""
+        self.create_posts(1, ['Python', 'R'])
+        post = CooperationPost.objects.get()
+        url = f'/api/cooperation/posts/{post.id}/'
+        small_count, _ = self.count_queries(url)
+
+        for i in range(4):
+            applicant = User.objects.create_user(username=f'extra{i}', email=f'extra{i}@example.com', password='pass12345')
+            CooperationApplication.objects.create(
+                post=post, applicant=applicant, cover_letter='申请', proposed_solution='方案'
+            )
+        large_count, response = self.count_queries(url)
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(response.data['applications']), 5)
+        self.assertEqual(len(response.data['required_skills_display']), 2)
+
+
+class SkillMatchTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.publisher = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        self.user = User.objects.create_user(username='expert', email='expert@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.python = Skill.objects.create(name='Python', category='编程')
+        self.r = Skill.objects.create(name='R', category='编程')
+        Skill.objects.create(name='Java', category='编程')
+
+    def create_post(self, title, skills, publisher=None):
+        return CooperationPost.objects.create(
+            title=title,
+            content='内容',
+            cooperation_type='collab',
+            publisher=publisher or self.publisher,
+            reward_description='酬劳',
+            required_skills=skills
+        )
+
+    def test_links_follow_required_skills(self):
+        """测试关联表随 required_skills 同步"""
+        post = self.create_post('合作', ['Python', '未知技能'])
+        self.assertEqual(list(post.skill_links.values_list('skill__name', flat=True)), ['Python'])
+
+        post.required_skills = ['R', 'Java']
+        post.save()
+        self.assertEqual(set(post.skill_links.values_list('skill__name', flat=True)), {'R', 'Java'})
+
+        CooperationPostSkill.objects.all().delete()
+        self.assertEqual(skill_match_service.rebuild(), 2)
+
+    def test_links_follow_skill_create_and_rename(self):
+        """测试新增和改名技能后自动同步提到该技能名的帖子"""
+        post = self.create_post('合作', ['R', '新技能'])
+        skill = Skill.objects.create(name='新技能', category='其他')
+        self.assertEqual(set(post.skill_links.values_list('skill__name', flat=True)), {'R', '新技能'})
+
+        self.r.name = 'R语言'
+        self.r.save()
+        self.assertEqual(list(post.skill_links.values_list('skill__name', flat=True)), ['新技能'])
+
+        skill.delete()
+        self.assertFalse(post.skill_links.exists())
+
+    def test_skill_filter(self):
+        """测试按技能过滤帖子"""
+        self.create_post('Python合作', ['Python'])
+        self.create_post('Java合作', ['Java'])
+        self.create_post('双技能合作', ['Python', 'R'])
+
+        response = self.client.get('/api/cooperation/posts/', {'skills': ['Python', 'R']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = {item['title'] for item in response.data['results']}
+        self.assertEqual(titles, {'Python合作', '双技能合作'})
+
+    def test_recommended_ranked_by_matched_skills(self):
+        """测试推荐按命中技能数排序并排除自己的帖子"""
+        UserSkill.objects.create(user=self.user, skill=self.python)
+        UserSkill.objects.create(user=self.user, skill=self.r)
+        self.create_post('双技能合作', ['Python', 'R'])
+        self.create_post('单技能合作', ['R', 'Java'])
+        self.create_post('无关合作', ['Java'])
+        self.create_post('自己的合作', ['Python', 'R'], publisher=self.user)
+
+        response = self.client.get('/api/cooperation/posts/', {'recommended': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [item['title'] for item in response.data['results']]
+        self.assertEqual(titles, ['双技能合作', '单技能合作'])
+
+
+class RecommendationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.publisher = User.objects.create_user(username='lab', email='lab@example.com', password='pass12345')
+        self.user = User.objects.create_user(username='analyst', email='analyst@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.python = Skill.objects.create(name='Python', category='编程')
+        self.pandas = Skill.objects.create(name='Pandas', category='数据分析')
+        self.wetlab = Skill.objects.create(name='PCR', category='实验')
+        # 另一位用户同时掌握 Python 和 Pandas，形成共现关系
+        other = User.objects.create_user(username='peer', email='peer@example.com', password='pass12345')
+        UserSkill.objects.create(user=other, skill=self.python)
+        UserSkill.objects.create(user=other, skill=self.pandas)
+
+    def create_post(self, title, skills):
+        return CooperationPost.objects.create(
+            title=title,
+            content='内容',
+            cooperation_type='collab',
+            publisher=self.publisher,
+            reward_description='酬劳',
+            required_skills=skills
+        )
+
+    def test_feed_ranks_direct_matches_before_related_skills(self):
+        """测试推荐流：直接匹配优先，共现相关技能其次，无关帖子不推荐"""
+        with self.captureOnCommitCallbacks(execute=True):
+            direct = self.create_post('Python分析', ['Python'])
+            related = self.create_post('Pandas清洗', ['Pandas'])
+            self.create_post('PCR实验', ['PCR'])
+            UserSkill.objects.create(user=self.user, skill=self.python, proficiency_level='expert')
+
+        response = self.client.get('/api/cooperation/posts/feed/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [direct.id, related.id])
+        self.assertGreater(response.data['results'][0]['recommend_score'], response.data['results'][1]['recommend_score'])
+
+        response = self.client.get('/api/cooperation/posts/', {'recommended': 1})
+        self.assertEqual([item['id'] for item in response.data['results']], [direct.id, related.id])
+
+    def test_feed_refreshes_when_post_closes_or_user_applies(self):
+        """测试帖子关闭或用户申请后推荐随之更新"""
+        UserSkill.objects.create(user=self.user, skill=self.python)
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.create_post('合作1', ['Python'])
+            second = self.create_post('合作2', ['Python'])
+        self.assertEqual(CooperationRecommendation.objects.filter(user=self.user).count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.status = 'completed'
+            first.save()
+        CooperationApplication.objects.create(
+            post=second, applicant=self.user, cover_letter='申请', proposed_solution='方案'
+        )
+        self.assertFalse(CooperationRecommendation.objects.filter(user=self.user).exists())
+
+    def test_related_skill_recommendations(self):
+        """测试按共现关系推荐技能"""
+        UserSkill.objects.create(user=self.user, skill=self.python)
+        self.assertEqual(recommendation_service.related_skills(self.user), [self.pandas])
+
+        response = self.client.get('/api/cooperation/user-skills/recommendations/')
+        self.assertEqual([item['name'] for item in response.data], ['Pandas'])
+
+    def test_incremental_refresh_uses_cached_cooccurrence(self):
+        """测试增量刷新和技能推荐复用缓存的共现矩阵，只读取受影响用户的技能"""
+        self.create_post('Python分析', ['Python'])
+        recommendation_service.refresh_all()
+        with mock.patch.object(recommendation_service, 'build_cooccurrence') as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                UserSkill.objects.create(user=self.user, skill=self.python)
+            self.assertEqual(recommendation_service.related_skills(self.user), [self.pandas])
+            with CaptureQueriesContext(connection) as queries:
+                recommendation_service.refresh_users([self.user.pk])
+        rebuild.assert_not_called()
+        self.assertEqual(CooperationRecommendation.objects.filter(user=self.user).count(), 1)
+        self.assertFalse(any('cooperation_cooperationpostskill' in query['sql'] for query in queries))
+
+    def test_post_refresh_defers_users_over_inline_limit(self):
+        """测试帖子变化只在请求内重算有限的用户，其余用户由 --pending 任务处理"""
+        UserSkill.objects.create(user=self.user, skill=self.python)
+        with mock.patch.object(recommendation_service, 'inline_refresh_limit', 1):
+            with self.captureOnCommitCallbacks(execute=True):
+                post = self.create_post('Python分析', ['Python'])
+        self.assertEqual(CooperationRecommendation.objects.filter(post=post).count(), 1)
+        self.assertEqual(PendingRecommendationRefresh.objects.count(), 1)
+
+        call_command('refresh_recommendations', '--pending', stdout=io.StringIO())
+        self.assertEqual(CooperationRecommendation.objects.filter(post=post).count(), 2)
+        self.assertFalse(PendingRecommendationRefresh.objects.exists())
+
+
+class ApplicationWorkflowTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.publisher = User.objects.create_user(username='pi', email='pi@example.com', password='pass12345')
+        self.post = CooperationPost.objects.create(
+            title='合作',
+            content='内容',
+            cooperation_type='collab',
+            publisher=self.publisher,
+            reward_description='酬劳'
+        )
+        self.applicants = [
+            User.objects.create_user(username=f'student{i}', email=f'student{i}@example.com', password='pass12345')
+            for i in range(3)
+        ]
+
+    def apply(self, user):
+        self.client.force_authenticate(user)
+        return self.client.post(f'/api/cooperation/posts/{self.post.id}/apply/', {
+            'cover_letter': '申请', 'proposed_solution': '方案'
+        }, format='json')
+
+    def test_apply_maintains_pending_count(self):
+        """测试申请只增量更新计数，重复申请和申请自己的合作被拒绝"""
+        for user in self.applicants:
+            self.assertEqual(self.apply(user).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.apply(self.applicants[0]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.apply(self.publisher).status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.application_count, 3)
+
+    def test_apply_to_closed_post_is_rolled_back(self):
+        """测试帖子已关闭时申请不会写入"""
+        CooperationPost.objects.filter(pk=self.post.pk).update(status='completed')
+        self.assertEqual(self.apply(self.applicants[0]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(CooperationApplication.objects.exists())
+
+    def test_batch_review(self):
+        """测试批量审核只处理待审核申请并同步计数和帖子状态"""
+        for user in self.applicants:
+            self.apply(user)
+        ids = list(CooperationApplication.objects.order_by('pk').values_list('pk', flat=True))
+        self.client.force_authenticate(self.publisher)
+        url = f'/api/cooperation/posts/{self.post.id}/review_applications/'
+
+        response = self.client.post(url, {'action': 'reject', 'application_ids': ids[:2]}, format='json')
+        self.assertEqual(response.data['reviewed'], 2)
+        response = self.client.post(url, {'action': 'accept', 'application_ids': ids}, format='json')
+        self.assertEqual(response.data['reviewed'], 1)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.application_count, 0)
+        self.assertEqual(self.post.status, 'progress')
+        self.assertEqual(CooperationApplication.objects.get(pk=ids[2]).status, 'accepted')
+
+        response = self.client.post(
+            f'/api/cooperation/posts/{self.post.id}/applications/{ids[0]}/review/', {'action': 'accept'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_single_review_sets_reviewed_at(self):
+        """测试单个审核记录审核时间"""
+        self.apply(self.applicants[0])
+        application = CooperationApplication.objects.get()
+        self.client.force_authenticate(self.publisher)
+        response = self.client.post(
+            f'/api/cooperation/posts/{self.post.id}/applications/{application.id}/review/', {'action': 'reject'}
+        )
+        self.assertEqual(response.data['status'], 'rejected')
+        application.refresh_from_db()
+        self.assertIsNotNone(application.reviewed_at)
+
+
+class CooperationProjectionTest(TestCase):
+    def test_detail_exclude_applications(self):
+        """测试排除申请列表时不查询申请"""
+        client = APIClient()
+        user = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        client.force_authenticate(user)
+        post = CooperationPost.objects.create(
+            title='合作', content='内容', cooperation_type='collab',
+            publisher=user, reward_description='酬劳', required_skills=[]
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/cooperation/posts/{post.id}/', {'fields': 'id,title,required_skills_display'})
+        self.assertEqual(set(response.data), {'id', 'title', 'required_skills_display'})
+        self.assertFalse(any('cooperation_cooperationapplication' in query['sql'] for query in context))
@@ -2,10 +2,22 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, Avg
+from django.db.models import Q, Count, Avg, F, Prefetch
+from django.shortcuts import get_object_or_404
 
-from .models import CooperationPost, CooperationApplication, Skill, UserSkill
+from .models import (
+    CooperationPost, CooperationApplication, CooperationRecommendation,
+    CooperationStatus, Skill, UserSkill
+)
+from api.view_count_service import view_count_service
+from api.projection import ProjectionViewMixin
+from api.conditional import ConditionalGetMixin
+from api.response_cache import response_cache
+from .skill_match_service import skill_match_service
+from .recommendation_service import recommendation_service
+from .application_service import application_service
 from .serializers import (
     CooperationPostSerializer,
     CooperationPostListSerializer,
@@ -14,7 +26,7 @@ from .serializers import (
     UserSkillSerializer
 )
 
-class CooperationPostViewSet(viewsets.ModelViewSet):
+class CooperationPostViewSet(ConditionalGetMixin, ProjectionViewMixin, viewsets.ModelViewSet):
     queryset = CooperationPost.objects.all()
     serializer_class = CooperationPostSerializer
     permission_classes = [IsAuthenticated]
@@ -37,7 +49,7 @@ class CooperationPostViewSet(viewsets.ModelViewSet):
         # 技能过滤
         skills = self.request.query_params.getlist('skills')
         if skills:
-            queryset = queryset.filter(required_skills__overlap=skills)
+            queryset = skill_match_service.filter_by_skills(queryset, skills)
         
         # 预算范围
         min_budget = self.request.query_params.get('min_budget')
@@ -58,17 +70,44 @@ class CooperationPostViewSet(viewsets.ModelViewSet):
             ).values_list('post_id', flat=True)
             queryset = queryset.filter(id__in=applied_post_ids)
         
-        # 推荐合作（基于用户技能匹配）
+        # 推荐合作：优先读取预先计算的推荐，尚未计算时按命中技能数实时排序
         if self.request.query_params.get('recommended'):
-            user_skills = UserSkill.objects.filter(
-                user=self.request.user
-            ).values_list('skill__name', flat=True)
-            if user_skills:
+            if CooperationRecommendation.objects.filter(user=self.request.user).exists():
                 queryset = queryset.filter(
-                    required_skills__overlap=list(user_skills)
-                ).exclude(publisher=self.request.user)
+                    recommendations__user=self.request.user
+                ).annotate(recommend_rank=F('recommendations__rank'))
+            else:
+                user_skill_ids = list(UserSkill.objects.filter(
+                    user=self.request.user
+                ).values_list('skill_id', flat=True))
+                if user_skill_ids:
+                    queryset = skill_match_service.rank_by_skills(
+                        queryset, user_skill_ids
+                    ).exclude(publisher=self.request.user)
         
-        return queryset.select_related('publisher').prefetch_related('applications')
+        queryset = queryset.select_related('publisher')
+        if self.action != 'list' and self.wants_field('applications'):
+            # 列表只使用反规范化的 application_count，详情才需要申请记录
+            queryset = queryset.prefetch_related(
+                Prefetch('applications', queryset=CooperationApplication.objects.select_related('applicant'))
+            )
+        return self.project_queryset(queryset)
+
+    def use_conditional(self, request):
+        """推荐顺序随推荐刷新变化，不参与条件请求"""
+        return super().use_conditional(request) and not request.query_params.get('recommended')
+
+    def filter_queryset(self, queryset):
+        """推荐列表保持推荐顺序"""
+        queryset = super().filter_queryset(queryset)
+        ordering_param = api_settings.ORDERING_PARAM
+        if self.request.query_params.get('recommended') and not self.request.query_params.get(ordering_param):
+            annotations = queryset.query.annotations
+            if 'recommend_rank' in annotations:
+                queryset = queryset.order_by('recommend_rank')
+            elif 'matched_skill_count' in annotations:
+                queryset = queryset.order_by('-matched_skill_count', '-created_at')
+        return queryset
 
     def perform_create(self, serializer):
         """创建新的合作帖子"""
@@ -79,32 +118,48 @@ class CooperationPostViewSet(viewsets.ModelViewSet):
         """申请合作"""
         post = self.get_object()
         
-        if post.publisher == request.user:
+        serializer = CooperationApplicationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = application_service.apply(post, request.user, **serializer.validated_data)
+        if not result['success']:
+            return Response({'error': result['error']}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(
+            CooperationApplicationSerializer(result['application']).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=True, methods=['post'])
+    def review_applications(self, request, pk=None):
+        """批量审核申请"""
+        post = self.get_object()
+        
+        if request.user != post.publisher:
             return Response(
-                {'error': '不能申请自己的合作'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'error': '无权审核此合作的申请'},
+                status=status.HTTP_403_FORBIDDEN
             )
         
-        if post.status != 'pending':
+        action_type = request.data.get('action')
+        application_ids = request.data.get('application_ids')
+        if action_type not in ['accept', 'reject']:
             return Response(
-                {'error': '该合作已不接受申请'},
+                {'error': '无效的审核操作'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        serializer = CooperationApplicationSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(
-                post=post,
-                applicant=request.user
+        if (not isinstance(application_ids, list) or not application_ids
+                or not all(str(application_id).isdigit() for application_id in application_ids)):
+            return Response(
+                {'error': '请提供要审核的申请ID列表'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            
-            # 更新申请计数
-            post.application_count = post.applications.filter(status='pending').count()
-            post.save()
-            
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        result = application_service.review(
+            post, application_ids, action_type, request.data.get('review_note', '')
+        )
+        return Response(result)
 
     @action(detail=True, methods=['get'])
     def applications(self, request, pk=None):
@@ -122,13 +177,33 @@ class CooperationPostViewSet(viewsets.ModelViewSet):
         serializer = CooperationApplicationSerializer(applications, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def feed(self, request):
+        """个性化推荐流（读取预先计算的推荐）"""
+        recommendations = CooperationRecommendation.objects.filter(
+            user=request.user,
+            post__status=CooperationStatus.PENDING
+        ).select_related('post__publisher').order_by('rank')
+
+        page = self.paginate_queryset(recommendations)
+        items = page if page is not None else list(recommendations)
+        serializer = CooperationPostListSerializer(
+            [item.post for item in items], many=True, context=self.get_serializer_context()
+        )
+        data = serializer.data
+        for item, recommendation in zip(data, items):
+            item['recommend_score'] = round(recommendation.score, 4)
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
     @action(detail=True, methods=['post'])
     def increment_view(self, request, pk=None):
         """增加浏览量"""
         post = self.get_object()
-        post.view_count += 1
-        post.save()
-        return Response({'view_count': post.view_count})
+        pending = view_count_service.increment(CooperationPost, post.pk)
+        return Response({'view_count': post.view_count + pending})
 
 class CooperationApplicationViewSet(viewsets.ModelViewSet):
     serializer_class = CooperationApplicationSerializer
@@ -140,10 +215,21 @@ class CooperationApplicationViewSet(viewsets.ModelViewSet):
             post_id=self.kwargs['post_pk']
         ).select_related('applicant', 'post')
 
-    def perform_create(self, serializer):
+    def create(self, request, *args, **kwargs):
         """创建新的合作申请"""
-        post = CooperationPost.objects.get(pk=self.kwargs['post_pk'])
-        serializer.save(applicant=self.request.user, post=post)
+        post = get_object_or_404(CooperationPost, pk=self.kwargs['post_pk'])
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        result = application_service.apply(post, request.user, **serializer.validated_data)
+        if not result['success']:
+            return Response({'error': result['error']}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(self.get_serializer(result['application']).data, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        """删除申请并维护待审核计数"""
+        application_service.withdraw(instance)
 
     @action(detail=True, methods=['post'])
     def review(self, request, post_pk=None, pk=None):
@@ -166,17 +252,14 @@ class CooperationApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        application.status = 'accepted' if action_type == 'accept' else 'rejected'
-        application.review_note = review_note
-        application.reviewed_at = timezone.now()
-        application.save()
-        
-        # 如果接受申请，更新合作状态
-        if action_type == 'accept':
-            application.post.status = 'in_progress'
-            application.post.save()
+        result = application_service.review(application.post, [application.pk], action_type, review_note)
+        if not result['reviewed']:
+            return Response(
+                {'error': '该申请已审核'},
+                status=status.HTTP_409_CONFLICT
+            )
         
-        return Response({'status': application.status})
+        return Response({'status': result['status']})
 
 class SkillViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Skill.objects.all()
@@ -185,6 +268,14 @@ class SkillViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', 'category']
 
+    @response_cache.cached(models=[Skill], scope='public')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @response_cache.cached(models=[Skill], scope='public')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 class UserSkillViewSet(viewsets.ModelViewSet):
     serializer_class = UserSkillSerializer
     permission_classes = [IsAuthenticated]
@@ -205,14 +296,15 @@ class UserSkillViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def recommendations(self, request):
         """获取技能推荐"""
-        user_skills = UserSkill.objects.filter(
-            user=request.user
-        ).values_list('skill__name', flat=True)
-        
-        # 基于用户已有技能推荐相关技能
-        recommended_skills = Skill.objects.exclude(
-            name__in=user_skills
-        )[:10]
+        # 基于技能共现关系推荐相关技能，没有技能数据时退回为未掌握的技能
+        recommended_skills = recommendation_service.related_skills(request.user, limit=10)
+        if not recommended_skills:
+            user_skills = UserSkill.objects.filter(
+                user=request.user
+            ).values_list('skill__name', flat=True)
+            recommended_skills = Skill.objects.exclude(
+                name__in=user_skills
+            )[:10]
         
         serializer = SkillSerializer(recommended_skills, many=True)
         return Response(serializer.data)
\ No newline at end of file
@@ -12,7 +12,7 @@ interface JournalInfo {
   issn: string;
   publisher: string;
   field: string;
-  impact_factor_2023: number;
+  impact_factor: number;
   rank: number;
 }
 
@@ -30,7 +30,7 @@ interface RankingData {
   rank: number;
   name: string;
   abbreviation: string;
-  impact_factor_2023: number;
+  impact_factor: number;
   field: string;
   quartile: string;
 }
@@ -135,9 +135,9 @@ const JournalImpact: React.FC = () => {
       render: (field: string) => <Tag color="blue">{field}</Tag>
     },
     {
-      title: '2023影响因子',
-      dataIndex: 'impact_factor_2023',
-      key: 'impact_factor_2023',
+      title: '影响因子',
+      dataIndex: 'impact_factor',
+      key: 'impact_factor',
       render: (value: number) => (
         <span style={{ color: '#1890ff', fontWeight: 'bold' }}>
           {value}
@@ -196,9 +196,9 @@ const JournalImpact: React.FC = () => {
       key: 'abbreviation',
     },
     {
-      title: '2023影响因子',
-      dataIndex: 'impact_factor_2023',
-      key: 'impact_factor_2023',
+      title: '影响因子',
+      dataIndex: 'impact_factor',
+      key: 'impact_factor',
       render: (value: number) => (
         <span style={{ color: '#1890ff', fontWeight: 'bold', fontSize: '16px' }}>
           {value}
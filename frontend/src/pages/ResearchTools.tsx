@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { Card, Row, Col, Button, Select, Upload, message, Tabs, Space, Form, Input, Slider } from 'antd';
+import { Card, Row, Col, Button, Select, Upload, message, Tabs, Space, Form, Input, Slider, Pagination } from 'antd';
 import { UploadOutlined, DownloadOutlined, BarChartOutlined, LineChartOutlined, PieChartOutlined, AreaChartOutlined } from '@ant-design/icons';
 import { Bar, Line, Pie, Area, Column, Scatter } from '@ant-design/charts';
 import { apiRequest } from '../utils/api';
@@ -8,6 +8,8 @@ const { Option } = Select;
 const { TabPane } = Tabs;
 const { TextArea } = Input;
 
+const CHART_PAGE_SIZE = 12;
+
 interface ChartData {
   x: string;
   y: number;
@@ -17,8 +19,9 @@ interface ChartData {
 interface ResearchData {
   id: number;
   title: string;
-  data: any[];
+  data?: any[];
   chart_type: string;
+  data_size: number;
   created_at: string;
 }
 
@@ -27,21 +30,32 @@ const ResearchTools: React.FC = () => {
   const [dataSource, setDataSource] = useState<ChartData[]>([]);
   const [customData, setCustomData] = useState<string>('');
   const [savedCharts, setSavedCharts] = useState<ResearchData[]>([]);
+  const [chartPage, setChartPage] = useState(1);
+  const [chartTotal, setChartTotal] = useState(0);
   const [chartTitle, setChartTitle] = useState<string>('');
   const [xLabel, setXLabel] = useState<string>('X轴');
   const [yLabel, setYLabel] = useState<string>('Y轴');
   const [loading, setLoading] = useState(false);
 
   useEffect(() => {
-    fetchSavedCharts();
     loadSampleData();
   }, []);
 
+  useEffect(() => {
+    fetchSavedCharts();
+  }, [chartPage]);
+
   const fetchSavedCharts = async () => {
     try {
-      const response = await apiRequest('/api/research/charts/');
+      const response = await apiRequest(`/api/research/charts/?page=${chartPage}&size=${CHART_PAGE_SIZE}`);
       if (response.success) {
-        setSavedCharts(response.data);
+        // 删除后当前页为空时回到上一页
+        if (response.data.list.length === 0 && chartPage > 1) {
+          setChartPage(chartPage - 1);
+          return;
+        }
+        setSavedCharts(response.data.list);
+        setChartTotal(response.data.total);
       }
     } catch (error) {
       console.error('获取保存的图表失败:', error);
@@ -139,18 +153,30 @@ const ResearchTools: React.FC = () => {
 
       if (response.success) {
         message.success('图表保存成功');
-        fetchSavedCharts();
+        // 新图表在第一页
+        if (chartPage === 1) {
+          fetchSavedCharts();
+        } else {
+          setChartPage(1);
+        }
       }
     } catch (error) {
       message.error('保存失败');
     }
   };
 
-  const loadChart = (chart: ResearchData) => {
-    setDataSource(chart.data);
-    setChartType(chart.chart_type);
-    setChartTitle(chart.title);
-    setSavedCharts([]);
+  const loadChart = async (chart: ResearchData) => {
+    // 列表不含图表数据，加载时再获取详情
+    try {
+      const response = await apiRequest(`/api/research/charts/${chart.id}/`);
+      if (response.success) {
+        setDataSource(response.data.data);
+        setChartType(response.data.chart_type);
+        setChartTitle(response.data.title);
+      }
+    } catch (error) {
+      message.error('加载图表失败');
+    }
   };
 
   const deleteChart = async (id: number) => {
@@ -298,6 +324,16 @@ const ResearchTools: React.FC = () => {
                 </Col>
               ))}
             </Row>
+            <div className="flex justify-center mt-6">
+              <Pagination
+                current={chartPage}
+                total={chartTotal}
+                pageSize={CHART_PAGE_SIZE}
+                onChange={setChartPage}
+                showSizeChanger={false}
+                hideOnSinglePage
+              />
+            </div>
           </TabPane>
 
           <TabPane tab="模板库" key="templates">
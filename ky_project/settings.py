@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -109,6 +110,32 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cache
+# CACHE_BACKEND 可选 locmem（默认）、file、redis，CACHE_LOCATION 覆盖默认的目录或 Redis 地址
+
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'ky-project'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / 'cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': _CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', _CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'TIMEOUT': 300,
+    }
+}
+
+# 视图响应缓存的默认有效期（秒），失效主要依靠模型的代数计数器
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+# 代数计数器需要所有进程共享缓存，多进程部署应使用 redis 或 file；
+# locmem 的计数器只在本进程有效，响应缓存有效期限制为以下秒数
+RESPONSE_CACHE_LOCAL_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_LOCAL_TIMEOUT', 60))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -1,11 +1,21 @@
 from django.contrib import admin
-from .models import Journal, Literature, LiteratureUser
+from .dedupe_service import literature_dedupe_service
+from .models import (
+    Journal, JournalMetric, Literature, LiteratureUser, LiteratureImportJob, LiteratureDuplicate, DuplicateStatus
+)
 
 @admin.register(Journal)
 class JournalAdmin(admin.ModelAdmin):
     list_display = ('name', 'impact_factor', 'cas_partition', 'jcr_partition')
     search_fields = ('name',)
 
+@admin.register(JournalMetric)
+class JournalMetricAdmin(admin.ModelAdmin):
+    list_display = ('name', 'abbreviation', 'issn', 'field', 'year', 'impact_factor', 'quartile', 'field_rank')
+    search_fields = ('name', 'abbreviation', 'issn', 'eissn')
+    list_filter = ('year', 'quartile')
+    readonly_fields = ('normalized_name', 'normalized_abbreviation', 'normalized_field', 'field_rank')
+
 @admin.register(Literature)
 class LiteratureAdmin(admin.ModelAdmin):
     list_display = ('title', 'authors', 'journal', 'pub_year', 'pub_date', 'created_at')
@@ -18,3 +28,29 @@ class LiteratureUserAdmin(admin.ModelAdmin):
     list_display = ('user', 'literature', 'rating', 'is_favorite', 'created_at')
     search_fields = ('user__username', 'literature__title')
     list_filter = ('rating', 'is_favorite', 'created_at')
+
+@admin.register(LiteratureImportJob)
+class LiteratureImportJobAdmin(admin.ModelAdmin):
+    list_display = ('original_name', 'user', 'file_format', 'status', 'processed_count', 'created_count', 'created_at')
+    search_fields = ('original_name', 'user__username')
+    list_filter = ('status', 'file_format', 'created_at')
+
+@admin.register(LiteratureDuplicate)
+class LiteratureDuplicateAdmin(admin.ModelAdmin):
+    list_display = ('literature', 'duplicate_of', 'score', 'status', 'created_at')
+    search_fields = ('literature__title', 'duplicate_of__title')
+    list_filter = ('status',)
+    raw_id_fields = ('literature', 'duplicate_of')
+    actions = ['merge_duplicates', 'dismiss_duplicates']
+
+    @admin.action(description='合并到较早的文献')
+    def merge_duplicates(self, request, queryset):
+        merged = sum(
+            1 for pair in queryset.filter(status=DuplicateStatus.PENDING)
+            if 'success' in literature_dedupe_service.merge(pair.duplicate_of_id, pair.literature_id)
+        )
+        self.message_user(request, f'合并了 {merged} 对重复文献')
+
+    @admin.action(description='标记为非重复')
+    def dismiss_duplicates(self, request, queryset):
+        queryset.update(status=DuplicateStatus.DISMISSED)
@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import mimetypes
+from typing import Dict, Optional
+from django.conf import settings
+from .file_upload_service import file_upload_service
+from .import_parsers import EXTENSIONS as IMPORT_EXTENSIONS
+
+
+class ChunkedUploadService:
+    """分片/断点续传上传服务
+
+    协议（参考tus / S3 multipart）：
+    1. init：声明文件名、大小和MD5，返回upload_id
+    2. append：按偏移量追加分片，偏移量必须等于已接收字节数
+    3. status：查询已接收字节数，用于断点续传
+    4. complete：校验大小和哈希后转存为正式文件
+
+    分片追加到临时文件，会话元数据以JSON保存在同一目录，
+    多个worker共享磁盘即可协同处理同一上传。
+    登录用户创建的会话只允许该用户后续操作（见 is_owner），
+    完成后在 owners 目录记录文件的上传用户，供导入等引用已上传文件的接口校验归属。
+    """
+
+    DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024  # 5MB
+    SESSION_EXPIRE_SECONDS = 24 * 3600  # 未完成的上传保留24小时
+    READ_BLOCK_SIZE = 64 * 1024
+    # 用于批量导入的上传（type=import），完成后通过 filename 创建导入任务
+    IMPORT_FILE_TYPE = 'import'
+
+    def __init__(self):
+        self.chunk_size = getattr(settings, 'CHUNKED_UPLOAD_CHUNK_SIZE', self.DEFAULT_CHUNK_SIZE)
+        self.expire_seconds = getattr(settings, 'CHUNKED_UPLOAD_EXPIRE_SECONDS', self.SESSION_EXPIRE_SECONDS)
+
+    @property
+    def chunk_dir(self) -> str:
+        return os.path.join(file_upload_service.upload_dir, '.chunks')
+
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.chunk_dir, f"{upload_id}.part")
+
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.chunk_dir, f"{upload_id}.json")
+
+    @property
+    def owner_dir(self) -> str:
+        return os.path.join(self.chunk_dir, 'owners')
+
+    def record_owner(self, filename: str, user_id):
+        """记录已完成上传文件的上传用户"""
+        os.makedirs(self.owner_dir, exist_ok=True)
+        with open(os.path.join(self.owner_dir, f"{os.path.basename(filename)}.json"), 'w', encoding='utf-8') as f:
+            json.dump({'filename': filename, 'user_id': user_id}, f)
+
+    def file_owner(self, filename: str):
+        """已完成上传文件的上传用户ID，未知时返回None"""
+        try:
+            with open(os.path.join(self.owner_dir, f"{os.path.basename(filename)}.json"), 'r', encoding='utf-8') as f:
+                return json.load(f).get('user_id')
+        except (OSError, ValueError):
+            return None
+
+    def _load_meta(self, upload_id: str) -> Optional[Dict]:
+        # upload_id由服务端生成，只接受合法的UUID，防止路径穿越
+        try:
+            uuid.UUID(upload_id)
+        except (ValueError, TypeError):
+            return None
+        try:
+            with open(self._meta_path(upload_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_owner(self, upload_id: str, user_id) -> bool:
+        """会话记录了上传用户时，只有该用户可以继续、完成或取消上传"""
+        meta = self._load_meta(upload_id)
+        if meta is None or meta.get('user_id') is None:
+            return True
+        return meta['user_id'] == user_id
+
+    def _received_bytes(self, upload_id: str) -> int:
+        try:
+            return os.path.getsize(self._part_path(upload_id))
+        except OSError:
+            return 0
+
+    def _status(self, meta: Dict) -> Dict:
+        offset = self._received_bytes(meta['upload_id'])
+        return {
+            'upload_id': meta['upload_id'],
+            'filename': meta['filename'],
+            'file_size': meta['file_size'],
+            'offset': offset,
+            'chunk_size': meta['chunk_size'],
+            'is_complete': offset == meta['file_size'],
+        }
+
+    def init_upload(self, filename: str, file_size: int, file_hash: str = '',
+                    file_type: str = 'general', user_id=None) -> Dict:
+        """创建上传会话"""
+        if not filename:
+            return {'error': '未提供文件名'}
+
+        actual_file_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if file_type == self.IMPORT_FILE_TYPE:
+            # 导入文件（RIS、BibTeX 等）没有统一的MIME类型，按导入格式的扩展名判断
+            if os.path.splitext(filename)[1].lower() not in IMPORT_EXTENSIONS:
+                return {'error': '不支持的导入格式，请使用 RIS、BibTeX、PubMed XML 或 CSV'}
+        elif not file_upload_service.is_allowed_type(actual_file_type):
+            return {'error': '不支持的文件类型'}
+
+        max_size = file_upload_service.MAX_IMAGE_SIZE if file_type == 'image' else file_upload_service.MAX_FILE_SIZE
+        if file_size <= 0 or file_size > max_size:
+            return {'error': f'文件大小超过限制（最大{max_size//1024//1024}MB）'}
+
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        self.cleanup_expired()
+
+        upload_id = str(uuid.uuid4())
+        meta = {
+            'upload_id': upload_id,
+            'filename': os.path.basename(filename),
+            'file_size': file_size,
+            'file_hash': (file_hash or '').lower(),
+            'file_type': file_type,
+            'mime_type': actual_file_type,
+            'chunk_size': self.chunk_size,
+            'user_id': user_id,
+            'created_at': int(time.time()),
+        }
+        with open(self._meta_path(upload_id), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        # 预先创建空的临时文件，偏移量从0开始
+        open(self._part_path(upload_id), 'wb').close()
+
+        return {'success': True, 'upload': self._status(meta)}
+
+    def get_status(self, upload_id: str) -> Dict:
+        """查询上传进度"""
+        meta = self._load_meta(upload_id)
+        if meta is None:
+            return {'error': '上传会话不存在或已过期', 'not_found': True}
+        return {'success': True, 'upload': self._status(meta)}
+
+    def append_chunk(self, upload_id: str, offset: int, stream, length: int) -> Dict:
+        """在指定偏移量追加分片
+
+        偏移量与已接收字节数不一致时返回冲突及当前偏移量，
+        客户端据此从断点继续上传，无需重传已接收部分。
+        """
+        meta = self._load_meta(upload_id)
+        if meta is None:
+            return {'error': '上传会话不存在或已过期', 'not_found': True}
+
+        received = self._received_bytes(upload_id)
+        if offset != received:
+            return {'error': '分片偏移量不匹配', 'conflict': True, 'offset': received}
+
+        if length <= 0 or length > meta['chunk_size']:
+            return {'error': f"分片大小必须在1到{meta['chunk_size']}字节之间"}
+        if offset + length > meta['file_size']:
+            return {'error': '分片超出声明的文件大小'}
+
+        # 按偏移量定位写入而不是追加：同一分片被并发重试时写入的是相同字节，不会重复拼接
+        remaining = length
+        with open(self._part_path(upload_id), 'r+b') as destination:
+            destination.seek(offset)
+            while remaining > 0:
+                block = stream.read(min(self.READ_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                destination.write(block)
+                remaining -= len(block)
+
+        return {'success': True, 'upload': self._status(meta)}
+
+    def complete_upload(self, upload_id: str) -> Dict:
+        """校验并转存已上传完成的文件"""
+        meta = self._load_meta(upload_id)
+        if meta is None:
+            return {'error': '上传会话不存在或已过期', 'not_found': True}
+
+        part_path = self._part_path(upload_id)
+        received = self._received_bytes(upload_id)
+        if received != meta['file_size']:
+            return {'error': '文件尚未上传完整', 'conflict': True, 'offset': received}
+
+        hasher = hashlib.md5()
+        with open(part_path, 'rb') as f:
+            for block in iter(lambda: f.read(self.READ_BLOCK_SIZE), b''):
+                hasher.update(block)
+        file_hash = hasher.hexdigest()
+
+        if meta['file_hash'] and meta['file_hash'] != file_hash:
+            self.abort_upload(upload_id)
+            return {'error': '文件哈希校验失败，请重新上传'}
+
+        filename = file_upload_service.generate_filename(meta['filename'], meta['mime_type'])
+        os.replace(part_path, os.path.join(file_upload_service.upload_dir, filename))
+        if meta.get('user_id') is not None:
+            self.record_owner(filename, meta['user_id'])
+        self._remove(self._meta_path(upload_id))
+
+        file_info = file_upload_service.build_file_info(
+            filename, meta['filename'], meta['file_size'], meta['mime_type'], file_hash
+        )
+        return {'success': True, 'file_info': file_info}
+
+    def abort_upload(self, upload_id: str) -> Dict:
+        """取消上传并清理临时文件"""
+        if self._load_meta(upload_id) is None:
+            return {'error': '上传会话不存在或已过期', 'not_found': True}
+        self._remove(self._part_path(upload_id))
+        self._remove(self._meta_path(upload_id))
+        return {'success': True}
+
+    def cleanup_expired(self) -> int:
+        """清理长时间没有新分片的未完成上传"""
+        if not os.path.isdir(self.chunk_dir):
+            return 0
+
+        removed = 0
+        deadline = time.time() - self.expire_seconds
+        for name in os.listdir(self.chunk_dir):
+            if not name.endswith('.json'):
+                continue
+            upload_id = name[:-len('.json')]
+            paths = [self._meta_path(upload_id), self._part_path(upload_id)]
+            try:
+                last_activity = max(os.path.getmtime(p) for p in paths if os.path.exists(p))
+            except (OSError, ValueError):
+                continue
+            if last_activity < deadline:
+                for path in paths:
+                    self._remove(path)
+                removed += 1
+        return removed
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# 创建全局实例
+chunked_upload_service = ChunkedUploadService()
@@ -0,0 +1,271 @@
+import re
+import unicodedata
+from collections import defaultdict, deque
+from difflib import SequenceMatcher
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from django.db import transaction
+
+from .library_stats_service import library_stats_service
+from .models import LegacyLiteratureMapping, Literature, LiteratureDuplicate, LiteratureUser, DuplicateStatus
+
+
+class _Entry(NamedTuple):
+    pk: int
+    fingerprint: str
+    doi: Optional[str]
+    pmid: Optional[str]
+
+
+class LiteratureDedupeService:
+    """文献查重服务
+
+    指纹 = 规范化标题|年份|第一作者（姓名分词排序），存在 Literature.fingerprint（有索引）。
+    候选按指纹前 BLOCK_PREFIX 个字符分块，只在块内比较：
+    - 新增文献（check）：按块分组，每块一次读出这批文献所在区间及前后各 CANDIDATE_LIMIT 条邻居，
+      每条与排序后前后各 CANDIDATE_LIMIT 条比较；查询数与块数成正比，不随文献数线性增长
+    - 全量扫描（scan）：按指纹顺序流式读取，每条只与块内前 WINDOW 条比较（排序邻域法），
+      复杂度 O(n·WINDOW)，不需要把全表读入内存
+    标题用 SequenceMatcher 打分，先用 real_quick_ratio / quick_ratio 上界排除，大部分候选不做完整比较。
+    标题开头就不同的重复（例如多了冠词）不会进入同一块，属于已知的漏检。
+    """
+
+    BLOCK_PREFIX = 12
+    WINDOW = 10
+    CANDIDATE_LIMIT = 50
+    MIN_TITLE_LENGTH = 20
+    TITLE_WEIGHT = 0.85
+    THRESHOLD = 0.9
+    BATCH_SIZE = 1000
+    CHUNK_SIZE = 5000
+    ENTRY_FIELDS = ('pk', 'fingerprint', 'doi', 'pmid')
+    # 合并时用被合并文献补全的空字段，其中有唯一约束的需要先从被合并文献上清除
+    MERGE_FIELDS = ('abstract', 'pub_date', 'volume', 'issue', 'pages', 'doi', 'pmid', 'keywords',
+                    'url', 'category', 'file_path', 'uploaded_by', 'legacy_id')
+    UNIQUE_MERGE_FIELDS = ('doi', 'pmid', 'legacy_id')
+    # 合并时累加的计数
+    MERGE_COUNTERS = ('view_count', 'download_count')
+
+    # ---- 指纹 ----
+
+    def _tokens(self, value: str) -> List[str]:
+        text = unicodedata.normalize('NFKD', value or '')
+        text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+        return re.findall(r'[^\W_]+', text)
+
+    def normalize_title(self, title: str) -> str:
+        return ' '.join(self._tokens(title))
+
+    def author_key(self, authors: str) -> str:
+        """第一作者的姓名分词排序，"John Smith" 与 "Smith John" 相同"""
+        first = re.split(r'[,;]', authors or '', 1)[0]
+        return ' '.join(sorted(self._tokens(first)))
+
+    def fingerprint(self, title: str, authors: str, pub_year) -> str:
+        return f"{self.normalize_title(title)[:200]}|{pub_year or ''}|{self.author_key(authors)[:40]}"[:255]
+
+    def block(self, fingerprint: str) -> str:
+        return fingerprint.split('|', 1)[0][:self.BLOCK_PREFIX]
+
+    # ---- 打分 ----
+
+    def _author_similarity(self, left: str, right: str) -> float:
+        left, right = left.split(), right.split()
+        if not left or not right:
+            return 0.5
+        if {token for token in left if len(token) > 1} & {token for token in right if len(token) > 1}:
+            return 1.0
+        # 只有缩写能对上，例如 "J Smith" 与 "John Smyth"
+        return 0.5 if {token[0] for token in left} & {token[0] for token in right} else 0.0
+
+    def score(self, left: _Entry, right: _Entry) -> float:
+        """两条文献的相似度（0~1），明显不是同一篇时返回 0"""
+        if (left.doi and right.doi and left.doi != right.doi) or (left.pmid and right.pmid and left.pmid != right.pmid):
+            return 0.0
+        left_title, left_year, left_author = left.fingerprint.rsplit('|', 2)
+        right_title, right_year, right_author = right.fingerprint.rsplit('|', 2)
+        if min(len(left_title), len(right_title)) < self.MIN_TITLE_LENGTH:
+            return 0.0
+        # 预印本和正式发表可能相差一年
+        if left_year and right_year and abs(int(left_year) - int(right_year)) > 1:
+            return 0.0
+
+        matcher = SequenceMatcher(None, left_title, right_title, autojunk=False)
+        # 作者完全一致时标题至少需要的相似度
+        floor = (self.THRESHOLD - (1 - self.TITLE_WEIGHT)) / self.TITLE_WEIGHT
+        if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+            return 0.0
+        title_score = matcher.ratio()
+        author_score = self._author_similarity(left_author, right_author)
+        return round(self.TITLE_WEIGHT * title_score + (1 - self.TITLE_WEIGHT) * author_score, 4)
+
+    def _record(self, pairs: List[Tuple[int, int, float]]) -> int:
+        """保存疑似重复对，已存在（包括已标记为非重复）的忽略"""
+        if not pairs:
+            return 0
+        LiteratureDuplicate.objects.bulk_create([
+            LiteratureDuplicate(literature_id=max(left, right), duplicate_of_id=min(left, right), score=score)
+            for left, right, score in pairs
+        ], batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+        return len(pairs)
+
+    # ---- 增量与全量 ----
+
+    def rebuild_fingerprints(self, only_missing: bool = True) -> int:
+        """按主键分批重算指纹，返回更新条数"""
+        queryset = Literature.objects.order_by('pk')
+        if only_missing:
+            queryset = queryset.filter(fingerprint='')
+        last_pk, updated = 0, 0
+        while True:
+            rows = list(queryset.filter(pk__gt=last_pk).values_list('pk', 'title', 'authors', 'pub_year')[:self.BATCH_SIZE])
+            if not rows:
+                return updated
+            Literature.objects.bulk_update([
+                Literature(pk=pk, fingerprint=self.fingerprint(title, authors, pub_year))
+                for pk, title, authors, pub_year in rows
+            ], ['fingerprint'])
+            last_pk = rows[-1][0]
+            updated += len(rows)
+
+    def _block_rows(self, block: str, first: str, last: str) -> List[_Entry]:
+        """块内指纹在 [first, last] 区间的文献及其前后各 CANDIDATE_LIMIT 条，按指纹排序"""
+        in_block = Literature.objects.filter(fingerprint__gte=block, fingerprint__lt=block + '\uffff')
+        before = in_block.filter(fingerprint__lt=first).order_by('-fingerprint', '-pk')
+        rows = [_Entry(*row) for row in before.values_list(*self.ENTRY_FIELDS)[:self.CANDIDATE_LIMIT]][::-1]
+        after = 0
+        following = in_block.filter(fingerprint__gte=first).order_by('fingerprint', 'pk').values_list(*self.ENTRY_FIELDS)
+        for row in following.iterator(chunk_size=self.CANDIDATE_LIMIT * 2):
+            entry = _Entry(*row)
+            rows.append(entry)
+            if entry.fingerprint > last:
+                after += 1
+                if after >= self.CANDIDATE_LIMIT:
+                    break
+        return rows
+
+    def check(self, literature_ids: Iterable[int]) -> int:
+        """检查新增或修改的文献，返回发现的疑似重复对数"""
+        blocks = defaultdict(list)
+        for row in Literature.objects.filter(pk__in=list(literature_ids)).values_list(*self.ENTRY_FIELDS):
+            entry = _Entry(*row)
+            block = self.block(entry.fingerprint)
+            # 标题太短，不参与查重
+            if len(block) >= self.BLOCK_PREFIX:
+                blocks[block].append(entry)
+
+        pairs = []
+        for block, entries in blocks.items():
+            fingerprints = [entry.fingerprint for entry in entries]
+            rows = self._block_rows(block, min(fingerprints), max(fingerprints))
+            position = {row.pk: index for index, row in enumerate(rows)}
+            for entry in entries:
+                index = position.get(entry.pk)
+                if index is None:
+                    # 读取之间指纹被修改，交给修改后的检查
+                    continue
+                candidates = rows[max(index - self.CANDIDATE_LIMIT, 0):index] + \
+                    rows[index + 1:index + 1 + self.CANDIDATE_LIMIT]
+                for candidate in candidates:
+                    score = self.score(entry, candidate)
+                    if score >= self.THRESHOLD:
+                        pairs.append((entry.pk, candidate.pk, score))
+        return self._record(pairs)
+
+    def scan(self, progress: Callable[[int, int], None] = None) -> Dict:
+        """全量扫描，progress(已扫描条数, 已发现对数) 每 CHUNK_SIZE 条调用一次"""
+        self.rebuild_fingerprints()
+        window, block = deque(maxlen=self.WINDOW), None
+        pairs, found, scanned = [], 0, 0
+        rows = Literature.objects.order_by('fingerprint').values_list(*self.ENTRY_FIELDS)
+        for row in rows.iterator(chunk_size=self.CHUNK_SIZE):
+            entry = _Entry(*row)
+            scanned += 1
+            entry_block = self.block(entry.fingerprint)
+            if entry_block != block:
+                window.clear()
+                block = entry_block
+            for other in window:
+                score = self.score(entry, other)
+                if score >= self.THRESHOLD:
+                    pairs.append((entry.pk, other.pk, score))
+            window.append(entry)
+            if len(pairs) >= self.BATCH_SIZE:
+                found += self._record(pairs)
+                pairs = []
+            if progress is not None and scanned % self.CHUNK_SIZE == 0:
+                progress(scanned, found + len(pairs))
+        found += self._record(pairs)
+        return {'scanned': scanned, 'pairs': found}
+
+    # ---- 合并 ----
+
+    def _merge_users(self, literature: Literature, duplicate: Literature) -> int:
+        """把被合并文献的用户文献库记录转到保留的文献上，两条都收藏了的用户合并评级、备注和收藏"""
+        kept = {
+            row.user_id: row for row in LiteratureUser.objects.filter(
+                literature=literature,
+                user_id__in=LiteratureUser.objects.filter(literature=duplicate).values('user_id')
+            )
+        }
+        for row in LiteratureUser.objects.filter(literature=duplicate, user_id__in=list(kept)):
+            target = kept[row.user_id]
+            target.rating = target.rating or row.rating
+            target.is_favorite = target.is_favorite or row.is_favorite
+            if row.notes and row.notes != target.notes:
+                target.notes = f'{target.notes}\n\n{row.notes}' if target.notes else row.notes
+        if kept:
+            LiteratureUser.objects.bulk_update(list(kept.values()), ['rating', 'is_favorite', 'notes'])
+            LiteratureUser.objects.filter(literature=duplicate, user_id__in=list(kept)).delete()
+        # update 不触发信号，转移过来的记录可能属于不同的领域和期刊
+        library_stats_service.invalidate_literature([duplicate.pk])
+        moved = LiteratureUser.objects.filter(literature=duplicate).update(literature=literature)
+        return moved + len(kept)
+
+    def merge(self, literature_id: int, duplicate_id: int) -> Dict:
+        """把 duplicate 合并到 literature：补全空字段、累加浏览和下载次数、
+        转移用户文献库记录和旧文献迁移记录，然后删除 duplicate"""
+        if literature_id == duplicate_id:
+            return {'error': '不能与自身合并'}
+        with transaction.atomic():
+            rows = {row.pk: row for row in Literature.objects.select_for_update().filter(pk__in=[literature_id, duplicate_id])}
+            if len(rows) < 2:
+                return {'error': '文献不存在'}
+            literature, duplicate = rows[literature_id], rows[duplicate_id]
+
+            attnames = {field: Literature._meta.get_field(field).attname for field in self.MERGE_FIELDS}
+            filled = [
+                field for field in self.MERGE_FIELDS
+                if not getattr(literature, attnames[field]) and getattr(duplicate, attnames[field])
+            ]
+            released = [field for field in self.UNIQUE_MERGE_FIELDS if field in filled]
+            if released:
+                # 先释放唯一约束
+                Literature.objects.filter(pk=duplicate.pk).update(**{field: None for field in released})
+            for field in filled:
+                setattr(literature, attnames[field], getattr(duplicate, attnames[field]))
+            counters = [field for field in self.MERGE_COUNTERS if getattr(duplicate, field)]
+            for field in counters:
+                setattr(literature, field, getattr(literature, field) + getattr(duplicate, field))
+            if filled or counters:
+                literature.save(update_fields=filled + counters + ['updated_at'])
+
+            moved = self._merge_users(literature, duplicate)
+            # 旧文献ID仍能找到合并后的文献，不随 duplicate 删除置空
+            LegacyLiteratureMapping.objects.filter(literature=duplicate).update(literature=literature)
+            duplicate.delete()
+        return {'success': True, 'literature_id': literature_id, 'moved_users': moved, 'filled_fields': filled}
+
+    def merge_pending(self, min_score: float) -> int:
+        """合并相似度不低于 min_score 的待处理重复对，返回合并数"""
+        merged = 0
+        pairs = list(LiteratureDuplicate.objects.filter(
+            status=DuplicateStatus.PENDING, score__gte=min_score
+        ).order_by('duplicate_of_id', 'literature_id').values_list('duplicate_of_id', 'literature_id'))
+        for literature_id, duplicate_id in pairs:
+            # 链式重复中前面的合并可能已经删掉了其中一条
+            if 'success' in self.merge(literature_id, duplicate_id):
+                merged += 1
+        return merged
+
+# 创建全局实例
+literature_dedupe_service = LiteratureDedupeService()
@@ -0,0 +1,178 @@
+import csv
+import json
+import re
+import zlib
+from typing import Dict, Iterable, Iterator, List
+
+
+class _Echo:
+    """csv.writer 的写入目标，直接返回写入的内容"""
+
+    def write(self, value):
+        return value
+
+
+class LiteratureExportService:
+    """用户文献库流式导出服务
+
+    查询只取导出需要的列（values），用 iterator(chunk_size) 分批从数据库读取，
+    逐行格式化后累积到 BUFFER_SIZE 就产出一次，内存占用与文献库大小无关。
+    CSV 的列名与导入解析器的别名一致，导出文件可以直接重新导入。
+    """
+
+    CHUNK_SIZE = 2000
+    BUFFER_SIZE = 64 * 1024
+    FORMATS = {
+        'csv': ('text/csv; charset=utf-8', 'csv'),
+        'ris': ('application/x-research-info-systems; charset=utf-8', 'ris'),
+        'bibtex': ('application/x-bibtex; charset=utf-8', 'bib'),
+        'jsonl': ('application/x-ndjson; charset=utf-8', 'jsonl'),
+    }
+    FIELDS = {
+        'id': 'literature_id',
+        'title': 'literature__title',
+        'authors': 'literature__authors',
+        'journal': 'literature__journal__name',
+        'year': 'literature__pub_year',
+        'pub_date': 'literature__pub_date',
+        'volume': 'literature__volume',
+        'issue': 'literature__issue',
+        'pages': 'literature__pages',
+        'doi': 'literature__doi',
+        'pmid': 'literature__pmid',
+        'keywords': 'literature__keywords',
+        'abstract': 'literature__abstract',
+        'rating': 'rating',
+        'is_favorite': 'is_favorite',
+        'notes': 'notes',
+        'added_at': 'created_at',
+    }
+
+    def rows(self, queryset) -> Iterator[Dict]:
+        """逐条读取导出字段"""
+        lookups = list(self.FIELDS.values())
+        names = list(self.FIELDS)
+        for values in queryset.values_list(*lookups).iterator(chunk_size=self.CHUNK_SIZE):
+            yield dict(zip(names, values))
+
+    def _split(self, value, pattern: str) -> List[str]:
+        return [item.strip() for item in re.split(pattern, value or '') if item.strip()]
+
+    def _authors(self, row: Dict) -> List[str]:
+        return self._split(row['authors'], r'[,;]')
+
+    def _keywords(self, row: Dict) -> List[str]:
+        return self._split(row['keywords'], r';')
+
+    def _line(self, value) -> str:
+        """多行文本合并为一行"""
+        return ' '.join(str(value).split()) if value is not None else ''
+
+    # ---- 各格式的逐行格式化 ----
+
+    def format_csv(self, rows: Iterable[Dict]) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        # Excel 依赖 BOM 识别 UTF-8
+        yield '\ufeff' + writer.writerow(list(self.FIELDS))
+        for row in rows:
+            row = dict(row, authors='; '.join(self._authors(row)), keywords='; '.join(self._keywords(row)))
+            yield writer.writerow(['' if value is None else value for value in row.values()])
+
+    def format_ris(self, rows: Iterable[Dict]) -> Iterator[str]:
+        for row in rows:
+            lines = ['TY  - JOUR', f"TI  - {self._line(row['title'])}"]
+            lines += [f'AU  - {author}' for author in self._authors(row)]
+            lines.append(f"T2  - {self._line(row['journal'])}")
+            lines.append(f"PY  - {row['year']}")
+            if row['pub_date']:
+                lines.append(f"DA  - {row['pub_date'].strftime('%Y/%m/%d')}")
+            for tag, field in (('VL', 'volume'), ('IS', 'issue'), ('DO', 'doi'), ('AN', 'pmid')):
+                if row[field]:
+                    lines.append(f'{tag}  - {self._line(row[field])}')
+            if row['pages']:
+                start, _, end = row['pages'].partition('-')
+                lines.append(f'SP  - {start.strip()}')
+                if end.strip():
+                    lines.append(f'EP  - {end.strip()}')
+            lines += [f'KW  - {keyword}' for keyword in self._keywords(row)]
+            if row['abstract']:
+                lines.append(f"AB  - {self._line(row['abstract'])}")
+            if row['notes']:
+                lines.append(f"N1  - {self._line(row['notes'])}")
+            lines.append('ER  - ')
+            yield '\n'.join(lines) + '\n\n'
+
+    def _bibtex_value(self, value) -> str:
+        # 去掉花括号，避免破坏条目结构
+        return self._line(value).replace('{', '').replace('}', '')
+
+    def _bibtex_key(self, row: Dict) -> str:
+        authors = self._authors(row)
+        surname = re.sub(r'[^A-Za-z]', '', authors[0].split()[-1]) if authors else ''
+        return f"{surname or 'lit'}{row['year'] or ''}_{row['id']}"
+
+    def format_bibtex(self, rows: Iterable[Dict]) -> Iterator[str]:
+        for row in rows:
+            fields = [
+                ('title', row['title']),
+                ('author', ' and '.join(self._authors(row))),
+                ('journal', row['journal']),
+                ('year', row['year']),
+                ('volume', row['volume']),
+                ('number', row['issue']),
+                ('pages', row['pages'].replace('-', '--') if row['pages'] else None),
+                ('doi', row['doi']),
+                ('pmid', row['pmid']),
+                ('keywords', ', '.join(self._keywords(row))),
+                ('abstract', row['abstract']),
+                ('note', row['notes']),
+            ]
+            body = ',\n'.join(
+                f'  {name} = {{{self._bibtex_value(value)}}}' for name, value in fields if value not in (None, '')
+            )
+            yield f'@article{{{self._bibtex_key(row)},\n{body}\n}}\n\n'
+
+    def format_jsonl(self, rows: Iterable[Dict]) -> Iterator[str]:
+        for row in rows:
+            row = dict(row, authors=self._authors(row), keywords=self._keywords(row))
+            yield json.dumps(row, ensure_ascii=False, default=str) + '\n'
+
+    # ---- 输出 ----
+
+    def stream(self, queryset, export_format: str, compress: bool = False) -> Iterator[bytes]:
+        """按格式逐块产出字节，compress 为 True 时输出 gzip"""
+        formatter = getattr(self, f'format_{export_format}')
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+        def encode(buffer: List[str], flush: bool = False) -> bytes:
+            data = ''.join(buffer).encode('utf-8')
+            if not compressor:
+                return data
+            data = compressor.compress(data)
+            return data + compressor.flush(zlib.Z_SYNC_FLUSH) if flush else data
+
+        buffer, size, started = [], 0, False
+        for text in formatter(self.rows(queryset)):
+            buffer.append(text)
+            size += len(text)
+            # 第一行立即发出，之后按 BUFFER_SIZE 成块发送
+            if size >= self.BUFFER_SIZE or not started:
+                data = encode(buffer, flush=not started)
+                buffer, size, started = [], 0, True
+                if data:
+                    yield data
+        data = encode(buffer)
+        if compressor:
+            data += compressor.flush()
+        if data:
+            yield data
+
+    def filename(self, export_format: str, compress: bool = False) -> str:
+        name = f'literature_library.{self.FORMATS[export_format][1]}'
+        return f'{name}.gz' if compress else name
+
+    def content_type(self, export_format: str, compress: bool = False) -> str:
+        return 'application/gzip' if compress else self.FORMATS[export_format][0]
+
+# 创建全局实例
+literature_export_service = LiteratureExportService()
@@ -25,7 +25,8 @@ class FileUploadService:
         'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
         'application/msword': '.doc',
         'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
-        'application/vnd.ms-excel': '.xls'
+        'application/vnd.ms-excel': '.xls',
+        'text/csv': '.csv'
     }
     
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
@@ -46,11 +47,15 @@ class FileUploadService:
             file_type = mimetypes.guess_type(file.name)[0] or 'application/octet-stream'
             file.seek(0)  # 重置文件指针
             
-            return (file_type in self.ALLOWED_IMAGE_TYPES or 
-                   file_type in self.ALLOWED_DOCUMENT_TYPES)
+            return self.is_allowed_type(file_type)
         except Exception:
             return False
     
+    def is_allowed_type(self, file_type: str) -> bool:
+        """判断MIME类型是否允许上传"""
+        return (file_type in self.ALLOWED_IMAGE_TYPES or
+                file_type in self.ALLOWED_DOCUMENT_TYPES)
+    
     def validate_file_size(self, file, max_size: int = None) -> bool:
         """验证文件大小"""
         if max_size is None:
@@ -105,33 +110,41 @@ class FileUploadService:
             # 计算文件哈希
             file_hash = self.calculate_file_hash(file)
             
-            # 获取文件信息
-            file_info = {
-                'filename': filename,
-                'original_name': file.name,
-                'file_path': file_path,
-                'file_size': file.size,
-                'file_type': actual_file_type,
-                'file_hash': file_hash,
-                'upload_time': datetime.now().isoformat(),
-                'relative_path': f"uploads/{filename}"
-            }
-            
-            # 如果是PDF，提取额外信息
-            if actual_file_type == 'application/pdf':
-                pdf_info = self.extract_pdf_info(file_path)
-                file_info.update(pdf_info)
-            
-            # 如果是图片，生成缩略图
-            elif actual_file_type in self.ALLOWED_IMAGE_TYPES:
-                thumbnail_path = self.create_thumbnail(file_path)
-                file_info['thumbnail_path'] = thumbnail_path
-            
+            file_info = self.build_file_info(
+                filename, file.name, file.size, actual_file_type, file_hash
+            )
             return {'success': True, 'file_info': file_info}
             
         except Exception as e:
             return {'error': f'文件上传失败: {str(e)}'}
     
+    def build_file_info(self, filename: str, original_name: str, file_size: int,
+                        file_type: str, file_hash: str) -> Dict:
+        """生成已保存文件的信息，并做PDF解析/缩略图等后处理"""
+        file_path = os.path.join(self.upload_dir, filename)
+        file_info = {
+            'filename': filename,
+            'original_name': original_name,
+            'file_path': file_path,
+            'file_size': file_size,
+            'file_type': file_type,
+            'file_hash': file_hash,
+            'upload_time': datetime.now().isoformat(),
+            'relative_path': f"uploads/{filename}"
+        }
+        
+        # 如果是PDF，提取额外信息
+        if file_type == 'application/pdf':
+            pdf_info = self.extract_pdf_info(file_path)
+            file_info.update(pdf_info)
+        
+        # 如果是图片，生成缩略图
+        elif file_type in self.ALLOWED_IMAGE_TYPES:
+            thumbnail_path = self.create_thumbnail(file_path)
+            file_info['thumbnail_path'] = thumbnail_path
+        
+        return file_info
+    
     def extract_pdf_info(self, file_path: str) -> Dict:
         """提取PDF信息"""
         return {'pdf_pages': 0, 'pdf_title': '', 'pdf_author': '', 'pdf_subject': ''}
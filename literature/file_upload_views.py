@@ -4,6 +4,7 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 from .file_upload_service import file_upload_service
+from .chunked_upload_service import chunked_upload_service
 from .utils import ApiResponse
 
 class FileUploadView(APIView):
@@ -30,6 +31,163 @@ class FileUploadView(APIView):
                     ApiResponse.error(result['error']),
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            if request.user.is_authenticated:
+                # 记录上传用户，图表聚合等按文件名引用的接口据此校验归属
+                chunked_upload_service.record_owner(result['file_info']['filename'], request.user.id)
+            
+            return Response(
+                ApiResponse.success(result['file_info'], "文件上传成功"),
+                status=status.HTTP_201_CREATED
+            )
+            
+        except Exception as e:
+            return Response(
+                ApiResponse.error(f"文件上传失败: {str(e)}"),
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+def _chunked_error_response(result):
+    """根据分片上传服务的错误类型返回对应状态码"""
+    if result.get('not_found'):
+        return Response(ApiResponse.error(result['error']), status=status.HTTP_404_NOT_FOUND)
+    if result.get('conflict'):
+        response = ApiResponse.error(result['error'], code='offset_mismatch')
+        response['data'] = {'offset': result['offset']}
+        return Response(response, status=status.HTTP_409_CONFLICT)
+    return Response(ApiResponse.error(result['error']), status=status.HTTP_400_BAD_REQUEST)
+
+def _chunked_session_denied(request, upload_id):
+    """上传会话属于其他用户时按不存在处理"""
+    user_id = request.user.id if request.user.is_authenticated else None
+    if chunked_upload_service.is_owner(upload_id, user_id):
+        return None
+    return _chunked_error_response({'error': '上传会话不存在或已过期', 'not_found': True})
+
+class ChunkedUploadInitView(APIView):
+    """分片上传初始化API"""
+    permission_classes = [AllowAny]
+    
+    def post(self, request):
+        """创建分片上传会话"""
+        filename = request.data.get('filename', '')
+        file_hash = request.data.get('file_hash', '')
+        file_type = request.data.get('type', 'general')
+        
+        try:
+            file_size = int(request.data.get('file_size', 0))
+        except (TypeError, ValueError):
+            return Response(
+                ApiResponse.error("文件大小无效"),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            user_id = request.user.id if request.user.is_authenticated else None
+            result = chunked_upload_service.init_upload(filename, file_size, file_hash, file_type, user_id)
+            
+            if 'error' in result:
+                return _chunked_error_response(result)
+            
+            return Response(
+                ApiResponse.success(result['upload'], "上传会话创建成功"),
+                status=status.HTTP_201_CREATED
+            )
+            
+        except Exception as e:
+            return Response(
+                ApiResponse.error(f"创建上传会话失败: {str(e)}"),
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+class ChunkedUploadView(APIView):
+    """分片上传API
+
+    GET    查询已接收字节数（断点续传时先查询偏移量）
+    PUT    以原始请求体上传分片，偏移量通过 Upload-Offset 请求头或 offset 参数传递
+    DELETE 取消上传
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request, upload_id):
+        """查询上传进度"""
+        denied = _chunked_session_denied(request, upload_id)
+        if denied:
+            return denied
+        result = chunked_upload_service.get_status(upload_id)
+        if 'error' in result:
+            return _chunked_error_response(result)
+        
+        return Response(
+            ApiResponse.success(result['upload']),
+            status=status.HTTP_200_OK
+        )
+    
+    def put(self, request, upload_id):
+        """上传分片"""
+        denied = _chunked_session_denied(request, upload_id)
+        if denied:
+            return denied
+        offset = request.headers.get('Upload-Offset', request.query_params.get('offset'))
+        try:
+            offset = int(offset)
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except (TypeError, ValueError):
+            return Response(
+                ApiResponse.error("未提供有效的分片偏移量"),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            # 直接读取请求流并写入临时文件，不把分片整体载入内存
+            stream = request.stream
+            if stream is None:
+                return Response(
+                    ApiResponse.error("分片内容为空"),
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            result = chunked_upload_service.append_chunk(upload_id, offset, stream, length)
+            if 'error' in result:
+                return _chunked_error_response(result)
+            
+            return Response(
+                ApiResponse.success(result['upload'], "分片上传成功"),
+                status=status.HTTP_200_OK
+            )
+            
+        except Exception as e:
+            return Response(
+                ApiResponse.error(f"分片上传失败: {str(e)}"),
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    def delete(self, request, upload_id):
+        """取消上传"""
+        denied = _chunked_session_denied(request, upload_id)
+        if denied:
+            return denied
+        result = chunked_upload_service.abort_upload(upload_id)
+        if 'error' in result:
+            return _chunked_error_response(result)
+        
+        return Response(
+            ApiResponse.success(None, "上传已取消"),
+            status=status.HTTP_200_OK
+        )
+
+class ChunkedUploadCompleteView(APIView):
+    """分片上传完成API"""
+    permission_classes = [AllowAny]
+    
+    def post(self, request, upload_id):
+        """校验文件并完成上传"""
+        denied = _chunked_session_denied(request, upload_id)
+        if denied:
+            return denied
+        try:
+            result = chunked_upload_service.complete_upload(upload_id)
+            if 'error' in result:
+                return _chunked_error_response(result)
             
             return Response(
                 ApiResponse.success(result['file_info'], "文件上传成功"),
@@ -105,6 +263,7 @@ class FileUploadConfigView(APIView):
                 'max_image_size': file_upload_service.MAX_IMAGE_SIZE,
                 'allowed_image_types': list(file_upload_service.ALLOWED_IMAGE_TYPES.keys()),
                 'allowed_document_types': list(file_upload_service.ALLOWED_DOCUMENT_TYPES.keys()),
+                'chunk_size': chunked_upload_service.chunk_size,
                 'upload_dir': 'media/uploads'
             }
             
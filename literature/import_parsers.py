@@ -0,0 +1,239 @@
+"""文献导入格式解析
+
+每个解析器都是生成器，逐条产出统一格式的记录：
+title, authors(列表), abstract, journal, journal_abbreviation, pub_year, pub_date
+（或 pub_month/pub_day）, volume, issue, pages, doi, pmid, keywords(列表)。文件只读一遍，内存占用与文件大小无关。
+"""
+import csv
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, List
+
+from .pubmed_service import pubmed_service
+
+# RIS 标签 -> 记录字段（同一字段有多个标签时取第一个出现的值）
+RIS_FIELDS = {
+    'TI': 'title', 'T1': 'title',
+    'AB': 'abstract', 'N2': 'abstract',
+    'T2': 'journal', 'JF': 'journal', 'JO': 'journal_abbreviation', 'JA': 'journal_abbreviation',
+    'PY': 'pub_year', 'Y1': 'pub_year', 'DA': 'pub_date',
+    'VL': 'volume', 'IS': 'issue', 'SP': 'start_page', 'EP': 'end_page',
+    'DO': 'doi',
+}
+RIS_LIST_FIELDS = {'AU': 'authors', 'A1': 'authors', 'KW': 'keywords'}
+RIS_LINE = re.compile(r'^([A-Z][A-Z0-9])  -( (.*))?$')
+BIBTEX_FIELD = re.compile(r'\s*,?\s*([A-Za-z][\w\-]*)\s*=\s*')
+BIBTEX_BARE_VALUE = re.compile(r'[^,]*')
+BIBTEX_ENTRY = re.compile(r'@\s*(\w+)\s*([{(])')
+
+
+def _finish_ris(record: Dict) -> Dict:
+    start, end = record.pop('start_page', ''), record.pop('end_page', '')
+    if start:
+        record['pages'] = f'{start}-{end}' if end else start
+    return record
+
+
+def parse_ris(lines: Iterable[str]) -> Iterator[Dict]:
+    """解析 RIS（TY 开始，ER 结束，续行拼接到上一个标签）"""
+    record, last_field = None, None
+    for line in lines:
+        line = line.rstrip('\r\n').lstrip('\ufeff')
+        match = RIS_LINE.match(line)
+        if not match:
+            # 续行
+            if record is not None and last_field and line.strip():
+                value = record[last_field]
+                if isinstance(value, list):
+                    value[-1] = f'{value[-1]} {line.strip()}'
+                else:
+                    record[last_field] = f'{value} {line.strip()}'
+            continue
+
+        tag, value = match.group(1), (match.group(3) or '').strip()
+        if tag == 'TY':
+            record, last_field = {'authors': [], 'keywords': []}, None
+        elif tag == 'ER':
+            if record is not None:
+                yield _finish_ris(record)
+            record, last_field = None, None
+        elif record is not None:
+            if tag in RIS_LIST_FIELDS:
+                last_field = RIS_LIST_FIELDS[tag]
+                record[last_field].append(value)
+            elif tag in RIS_FIELDS:
+                last_field = RIS_FIELDS[tag]
+                record.setdefault(last_field, value)
+            elif tag == 'AN' and value.isdigit():
+                # PubMed 导出的 RIS 把 PMID 放在 AN
+                record.setdefault('pmid', value)
+                last_field = None
+            else:
+                last_field = None
+    if record is not None:
+        yield _finish_ris(record)
+
+
+def _bibtex_fields(body: str) -> Dict[str, str]:
+    """解析 key = {value} / "value" / 数字 形式的字段"""
+    fields = {}
+    i, length = 0, len(body)
+    while i < length:
+        match = BIBTEX_FIELD.match(body, i)
+        if not match:
+            break
+        name, i = match.group(1).lower(), match.end()
+        if i >= length:
+            break
+        if body[i] in '{"':
+            closing = '}' if body[i] == '{' else '"'
+            depth, j = 0, i
+            while j < length:
+                char = body[j]
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                if (closing == '}' and depth == 0) or (closing == '"' and char == '"' and j > i and depth == 0):
+                    break
+                j += 1
+            value, i = body[i + 1:j], j + 1
+        else:
+            match = BIBTEX_BARE_VALUE.match(body, i)
+            value, i = match.group().strip(), match.end()
+        fields[name] = ' '.join(value.replace('{', '').replace('}', '').split())
+    return fields
+
+
+def _bibtex_authors(value: str) -> List[str]:
+    authors = []
+    for author in re.split(r'\s+and\s+', value):
+        author = author.strip()
+        if ',' in author:
+            # "Last, First" -> "First Last"
+            last, first = [part.strip() for part in author.split(',', 1)]
+            author = f'{first} {last}'.strip()
+        if author:
+            authors.append(author)
+    return authors
+
+
+def _bibtex_record(fields: Dict[str, str]) -> Dict:
+    return {
+        'title': fields.get('title', ''),
+        'authors': _bibtex_authors(fields.get('author', '')),
+        'abstract': fields.get('abstract', ''),
+        'journal': fields.get('journal') or fields.get('journaltitle') or fields.get('booktitle', ''),
+        'pub_year': fields.get('year', ''),
+        'pub_date': fields.get('date', ''),
+        'volume': fields.get('volume', ''),
+        'issue': fields.get('number', ''),
+        'pages': fields.get('pages', '').replace('--', '-'),
+        'doi': fields.get('doi', ''),
+        'pmid': fields.get('pmid', ''),
+        'keywords': [keyword.strip() for keyword in re.split(r'[;,]', fields.get('keywords', '')) if keyword.strip()],
+    }
+
+
+def parse_bibtex(lines: Iterable[str]) -> Iterator[Dict]:
+    """解析 BibTeX，按花括号深度逐条切分，@string/@comment/@preamble 忽略"""
+    buffer, depth, entry_type, opening, closing = [], 0, None, '{', '}'
+    for line in lines:
+        if entry_type is None:
+            match = BIBTEX_ENTRY.search(line)
+            if not match:
+                continue
+            entry_type = match.group(1).lower()
+            # 条目可以用 @article{...} 或 @article(...)
+            opening = match.group(2)
+            closing = '}' if opening == '{' else ')'
+            line = line[match.end():]
+            depth = 1
+            buffer = []
+        end = None
+        for index, char in enumerate(line):
+            if char == opening:
+                depth += 1
+            elif char == closing:
+                depth -= 1
+                if depth == 0:
+                    end = index
+                    break
+        if end is None:
+            buffer.append(line)
+            continue
+
+        buffer.append(line[:end])
+        body = ''.join(buffer)
+        if entry_type not in ('string', 'comment', 'preamble'):
+            # 去掉引用键
+            body = body.split(',', 1)[1] if ',' in body else ''
+            yield _bibtex_record(_bibtex_fields(body))
+        entry_type = None
+
+
+def parse_nlm_xml(file) -> Iterator[Dict]:
+    """流式解析 PubMed/NLM XML（PubmedArticleSet），每解析完一篇就释放元素"""
+    root = None
+    for event, element in ET.iterparse(file, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+        if element.tag == 'PubmedArticle':
+            record = pubmed_service.parse_article(element)
+            if record:
+                yield record
+            root.clear()
+
+
+# CSV 表头别名
+CSV_FIELDS = {
+    'title': ('title', '标题', 'article title'),
+    'authors': ('authors', 'author', '作者'),
+    'abstract': ('abstract', '摘要'),
+    'journal': ('journal', 'source title', 'journal/book', '期刊'),
+    'pub_year': ('year', 'pub_year', 'publication year', '年份'),
+    'pub_date': ('pub_date', 'date', 'create date', '发表日期'),
+    'volume': ('volume', '卷号'),
+    'issue': ('issue', '期号'),
+    'pages': ('pages', '页码'),
+    'doi': ('doi',),
+    'pmid': ('pmid', 'pubmed id'),
+    'keywords': ('keywords', '关键词'),
+}
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Dict]:
+    """解析 CSV，作者用逗号或分号、关键词用分号分隔"""
+    reader = csv.DictReader(lines)
+    aliases = {alias: field for field, names in CSV_FIELDS.items() for alias in names}
+    mapping = {}
+    for column in reader.fieldnames or []:
+        field = aliases.get((column or '').strip().lstrip('\ufeff').lower())
+        if field and field not in mapping.values():
+            mapping[column] = field
+
+    for row in reader:
+        record = {field: (row.get(column) or '').strip() for column, field in mapping.items()}
+        authors = record.get('authors', '')
+        record['authors'] = [a.strip() for a in re.split(r';' if ';' in authors else r',', authors) if a.strip()]
+        record['keywords'] = [k.strip() for k in record.get('keywords', '').split(';') if k.strip()]
+        yield record
+
+
+PARSERS = {
+    'ris': parse_ris,
+    'bibtex': parse_bibtex,
+    'nlm_xml': parse_nlm_xml,
+    'csv': parse_csv,
+}
+
+# 扩展名 -> 格式
+EXTENSIONS = {
+    '.ris': 'ris',
+    '.bib': 'bibtex',
+    '.bibtex': 'bibtex',
+    '.xml': 'nlm_xml',
+    '.csv': 'csv',
+}
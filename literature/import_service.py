@@ -0,0 +1,442 @@
+import os
+import re
+import shutil
+import threading
+import uuid
+from datetime import date, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.response_cache import response_cache
+from .dedupe_service import literature_dedupe_service
+from .file_upload_service import file_upload_service
+from .import_parsers import EXTENSIONS, PARSERS
+from .library_stats_service import library_stats_service
+from .models import Journal, Literature, LiteratureUser, LiteratureImportJob, ImportStatus
+from .notification_service import notification_manager
+from .pubmed_service import pubmed_service
+
+
+class LiteratureImportService:
+    """文献批量导入服务
+
+    解析器逐条产出记录，按 CHUNK_SIZE 分块处理，每块：
+    1. 一次 name__in 查询期刊，缺失的 bulk_create
+    2. 一次 doi__in / pmid__in 查询已存在的文献（块内重复同样合并）
+    3. bulk_create 新文献，并把新建和已存在的文献一起加入用户文献库
+    新建的文献在事务提交后交给 dedupe_service 检查疑似重复（doi/pmid 之外的重复）。
+    每块一个事务，任务进度随块更新，每 PROGRESS_NOTIFY_CHUNKS 块发送一次进度通知。
+    PubMed 导入等已有记录列表的场景直接调用 import_records；
+    按 PMID/检索式从 PubMed 导入见 import_from_pubmed（以 PubMed 数据为准更新已有文献）。
+    """
+
+    CHUNK_SIZE = 1000
+    BATCH_SIZE = 500
+    PROGRESS_NOTIFY_CHUNKS = 10
+    # 执行中的任务超过这个时间没有进度（进程退出、线程中断）视为中断，可以重新领取
+    STALE_JOB_MINUTES = 30
+    UNKNOWN_JOURNAL = '未知期刊'
+    # 每次 efetch 的 PMID 数，以及单次 PubMed 导入的结果数上限
+    PUBMED_FETCH_SIZE = 200
+    PUBMED_MAX_RESULTS = 1000
+    # PMID 冲突时用 PubMed 数据覆盖的字段；DOI 不覆盖，只在已有文献没有 DOI 时补上
+    PUBMED_UPDATE_FIELDS = ['title', 'abstract', 'authors', 'journal', 'pub_year', 'pub_date',
+                            'volume', 'issue', 'pages', 'keywords', 'fingerprint', 'updated_at']
+    # PubMed 没有返回时保留已有值的字段
+    PUBMED_KEEP_FIELDS = ('abstract', 'authors', 'pub_date', 'volume', 'issue', 'pages', 'keywords')
+    _EXISTING_FIELDS = ('pk', 'pmid', 'doi') + PUBMED_KEEP_FIELDS
+    MONTHS = {name: index for index, name in enumerate(
+        ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1
+    )}
+
+    @property
+    def import_dir(self) -> str:
+        return os.path.join(file_upload_service.upload_dir, 'imports')
+
+    def detect_format(self, filename: str) -> Optional[str]:
+        return EXTENSIONS.get(os.path.splitext(filename or '')[1].lower())
+
+    # ---- 记录规范化 ----
+
+    def normalize_doi(self, value) -> str:
+        doi = (value or '').strip().lower()
+        doi = re.sub(r'^(https?://(dx\.)?doi\.org/|doi:\s*)', '', doi)
+        return doi[:100]
+
+    def _month(self, value) -> Optional[int]:
+        value = str(value or '').strip().lower()
+        if value.isdigit():
+            return int(value) if 1 <= int(value) <= 12 else None
+        return self.MONTHS.get(value[:3])
+
+    def parse_date(self, record: Dict) -> Optional[date]:
+        """支持 2024-01-15 / 2024/01/15 / 2024-01 以及 PubMed 的 年+英文月份+日"""
+        numbers = re.findall(r'\d+', str(record.get('pub_date') or record.get('pub_year') or ''))
+        if not numbers or len(numbers[0]) != 4:
+            return None
+        if len(numbers) > 1:
+            month, day = numbers[1], numbers[2] if len(numbers) > 2 else None
+        else:
+            month, day = record.get('pub_month'), record.get('pub_day')
+        month = self._month(month)
+        if not month:
+            return None
+        try:
+            return date(int(numbers[0]), month, int(day) if day else 1)
+        except (TypeError, ValueError):
+            return None
+
+    def _join(self, value, separator: str) -> str:
+        if isinstance(value, (list, tuple)):
+            return separator.join(item.strip() for item in value if item and item.strip())
+        return (value or '').strip()
+
+    def normalize_record(self, record: Dict) -> Optional[Dict]:
+        """转换为 Literature 字段，缺少标题或年份时返回 None"""
+        title = ' '.join((record.get('title') or '').split()).rstrip('.')
+        pub_date = self.parse_date(record)
+        year_match = re.search(r'\d{4}', str(record.get('pub_year') or ''))
+        pub_year = int(year_match.group()) if year_match else (pub_date.year if pub_date else None)
+        if not title or not pub_year:
+            return None
+
+        journal = (record.get('journal') or record.get('journal_abbreviation') or '').strip()
+        authors = self._join(record.get('authors'), ', ')
+        return {
+            'title': title[:500],
+            'abstract': (record.get('abstract') or '').strip() or None,
+            'authors': authors,
+            'journal': journal[:255] or self.UNKNOWN_JOURNAL,
+            'pub_year': pub_year,
+            'pub_date': pub_date,
+            'volume': (record.get('volume') or '').strip()[:50] or None,
+            'issue': (record.get('issue') or '').strip()[:50] or None,
+            'pages': (record.get('pages') or '').strip()[:50] or None,
+            'doi': self.normalize_doi(record.get('doi')) or None,
+            'pmid': re.sub(r'\D', '', str(record.get('pmid') or ''))[:100] or None,
+            'keywords': self._join(record.get('keywords'), '; ') or None,
+            # bulk_create 不触发 pre_save，指纹在这里算好
+            'fingerprint': literature_dedupe_service.fingerprint(title[:500], authors, pub_year),
+        }
+
+    # ---- 分块写入 ----
+
+    def resolve_journals(self, names: Iterable[str]) -> Dict[str, Journal]:
+        """按名称批量获取期刊，不存在的批量创建"""
+        names = set(names)
+        journals = {}
+        for journal in Journal.objects.filter(name__in=names).order_by('-pk'):
+            # 同名期刊取最早创建的一条
+            journals[journal.name] = journal
+        missing = [name for name in names if name not in journals]
+        if missing:
+            created = Journal.objects.bulk_create([Journal(name=name) for name in missing], batch_size=self.BATCH_SIZE)
+            journals.update((journal.name, journal) for journal in created)
+            # bulk_create 不触发 post_save
+            transaction.on_commit(lambda: response_cache.bump(Journal))
+        return journals
+
+    def _existing(self, records: List[Dict]) -> Dict:
+        """一次查询已存在的 doi / pmid -> 文献主键"""
+        dois = {record['doi'] for record in records if record['doi']}
+        pmids = {record['pmid'] for record in records if record['pmid']}
+        existing = {}
+        if dois or pmids:
+            rows = Literature.objects.filter(Q(doi__in=dois) | Q(pmid__in=pmids)).values_list('pk', 'doi', 'pmid')
+            for pk, doi, pmid in rows:
+                if doi:
+                    existing[('doi', doi)] = pk
+                if pmid:
+                    existing[('pmid', pmid)] = pk
+        return existing
+
+    def _write_chunk(self, records: List[Dict], user=None) -> Dict:
+        journals = self.resolve_journals(record['journal'] for record in records)
+        existing = self._existing(records)
+
+        pending, linked_ids, duplicates = {}, set(), 0
+        new_literatures = []
+        for record in records:
+            keys = [key for key in (('doi', record['doi']), ('pmid', record['pmid'])) if key[1]]
+            existing_pk = next((existing[key] for key in keys if key in existing), None)
+            if existing_pk is not None:
+                linked_ids.add(existing_pk)
+                duplicates += 1
+                continue
+            if any(key in pending for key in keys):
+                # 同一块内的重复记录
+                duplicates += 1
+                continue
+            fields = dict(record, journal=journals[record['journal']])
+            literature = Literature(**fields)
+            for key in keys:
+                pending[key] = literature
+            new_literatures.append(literature)
+
+        created = Literature.objects.bulk_create(new_literatures, batch_size=self.BATCH_SIZE)
+        linked_ids.update(literature.pk for literature in created)
+        created_ids = [literature.pk for literature in created]
+        transaction.on_commit(lambda: literature_dedupe_service.check(created_ids))
+        if user is not None and linked_ids:
+            LiteratureUser.objects.bulk_create(
+                [LiteratureUser(user=user, literature_id=pk) for pk in linked_ids],
+                batch_size=self.BATCH_SIZE, ignore_conflicts=True
+            )
+            library_stats_service.invalidate([user.pk])
+        return {'created': len(created), 'duplicates': duplicates}
+
+    def import_chunk(self, raw_records: List[Dict], user=None) -> Dict:
+        """导入一块记录，返回本块统计"""
+        records = [record for record in map(self.normalize_record, raw_records) if record is not None]
+        result = {'processed': len(raw_records), 'created': 0, 'duplicates': 0,
+                  'failed': len(raw_records) - len(records)}
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    result.update(self._write_chunk(records, user))
+                break
+            except IntegrityError:
+                # 并发导入写入了相同的 doi/pmid，重新查询已存在记录后重试一次
+                if attempt:
+                    raise
+        return result
+
+    def import_records(self, records: Iterable[Dict], user=None,
+                       progress: Callable[[Dict, int], None] = None) -> Dict:
+        """分块导入记录，progress(累计统计, 块序号) 在每块完成后调用"""
+        totals = {'processed': 0, 'created': 0, 'duplicates': 0, 'failed': 0}
+        records = iter(records)
+        chunk_index = 0
+        while True:
+            chunk = list(islice(records, self.CHUNK_SIZE))
+            if not chunk:
+                break
+            chunk_index += 1
+            for key, value in self.import_chunk(chunk, user).items():
+                totals[key] += value
+            if progress is not None:
+                progress(totals, chunk_index)
+        return totals
+
+    # ---- PubMed 导入 ----
+
+    def _claim_dois(self, records: Dict[str, Dict], existing: Dict[str, Dict]):
+        """处理 DOI 已被其他文献占用的记录
+
+        占用者没有 PMID（例如从 RIS 导入）时把 PMID 补到占用者上，随后的 upsert 会更新这一行；
+        否则 DOI 属于另一篇文献，本条记录不写 DOI，避免违反唯一约束。
+        """
+        by_doi = {}
+        for record in records.values():
+            if record['doi'] and record['doi'] in by_doi:
+                # 同一批次中两个 PMID 的 DOI 相同
+                record['doi'] = None
+            elif record['doi']:
+                by_doi[record['doi']] = record
+        if not by_doi:
+            return
+
+        claimed = []
+        for row in Literature.objects.filter(doi__in=by_doi).values(*self._EXISTING_FIELDS):
+            record = by_doi[row['doi']]
+            if row['pmid'] == record['pmid']:
+                continue
+            if row['pmid'] is None and record['pmid'] not in existing:
+                claimed.append(Literature(pk=row['pk'], pmid=record['pmid']))
+                existing[record['pmid']] = row
+            else:
+                record['doi'] = None
+        if claimed:
+            Literature.objects.bulk_update(claimed, ['pmid'], batch_size=self.BATCH_SIZE)
+
+    def _keep_existing(self, records: Dict[str, Dict], existing: Dict[str, Dict]) -> List[Literature]:
+        """PubMed 没有返回的字段沿用已有值；返回需要补上 DOI 的已有文献"""
+        filled_dois = []
+        for pmid, row in existing.items():
+            record = records[pmid]
+            for field in self.PUBMED_KEEP_FIELDS:
+                if record[field] in (None, '') and row[field] not in (None, ''):
+                    record[field] = row[field]
+            record['fingerprint'] = literature_dedupe_service.fingerprint(
+                record['title'], record['authors'], record['pub_year']
+            )
+            if record['doi'] and not row['doi']:
+                filled_dois.append(Literature(pk=row['pk'], doi=record['doi']))
+        return filled_dois
+
+    def upsert_pubmed_records(self, raw_records: Iterable[Dict], user=None) -> Dict:
+        """按 PMID 批量写入 PubMed 记录，已存在的文献用 PubMed 数据更新，并加入用户文献库
+
+        整批在一个事务中完成：期刊 1~2 条语句、已有 PMID/DOI 各一次查询、
+        bulk_create(update_conflicts=True) 每 BATCH_SIZE 条一条语句、用户文献库一条语句。
+        在请求中调用，不做逐条查重，由定时的 dedupe_literature 全量扫描发现重复。
+        """
+        records = {}
+        for record in map(self.normalize_record, raw_records):
+            if record is not None and record['pmid']:
+                records[record['pmid']] = record
+        if not records:
+            return {'created': 0, 'updated': 0, 'linked': 0}
+
+        with transaction.atomic():
+            journals = self.resolve_journals(record['journal'] for record in records.values())
+            existing = {
+                row['pmid']: row for row in Literature.objects.filter(pmid__in=records).values(*self._EXISTING_FIELDS)
+            }
+            self._claim_dois(records, existing)
+            filled_dois = self._keep_existing(records, existing)
+            updated = len(existing)
+
+            Literature.objects.bulk_create(
+                [Literature(**dict(record, journal=journals[record['journal']])) for record in records.values()],
+                batch_size=self.BATCH_SIZE, update_conflicts=True,
+                unique_fields=['pmid'], update_fields=self.PUBMED_UPDATE_FIELDS
+            )
+            if filled_dois:
+                Literature.objects.bulk_update(filled_dois, ['doi'], batch_size=self.BATCH_SIZE)
+            # update_conflicts 时不返回主键，按 PMID 再取一次
+            literature_ids = list(Literature.objects.filter(pmid__in=records).values_list('pk', flat=True))
+            if existing:
+                # upsert 不触发信号，期刊可能变化，收藏了已有文献的用户统计需要重建
+                library_stats_service.invalidate_literature([row['pk'] for row in existing.values()])
+            if user is not None:
+                LiteratureUser.objects.bulk_create(
+                    [LiteratureUser(user=user, literature_id=pk) for pk in literature_ids],
+                    batch_size=self.BATCH_SIZE, ignore_conflicts=True
+                )
+                library_stats_service.invalidate([user.pk])
+        return {'created': len(records) - updated, 'updated': updated, 'linked': len(literature_ids)}
+
+    def import_from_pubmed(self, user, pmids: Iterable = None, query: str = None,
+                           max_results: int = None) -> Dict:
+        """从 PubMed 导入指定 PMID 或检索式的结果到用户文献库"""
+        max_results = max(min(max_results or self.PUBMED_MAX_RESULTS, self.PUBMED_MAX_RESULTS), 1)
+        if query:
+            pmids = pubmed_service.search_literatures(query, max_results)
+        # 去重并保持顺序
+        pmids = list(dict.fromkeys(re.sub(r'\D', '', str(pmid)) for pmid in pmids or []))
+        pmids = [pmid for pmid in pmids if pmid][:max_results]
+
+        records = []
+        for start in range(0, len(pmids), self.PUBMED_FETCH_SIZE):
+            records.extend(pubmed_service.fetch_literatures_batch(pmids[start:start + self.PUBMED_FETCH_SIZE]))
+
+        result = self.upsert_pubmed_records(records, user)
+        result.update(requested=len(pmids), fetched=len(records))
+        if user is not None and result['linked']:
+            notification_manager.notify_literature_imported(str(user.pk), result['linked'])
+        return result
+
+    # ---- 后台任务 ----
+
+    def create_job(self, user, uploaded_file=None, source_path: str = None, original_name: str = '',
+                   file_format: str = None) -> Dict:
+        """保存导入文件并创建任务（上传的文件或已完成的分片上传文件）"""
+        original_name = os.path.basename(original_name or getattr(uploaded_file, 'name', '') or '')
+        file_format = file_format or self.detect_format(original_name)
+        if file_format not in PARSERS:
+            return {'error': '不支持的导入格式，请使用 RIS、BibTeX、PubMed XML 或 CSV'}
+
+        os.makedirs(self.import_dir, exist_ok=True)
+        file_path = os.path.join(self.import_dir, f'{uuid.uuid4().hex}{os.path.splitext(original_name)[1].lower()}')
+        if uploaded_file is not None:
+            with open(file_path, 'wb') as destination:
+                for chunk in uploaded_file.chunks():
+                    destination.write(chunk)
+        elif source_path and os.path.isfile(source_path):
+            # 复制而不是移动，上传的文件仍归上传者所有
+            shutil.copyfile(source_path, file_path)
+        else:
+            return {'error': '导入文件不存在'}
+
+        job = LiteratureImportJob.objects.create(
+            user=user, file_format=file_format, file_path=file_path, original_name=original_name
+        )
+        return {'success': True, 'job': job}
+
+    def start(self, job_id: int):
+        """提交任务：默认在后台线程执行，LITERATURE_IMPORT_ASYNC=False 时同步执行"""
+        if getattr(settings, 'LITERATURE_IMPORT_ASYNC', True):
+            threading.Thread(target=self._run_in_thread, args=(job_id,), daemon=True,
+                             name=f'literature-import-{job_id}').start()
+        else:
+            self.run_job(job_id)
+
+    def _run_in_thread(self, job_id: int):
+        try:
+            self.run_job(job_id)
+        finally:
+            connections.close_all()
+
+    def _open_records(self, job: LiteratureImportJob):
+        parser = PARSERS[job.file_format]
+        if job.file_format == 'nlm_xml':
+            # XML 由解析器按文件声明的编码解码
+            return open(job.file_path, 'rb'), parser
+        return open(job.file_path, 'r', encoding='utf-8-sig', errors='replace', newline=''), parser
+
+    def _claimable(self) -> Q:
+        """等待中的任务，以及长时间没有进度的执行中任务"""
+        cutoff = timezone.now() - timedelta(minutes=self.STALE_JOB_MINUTES)
+        stale = Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+        return Q(status=ImportStatus.PENDING) | (Q(status=ImportStatus.RUNNING) & stale)
+
+    def run_job(self, job_id: int) -> bool:
+        """执行任务，任务已被其他进程领取时返回 False；中断的任务从头重新导入，已导入的记录按重复处理"""
+        now = timezone.now()
+        claimed = LiteratureImportJob.objects.filter(self._claimable(), pk=job_id).update(
+            status=ImportStatus.RUNNING, started_at=now, heartbeat_at=now
+        )
+        if not claimed:
+            return False
+        job = LiteratureImportJob.objects.select_related('user').get(pk=job_id)
+        user_id = str(job.user_id)
+
+        def progress(totals, chunk_index):
+            LiteratureImportJob.objects.filter(pk=job_id).update(
+                processed_count=totals['processed'], created_count=totals['created'],
+                duplicate_count=totals['duplicates'], failed_count=totals['failed'], heartbeat_at=timezone.now()
+            )
+            if chunk_index % self.PROGRESS_NOTIFY_CHUNKS == 0:
+                notification_manager.notify_import_progress(user_id, job_id, totals['processed'])
+
+        try:
+            file, parser = self._open_records(job)
+            with file:
+                totals = self.import_records(parser(file), job.user, progress)
+        except Exception as exc:
+            LiteratureImportJob.objects.filter(pk=job_id).update(
+                status=ImportStatus.FAILED, error_message=str(exc)[:1000], finished_at=timezone.now()
+            )
+            notification_manager.notify_error(user_id, str(exc), 'literature_import')
+            return True
+        finally:
+            self._remove(job.file_path)
+
+        LiteratureImportJob.objects.filter(pk=job_id).update(
+            status=ImportStatus.COMPLETED, finished_at=timezone.now(),
+            processed_count=totals['processed'], created_count=totals['created'],
+            duplicate_count=totals['duplicates'], failed_count=totals['failed']
+        )
+        notification_manager.notify_literature_imported(user_id, totals['created'] + totals['duplicates'])
+        return True
+
+    def run_pending(self) -> int:
+        """依次执行所有等待中和已中断的任务，返回执行的任务数"""
+        job_ids = list(LiteratureImportJob.objects.filter(
+            self._claimable()
+        ).order_by('created_at').values_list('pk', flat=True))
+        return sum(1 for job_id in job_ids if self.run_job(job_id))
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# 创建全局实例
+literature_import_service = LiteratureImportService()
@@ -0,0 +1,73 @@
+import os
+from django.db import transaction
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from .chunked_upload_service import chunked_upload_service
+from .file_upload_service import file_upload_service
+from .import_service import literature_import_service
+from .models import LiteratureImportJob
+from .serializers import LiteratureImportJobSerializer
+from .utils import ApiResponse
+
+class LiteratureImportView(APIView):
+    """文献批量导入API
+
+    POST 上传 RIS / BibTeX / PubMed XML / CSV 文件（file），或引用已完成分片上传的文件（filename，
+    分片上传初始化时 type=import），
+    创建后台导入任务并立即返回；GET 获取当前用户最近的导入任务。
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def get(self, request):
+        """获取导入任务列表"""
+        jobs = LiteratureImportJob.objects.filter(user=request.user)[:20]
+        return Response(
+            ApiResponse.success(LiteratureImportJobSerializer(jobs, many=True).data),
+            status=status.HTTP_200_OK
+        )
+
+    def post(self, request):
+        """创建导入任务"""
+        file = request.FILES.get('file')
+        filename = request.data.get('filename', '')
+        file_format = request.data.get('format') or None
+
+        if file is not None:
+            result = literature_import_service.create_job(request.user, uploaded_file=file, file_format=file_format)
+        elif filename:
+            # 分片上传完成后的文件名由服务端生成，只取文件名部分防止路径穿越；只能导入自己上传的文件
+            filename = os.path.basename(filename)
+            if chunked_upload_service.file_owner(filename) != request.user.id:
+                return Response(ApiResponse.error("导入文件不存在"), status=status.HTTP_404_NOT_FOUND)
+            source_path = os.path.join(file_upload_service.upload_dir, filename)
+            result = literature_import_service.create_job(
+                request.user, source_path=source_path,
+                original_name=request.data.get('original_name') or filename, file_format=file_format
+            )
+        else:
+            return Response(ApiResponse.error("未提供导入文件"), status=status.HTTP_400_BAD_REQUEST)
+
+        if 'error' in result:
+            return Response(ApiResponse.error(result['error']), status=status.HTTP_400_BAD_REQUEST)
+
+        job = result['job']
+        transaction.on_commit(lambda: literature_import_service.start(job.pk))
+        return Response(
+            ApiResponse.success(LiteratureImportJobSerializer(job).data, "导入任务已创建"),
+            status=status.HTTP_202_ACCEPTED
+        )
+
+class LiteratureImportDetailView(APIView):
+    """文献导入任务进度API"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """获取导入任务进度"""
+        job = LiteratureImportJob.objects.filter(pk=pk, user=request.user).first()
+        if job is None:
+            return Response(ApiResponse.error("导入任务不存在"), status=status.HTTP_404_NOT_FOUND)
+        return Response(ApiResponse.success(LiteratureImportJobSerializer(job).data), status=status.HTTP_200_OK)
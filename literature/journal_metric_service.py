@@ -0,0 +1,324 @@
+import csv
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.db import transaction
+from django.db.models import Max, Q
+
+from api.response_cache import response_cache
+from .models import JournalMetric
+
+
+class JournalMetricService:
+    """期刊指标查询服务
+
+    期刊名和缩写去掉大小写、标点、重音和开头的 "The" 后存入带索引的 normalized_* 列，查询顺序：
+    1. ISSN / eISSN 精确匹配
+    2. 规范化名称或缩写精确匹配
+    3. 规范化名称前缀（索引范围扫描）
+    4. 较长关键词的子串匹配，候选数量有上限，再按相似度重排
+    排名使用 (normalized_field, year, -impact_factor) 索引，领域内排名在导入时预先计算。
+    """
+
+    ISSN_PATTERN = re.compile(r'^(\d{4})-?(\d{3}[\dX])$')
+    FUZZY_CUTOFF = 0.8
+    CANDIDATE_LIMIT = 200
+    KEYWORD_LIMIT = 3
+    BATCH_FUZZY_LIMIT = 50
+    BATCH_SIZE = 1000
+
+    # CSV 表头别名（JCR 导出、自建表格等）
+    COLUMN_ALIASES = {
+        'name': ('name', 'journal', 'journal name', 'full journal title', 'title'),
+        'abbreviation': ('abbreviation', 'abbr', 'jcr abbreviation', 'iso abbreviation', 'journal abbreviation'),
+        'issn': ('issn', 'print issn'),
+        'eissn': ('eissn', 'e-issn', 'electronic issn'),
+        'publisher': ('publisher', 'publisher name'),
+        'field': ('field', 'category', 'subject', 'jcr category'),
+        'year': ('year', 'jcr year'),
+        'impact_factor': ('impact factor', 'impact_factor', 'jif', 'journal impact factor'),
+        'quartile': ('quartile', 'jif quartile', 'jcr quartile'),
+        'total_cites': ('total cites', 'total_cites', 'total citations'),
+        'articles': ('articles', 'citable items'),
+    }
+    UPDATE_FIELDS = [
+        'name', 'abbreviation', 'normalized_abbreviation', 'issn', 'eissn', 'publisher', 'field',
+        'normalized_field', 'impact_factor', 'quartile', 'total_cites', 'articles', 'updated_at',
+    ]
+
+    def normalize_name(self, name: str) -> str:
+        """规范化期刊名或缩写：Nat. Med. / NAT MED -> nat med"""
+        name = unicodedata.normalize('NFKD', name or '')
+        name = ''.join(char for char in name if not unicodedata.combining(char)).lower()
+        name = name.replace('&', ' and ')
+        words = re.sub(r'[^0-9a-z\u4e00-\u9fff]+', ' ', name).split()
+        if len(words) > 1 and words[0] == 'the':
+            words = words[1:]
+        return ' '.join(words)
+
+    def normalize_issn(self, value: str) -> str:
+        """规范化为 1234-567X，不是 ISSN 时返回空字符串"""
+        match = self.ISSN_PATTERN.match((value or '').strip().upper())
+        return f'{match.group(1)}-{match.group(2)}' if match else ''
+
+    def normalize_field(self, field: str) -> str:
+        return ' '.join((field or '').lower().split())
+
+    def latest_year(self) -> Optional[int]:
+        return JournalMetric.objects.aggregate(year=Max('year'))['year']
+
+    def _similarity(self, normalized: str, metric: JournalMetric) -> float:
+        names = [name for name in (metric.normalized_name, metric.normalized_abbreviation) if name]
+        return max((SequenceMatcher(None, normalized, name).ratio() for name in names), default=0.0)
+
+    def _candidates(self, queryset, normalized: str, include_exact: bool = True) -> List[JournalMetric]:
+        """按精确、前缀、子串的顺序收集候选，子串匹配有数量上限"""
+        candidates = {}
+        lookups = [Q(normalized_name__gte=normalized, normalized_name__lt=normalized + '\uffff')]
+        if include_exact:
+            lookups.insert(0, Q(normalized_name=normalized) | Q(normalized_abbreviation=normalized))
+        # 任一关键词有拼写错误时仍能由其他关键词召回，一次扫描完成
+        words = sorted({word for word in normalized.split() if len(word) >= 3}, key=len, reverse=True)
+        substring = Q()
+        for word in words[:self.KEYWORD_LIMIT]:
+            substring |= Q(normalized_name__contains=word) | Q(normalized_abbreviation__contains=word)
+        if words:
+            lookups.append(substring)
+        for lookup in lookups:
+            remaining = self.CANDIDATE_LIMIT - len(candidates)
+            if remaining <= 0:
+                break
+            for metric in queryset.filter(lookup).exclude(pk__in=list(candidates))[:remaining]:
+                candidates[metric.pk] = metric
+        return list(candidates.values())
+
+    def _score(self, normalized: str, metric: JournalMetric) -> float:
+        names = [name for name in (metric.normalized_name, metric.normalized_abbreviation) if name]
+        similarity = self._similarity(normalized, metric)
+        if normalized in names:
+            return 3.0
+        if any(name.startswith(normalized) for name in names):
+            return 2.0 + similarity
+        if any(normalized in name for name in names):
+            return 1.0 + similarity
+        return similarity
+
+    def _latest_per_journal(self, metrics: Iterable[JournalMetric]) -> List[JournalMetric]:
+        latest = {}
+        for metric in metrics:
+            current = latest.get(metric.normalized_name)
+            if current is None or metric.year > current.year:
+                latest[metric.normalized_name] = metric
+        return list(latest.values())
+
+    def search(self, query: str, limit: int = 20) -> List[JournalMetric]:
+        """搜索期刊，每个期刊返回最近一年的指标"""
+        issn = self.normalize_issn(query)
+        if issn:
+            return self._latest_per_journal(JournalMetric.objects.filter(Q(issn=issn) | Q(eissn=issn)))[:limit]
+
+        normalized = self.normalize_name(query)
+        if not normalized:
+            return []
+        scored = [
+            (self._score(normalized, metric), metric)
+            for metric in self._latest_per_journal(self._candidates(JournalMetric.objects.all(), normalized))
+        ]
+        scored = [item for item in scored if item[0] >= self.FUZZY_CUTOFF]
+        scored.sort(key=lambda item: (-item[0], -(item[1].impact_factor or 0), item[1].name))
+        return [metric for _, metric in scored[:limit]]
+
+    def resolve(self, query: str, year: Optional[int] = None) -> Optional[JournalMetric]:
+        """把期刊名、缩写或 ISSN 解析为指定年份（默认最近一年）的指标
+
+        只接受精确匹配或相似度达到 FUZZY_CUTOFF 的结果，
+        不会把 "Nature Reviews Cancer" 这类名称误判为 "Nature"。
+        """
+        queryset = JournalMetric.objects.all()
+        if year is not None:
+            queryset = queryset.filter(year=year)
+
+        issn = self.normalize_issn(query)
+        if issn:
+            return queryset.filter(Q(issn=issn) | Q(eissn=issn)).order_by('-year').first()
+
+        normalized = self.normalize_name(query)
+        if not normalized:
+            return None
+        exact = queryset.filter(
+            Q(normalized_name=normalized) | Q(normalized_abbreviation=normalized)
+        ).order_by('-year').first()
+        if exact is not None:
+            return exact
+        return self._fuzzy_match(queryset, normalized)
+
+    def _fuzzy_match(self, queryset, normalized: str) -> Optional[JournalMetric]:
+        """精确匹配失败后按相似度选择最接近的期刊"""
+        best = None
+        for metric in self._candidates(queryset, normalized, include_exact=False):
+            similarity = self._similarity(normalized, metric)
+            if similarity >= self.FUZZY_CUTOFF and (best is None or (similarity, metric.year) > best[:2]):
+                best = (similarity, metric.year, metric)
+        return best[2] if best else None
+
+    def lookup_key(self, query: str) -> Optional[Tuple[str, str]]:
+        """查询的规范形式：('issn', '0028-0836') 或 ('name', 'nat med')，用于批量查询和缓存键"""
+        issn = self.normalize_issn(query)
+        if issn:
+            return 'issn', issn
+        normalized = self.normalize_name(query)
+        return ('name', normalized) if normalized else None
+
+    def resolve_many(self, queries: Iterable[str], year: Optional[int] = None) -> Dict[str, Optional[JournalMetric]]:
+        """批量解析，返回 {查询: 指标或None}
+
+        所有查询先规范化，ISSN 和名称/缩写的精确匹配合并为一次 IN 查询；
+        仍未命中的名称再逐个模糊匹配，最多 BATCH_FUZZY_LIMIT 个。
+        超出模糊匹配名额的查询不在返回结果中（没有匹配过，不能当作“未找到”缓存）。
+        """
+        keys = {query: self.lookup_key(query) for query in queries}
+        wanted = set(filter(None, keys.values()))
+        issns = {value for kind, value in wanted if kind == 'issn'}
+        names = {value for kind, value in wanted if kind == 'name'}
+
+        queryset = JournalMetric.objects.all() if year is None else JournalMetric.objects.filter(year=year)
+        found = {}
+        if issns or names:
+            exact = queryset.filter(
+                Q(issn__in=issns) | Q(eissn__in=issns)
+                | Q(normalized_name__in=names) | Q(normalized_abbreviation__in=names)
+            )
+            # 按年份升序遍历，同一期刊保留最近一年
+            for metric in exact.order_by('year', 'pk'):
+                for key in (('issn', metric.issn), ('issn', metric.eissn),
+                            ('name', metric.normalized_abbreviation), ('name', metric.normalized_name)):
+                    if key in wanted:
+                        found[key] = metric
+
+        resolved = {}
+        fuzzy_budget = self.BATCH_FUZZY_LIMIT
+        for query, key in keys.items():
+            if key is not None and key not in found and key[0] == 'name':
+                if fuzzy_budget <= 0:
+                    continue
+                fuzzy_budget -= 1
+                found[key] = self._fuzzy_match(queryset, key[1])
+            resolved[query] = found.get(key)
+        return resolved
+
+    def rankings(self, field: str = 'all', year: Optional[int] = None, limit: int = 50) -> List[JournalMetric]:
+        """按影响因子排名，year 为空时取最近一年"""
+        year = year or self.latest_year()
+        if year is None:
+            return []
+        queryset = JournalMetric.objects.filter(year=year, impact_factor__isnull=False)
+        if field and field != 'all':
+            queryset = queryset.filter(normalized_field=self.normalize_field(field))
+        return list(queryset.order_by('-impact_factor', 'name')[:limit])
+
+    def _parse_float(self, value) -> Optional[float]:
+        try:
+            return float(str(value).replace(',', '').strip())
+        except (TypeError, ValueError):
+            # "N/A"、"<0.1" 等
+            return None
+
+    def _parse_int(self, value) -> Optional[int]:
+        number = self._parse_float(value)
+        return int(number) if number is not None else None
+
+    def _map_columns(self, header: Iterable[str]) -> Dict[str, str]:
+        """CSV 表头 -> 模型字段"""
+        aliases = {alias: field for field, names in self.COLUMN_ALIASES.items() for alias in names}
+        mapping = {}
+        for column in header:
+            field = aliases.get(' '.join((column or '').strip().lower().replace('_', ' ').split()))
+            if field and field not in mapping.values():
+                mapping[column] = field
+        return mapping
+
+    def build_metric(self, row: Dict, year: Optional[int] = None) -> Optional[JournalMetric]:
+        """由一行数据（已映射为模型字段名）构造对象，缺少名称或年份时返回 None"""
+        name = (row.get('name') or '').strip()
+        metric_year = self._parse_int(row.get('year')) or year
+        if not name or not metric_year or not self.normalize_name(name):
+            return None
+        abbreviation = (row.get('abbreviation') or '').strip()
+        field = (row.get('field') or '').strip()
+        return JournalMetric(
+            name=name[:255],
+            normalized_name=self.normalize_name(name)[:255],
+            abbreviation=abbreviation[:100],
+            normalized_abbreviation=self.normalize_name(abbreviation)[:100],
+            issn=self.normalize_issn(row.get('issn')),
+            eissn=self.normalize_issn(row.get('eissn')),
+            publisher=(row.get('publisher') or '').strip()[:255],
+            field=field[:100],
+            normalized_field=self.normalize_field(field)[:100],
+            year=metric_year,
+            impact_factor=self._parse_float(row.get('impact_factor')),
+            quartile=(row.get('quartile') or '').strip().upper()[:10],
+            total_cites=self._parse_int(row.get('total_cites')),
+            articles=self._parse_int(row.get('articles')),
+        )
+
+    def _upsert(self, metrics: List[JournalMetric]):
+        JournalMetric.objects.bulk_create(
+            metrics, update_conflicts=True,
+            unique_fields=['normalized_name', 'year'], update_fields=self.UPDATE_FIELDS
+        )
+
+    def load_rows(self, rows: Iterable[Dict], year: Optional[int] = None) -> Dict:
+        """批量导入（按 规范化名称+年份 覆盖已有数据），完成后重新计算领域排名"""
+        loaded = skipped = 0
+        years = set()
+        batch = {}
+        with transaction.atomic():
+            for row in rows:
+                metric = self.build_metric(row, year)
+                if metric is None:
+                    skipped += 1
+                    continue
+                # 同一批内重复的期刊以最后一行为准
+                batch[(metric.normalized_name, metric.year)] = metric
+                years.add(metric.year)
+                if len(batch) >= self.BATCH_SIZE:
+                    self._upsert(list(batch.values()))
+                    loaded += len(batch)
+                    batch = {}
+            if batch:
+                self._upsert(list(batch.values()))
+                loaded += len(batch)
+            self.rerank(years)
+
+        # bulk_create 不触发 post_save
+        transaction.on_commit(lambda: response_cache.bump(JournalMetric))
+        return {'loaded': loaded, 'skipped': skipped, 'years': sorted(years)}
+
+    def load_csv(self, file, year: Optional[int] = None) -> Dict:
+        """从 CSV 文件对象导入，表头见 COLUMN_ALIASES"""
+        reader = csv.DictReader(file)
+        mapping = self._map_columns(reader.fieldnames or [])
+        if 'name' not in mapping.values():
+            return {'loaded': 0, 'skipped': 0, 'years': [], 'error': '缺少期刊名称列'}
+        rows = ({field: row.get(column) for column, field in mapping.items()} for row in reader)
+        return self.load_rows(rows, year)
+
+    def rerank(self, years: Iterable[int]):
+        """按领域和年份重新计算 field_rank"""
+        for year in years:
+            ranks = []
+            current_field, rank = None, 0
+            rows = JournalMetric.objects.filter(year=year).order_by(
+                'normalized_field', '-impact_factor', 'name'
+            ).values_list('pk', 'normalized_field', 'impact_factor')
+            for pk, field, impact_factor in rows.iterator(chunk_size=self.BATCH_SIZE):
+                if field != current_field:
+                    current_field, rank = field, 0
+                rank += 1
+                ranks.append(JournalMetric(pk=pk, field_rank=rank if impact_factor is not None else None))
+            JournalMetric.objects.bulk_update(ranks, ['field_rank'], batch_size=self.BATCH_SIZE)
+
+# 创建全局实例
+journal_metric_service = JournalMetricService()
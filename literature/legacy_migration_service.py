@@ -0,0 +1,144 @@
+from typing import Callable, Dict, List
+from django.db import transaction
+from django.db.models import Max
+
+from api.models import Literature as LegacyLiterature
+from .dedupe_service import literature_dedupe_service
+from .import_service import literature_import_service
+from .library_stats_service import library_stats_service
+from .models import LegacyLiteratureMapping, Literature, LiteratureUser
+
+
+class LegacyLiteratureMigrationService:
+    """把旧文献表 api.Literature 迁移到 literature.Literature
+
+    按旧表主键顺序每次处理 CHUNK_SIZE 条，每块一个事务。每条旧记录（包括被跳过的）在同一事务里写入
+    LegacyLiteratureMapping，迁移进度就是其中最大的旧ID，中断后重新运行从断点继续，已迁移的旧记录不会再处理。
+    DOI 已存在于新表（包括之前的块新建的文献）的旧记录合并到已有文献（补全上传者、分类，累加浏览和下载次数），
+    其余新建；每条旧记录的上传者都加入自己的文献库。
+    """
+
+    CHUNK_SIZE = 1000
+
+    def last_migrated_id(self) -> int:
+        return LegacyLiteratureMapping.objects.aggregate(last=Max('legacy_id'))['last'] or 0
+
+    def pending_count(self) -> int:
+        return LegacyLiterature.objects.filter(pk__gt=self.last_migrated_id()).count()
+
+    def _record(self, legacy: LegacyLiterature) -> Dict:
+        """旧记录转为导入记录格式，复用导入服务的规范化"""
+        published = legacy.publication_date
+        return literature_import_service.normalize_record({
+            'title': legacy.title,
+            'authors': legacy.authors,
+            'abstract': legacy.abstract,
+            'journal': legacy.journal,
+            # 没有发表日期的旧记录用上传年份
+            'pub_year': published.year if published else legacy.created_at.year,
+            'pub_date': published.isoformat() if published else '',
+            'volume': legacy.volume,
+            'issue': legacy.issue,
+            'pages': legacy.pages,
+            'doi': legacy.doi,
+            'keywords': legacy.keywords,
+        })
+
+    def _merge_into(self, literature: Literature, legacy: LegacyLiterature):
+        literature.uploaded_by_id = literature.uploaded_by_id or legacy.uploaded_by_id
+        literature.category = literature.category or legacy.category
+        literature.url = literature.url or legacy.url
+        literature.view_count += legacy.view_count
+        literature.download_count += legacy.download_count
+
+    def migrate_chunk(self, rows: List[LegacyLiterature]) -> Dict:
+        """迁移一块旧记录，返回本块统计"""
+        records = [(legacy, self._record(legacy)) for legacy in rows]
+        result = {'migrated': 0, 'merged': 0, 'skipped': 0}
+
+        with transaction.atomic():
+            journals = literature_import_service.resolve_journals(
+                record['journal'] for _, record in records if record is not None
+            )
+            dois = {record['doi'] for _, record in records if record is not None and record['doi']}
+            by_doi = {literature.doi: literature for literature in Literature.objects.filter(doi__in=dois)}
+
+            merged, created, owners, targets = {}, [], [], []
+            for legacy, record in records:
+                if record is None:
+                    # 无效记录也记入迁移进度，不再重复处理
+                    result['skipped'] += 1
+                    targets.append((legacy.pk, None))
+                    continue
+                target = by_doi.get(record['doi']) if record['doi'] else None
+                if target is not None:
+                    if target.pk:
+                        target.legacy_id = target.legacy_id or legacy.pk
+                        merged[target.pk] = target
+                    self._merge_into(target, legacy)
+                    result['merged'] += 1
+                else:
+                    target = Literature(
+                        **dict(record, journal=journals[record['journal']]),
+                        legacy_id=legacy.pk, url=legacy.url, category=legacy.category,
+                        file_path=legacy.file_path.name or None, uploaded_by_id=legacy.uploaded_by_id,
+                        view_count=legacy.view_count, download_count=legacy.download_count,
+                    )
+                    created.append(target)
+                    if record['doi']:
+                        # 同一块内 DOI 重复的旧记录合并到先出现的那条
+                        by_doi[record['doi']] = target
+                targets.append((legacy.pk, target))
+                owners.append((legacy.uploaded_by_id, target))
+
+            Literature.objects.bulk_create(created, batch_size=literature_import_service.BATCH_SIZE)
+            # auto_now_add 覆盖了上传时间，bulk_update 不经过 pre_save，用它写回原来的时间
+            created_at = {legacy.pk: legacy.created_at for legacy in rows}
+            for literature in created:
+                literature.created_at = created_at[literature.legacy_id]
+            Literature.objects.bulk_update(created, ['created_at'], batch_size=literature_import_service.BATCH_SIZE)
+            if merged:
+                Literature.objects.bulk_update(
+                    list(merged.values()),
+                    ['legacy_id', 'uploaded_by', 'category', 'url', 'view_count', 'download_count'],
+                    batch_size=literature_import_service.BATCH_SIZE
+                )
+                # bulk_update 不触发信号，分类可能变化，收藏了这些文献的用户统计需要重建
+                library_stats_service.invalidate_literature(list(merged))
+            # 上传者加入自己的文献库
+            LiteratureUser.objects.bulk_create(
+                [LiteratureUser(user_id=user_id, literature_id=literature.pk) for user_id, literature in owners],
+                batch_size=literature_import_service.BATCH_SIZE, ignore_conflicts=True
+            )
+            library_stats_service.invalidate({user_id for user_id, _ in owners})
+
+            LegacyLiteratureMapping.objects.bulk_create([
+                LegacyLiteratureMapping(legacy_id=legacy_id, literature_id=target.pk if target else None)
+                for legacy_id, target in targets
+            ], batch_size=literature_import_service.BATCH_SIZE)
+
+            created_ids = [literature.pk for literature in created]
+            transaction.on_commit(lambda: literature_dedupe_service.check(created_ids))
+        result['migrated'] = len(created)
+        return result
+
+    def migrate(self, chunk_size: int = None, limit: int = None,
+                progress: Callable[[Dict, int], None] = None) -> Dict:
+        """从断点开始分块迁移，limit 限制本次处理的旧记录数，progress(累计统计, 最后处理的旧ID)"""
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        totals = {'migrated': 0, 'merged': 0, 'skipped': 0}
+        last_pk, processed = self.last_migrated_id(), 0
+        while limit is None or processed < limit:
+            size = chunk_size if limit is None else min(chunk_size, limit - processed)
+            rows = list(LegacyLiterature.objects.filter(pk__gt=last_pk).order_by('pk')[:size])
+            if not rows:
+                break
+            for key, value in self.migrate_chunk(rows).items():
+                totals[key] += value
+            last_pk, processed = rows[-1].pk, processed + len(rows)
+            if progress is not None:
+                progress(totals, last_pk)
+        return totals
+
+# 创建全局实例
+legacy_literature_migration_service = LegacyLiteratureMigrationService()
@@ -0,0 +1,105 @@
+from typing import Dict, Iterable
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+from .models import LibraryStats, Literature, LiteratureUser
+
+
+class LibraryStatsService:
+    """用户文献库统计汇总服务
+
+    按加入年份、领域、期刊的计数保存在 LibraryStats（每个用户一行），仪表盘只读这一行。
+    单条加入/移除（LiteratureUser 的 post_save / post_delete 信号）在同一事务里增量更新计数；
+    批量写入（bulk_create、update）不触发信号，由调用方调用 invalidate 删除汇总，
+    文献的领域或期刊变化时删除收藏了它的用户的汇总。汇总不存在时下次读取用三个分组聚合重建。
+    """
+
+    TOP_JOURNALS = 10
+    UNCATEGORIZED = '未分类'
+
+    # ---- 计算 ----
+
+    def compute(self, user_id: int) -> Dict:
+        """全量计算一个用户的统计"""
+        rows = LiteratureUser.objects.filter(user_id=user_id)
+        yearly = rows.annotate(year=ExtractYear('created_at')).values_list('year').annotate(count=Count('id'))
+        categories = rows.values_list('literature__category').annotate(count=Count('id'))
+        journals = rows.values_list('literature__journal__name').annotate(count=Count('id'))
+        stats = {
+            'yearly': {str(year): count for year, count in yearly if year},
+            'categories': {category or '': count for category, count in categories},
+            'journals': {name or '': count for name, count in journals},
+        }
+        stats['total'] = sum(stats['yearly'].values())
+        return stats
+
+    def get(self, user_id: int) -> LibraryStats:
+        """读取用户的统计汇总，不存在时重建"""
+        stats = LibraryStats.objects.filter(user_id=user_id).first()
+        if stats is not None:
+            return stats
+        try:
+            with transaction.atomic():
+                return LibraryStats.objects.create(user_id=user_id, **self.compute(user_id))
+        except IntegrityError:
+            # 并发请求已经重建
+            return LibraryStats.objects.get(user_id=user_id)
+
+    # ---- 增量更新 ----
+
+    def _add(self, counts: Dict, key: str, delta: int):
+        count = counts.get(key, 0) + delta
+        if count > 0:
+            counts[key] = count
+        else:
+            counts.pop(key, None)
+
+    def apply(self, user_id: int, literature_id: int, created_at, delta: int):
+        """用户加入（delta=1）或移除（delta=-1）一篇文献后更新汇总，汇总不存在时不处理"""
+        with transaction.atomic():
+            stats = LibraryStats.objects.select_for_update().filter(user_id=user_id).first()
+            if stats is None:
+                return
+            literature = Literature.objects.filter(pk=literature_id).values_list('category', 'journal__name').first()
+            if literature is None or created_at is None:
+                # 无法确定计数属于哪一项，删除后重建
+                stats.delete()
+                return
+            category, journal = literature
+            self._add(stats.yearly, str(timezone.localtime(created_at).year), delta)
+            self._add(stats.categories, category or '', delta)
+            self._add(stats.journals, journal or '', delta)
+            stats.total = max(stats.total + delta, 0)
+            stats.save(update_fields=['total', 'yearly', 'categories', 'journals', 'updated_at'])
+
+    def invalidate(self, user_ids: Iterable[int]):
+        """批量写入后删除用户的汇总"""
+        LibraryStats.objects.filter(user_id__in=list(user_ids)).delete()
+
+    def invalidate_literature(self, literature_ids: Iterable[int]):
+        """文献的领域或期刊变化后删除收藏了它的用户的汇总"""
+        LibraryStats.objects.filter(user_id__in=LiteratureUser.objects.filter(
+            literature_id__in=list(literature_ids)
+        ).values('user_id')).delete()
+
+    # ---- 输出 ----
+
+    def dashboard(self, user_id: int) -> Dict:
+        """仪表盘图表数据"""
+        stats = self.get(user_id)
+        journals = sorted(stats.journals.items(), key=lambda item: -item[1])[:self.TOP_JOURNALS]
+        return {
+            'yearly_data': [
+                {'x': year, 'y': count} for year, count in sorted(stats.yearly.items(), key=lambda item: int(item[0]))
+            ],
+            'field_data': [
+                {'x': category or self.UNCATEGORIZED, 'y': count}
+                for category, count in sorted(stats.categories.items(), key=lambda item: -item[1])
+            ],
+            'journal_data': [{'x': name, 'y': count} for name, count in journals],
+        }
+
+# 创建全局实例
+library_stats_service = LibraryStatsService()
@@ -0,0 +1,78 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import User
+from literature.models import Journal, Literature, LiteratureUser
+from literature.serializers import (
+    LiteratureSerializer, LiteratureUserSerializer,
+    LiteratureListSerializer, LiteratureUserListSerializer
+)
+
+
+class Command(BaseCommand):
+    help = '对比文献列表 ModelSerializer 与 values_list() 快速路径的序列化耗时（测试数据在事务中回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='每页文献条数')
+        parser.add_argument('--repeat', type=int, default=5, help='重复次数，取最快一次')
+
+    def _best(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username='benchmark_user', email='benchmark@example.com', password='benchmark'
+            )
+            journals = Journal.objects.bulk_create([
+                Journal(name=f'Journal {i}', impact_factor=i / 10, cas_partition='1区', jcr_partition='Q1')
+                for i in range(20)
+            ])
+            literatures = Literature.objects.bulk_create([
+                Literature(
+                    title=f'Benchmark literature {i}',
+                    abstract='abstract ' * 50,
+                    authors='Zhang San, Li Si',
+                    journal=journals[i % len(journals)],
+                    pub_year=2020 + i % 5,
+                    keywords='genomics; single cell',
+                )
+                for i in range(rows)
+            ])
+            LiteratureUser.objects.bulk_create([
+                LiteratureUser(user=user, literature=literature, rating=4) for literature in literatures
+            ])
+
+            # 两种序列化器使用与列表接口相同的查询集，对比的只是序列化本身的开销
+            literature_queryset = Literature.objects.select_related('journal')
+            user_queryset = LiteratureUser.objects.filter(user=user).select_related('literature__journal', 'user')
+            cases = [
+                (
+                    '文献列表',
+                    lambda: LiteratureSerializer(literature_queryset.all(), many=True).data,
+                    lambda: LiteratureListSerializer(literature_queryset.all()).data,
+                ),
+                (
+                    '用户文献列表',
+                    lambda: LiteratureUserSerializer(user_queryset.all(), many=True).data,
+                    lambda: LiteratureUserListSerializer(user_queryset.all()).data,
+                ),
+            ]
+            for name, slow, fast in cases:
+                slow_ms = self._best(slow, repeat)
+                fast_ms = self._best(fast, repeat)
+                self.stdout.write(
+                    f'{name}（{rows} 条）: ModelSerializer {slow_ms:.1f} ms, '
+                    f'快速路径 {fast_ms:.1f} ms, 提升 {slow_ms / fast_ms:.1f} 倍'
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from literature.dedupe_service import literature_dedupe_service
+
+
+class Command(BaseCommand):
+    help = '全量扫描文献库查找疑似重复文献（PubMed 导入不做逐条查重，需要定时执行），可选自动合并高相似度的重复'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='先重算所有文献的查重指纹（修改指纹规则后使用）')
+        parser.add_argument('--merge-above', type=float, help='自动合并相似度不低于该值的待处理重复（例如 0.98）')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            updated = literature_dedupe_service.rebuild_fingerprints(only_missing=False)
+            self.stdout.write(f'重算了 {updated} 条指纹')
+
+        def progress(scanned, pairs):
+            self.stdout.write(f'已扫描 {scanned} 条，发现 {pairs} 对')
+
+        result = literature_dedupe_service.scan(progress)
+        self.stdout.write(self.style.SUCCESS(f"扫描 {result['scanned']} 条，发现疑似重复 {result['pairs']} 对"))
+
+        if options['merge_above'] is not None:
+            merged = literature_dedupe_service.merge_pending(options['merge_above'])
+            self.stdout.write(self.style.SUCCESS(f'合并了 {merged} 对重复文献'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from literature.journal_metric_service import journal_metric_service
+
+
+class Command(BaseCommand):
+    help = '从 CSV（JCR 导出等）批量导入期刊指标，已有的 期刊+年份 会被覆盖'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV 文件路径')
+        parser.add_argument('--year', type=int, help='文件中没有年份列时使用的年份')
+        parser.add_argument('--encoding', default='utf-8-sig', help='文件编码')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding=options['encoding'], newline='') as file:
+                result = journal_metric_service.load_csv(file, options['year'])
+        except OSError as exc:
+            raise CommandError(f'无法读取文件: {exc}')
+
+        if result.get('error'):
+            raise CommandError(result['error'])
+        self.stdout.write(self.style.SUCCESS(
+            f"导入 {result['loaded']} 条，跳过 {result['skipped']} 条，年份: {result['years']}"
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from literature.legacy_migration_service import legacy_literature_migration_service
+
+
+class Command(BaseCommand):
+    help = '把旧文献表 api.Literature 分批迁移到 literature.Literature，中断后重新运行从断点继续'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, help='每个事务处理的旧记录数')
+        parser.add_argument('--limit', type=int, help='本次最多处理的旧记录数')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'待迁移 {legacy_literature_migration_service.pending_count()} 条')
+
+        def progress(totals, last_id):
+            self.stdout.write(
+                f"已处理到旧ID {last_id}：新建 {totals['migrated']}，合并 {totals['merged']}，跳过 {totals['skipped']}"
+            )
+
+        totals = legacy_literature_migration_service.migrate(options['chunk_size'], options['limit'], progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"新建 {totals['migrated']} 条，合并 {totals['merged']} 条，跳过 {totals['skipped']} 条，"
+            f"剩余 {legacy_literature_migration_service.pending_count()} 条"
+        ))
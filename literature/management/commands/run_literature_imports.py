@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from literature.import_service import literature_import_service
+
+
+class Command(BaseCommand):
+    help = ('执行等待中的文献导入任务（服务重启后恢复未执行和长时间没有进度的中断任务，'
+            '或关闭 LITERATURE_IMPORT_ASYNC 时由定时任务执行）')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, help='只执行指定任务')
+
+    def handle(self, *args, **options):
+        if options['job']:
+            executed = int(literature_import_service.run_job(options['job']))
+        else:
+            executed = literature_import_service.run_pending()
+        self.stdout.write(self.style.SUCCESS(f'执行了 {executed} 个导入任务'))
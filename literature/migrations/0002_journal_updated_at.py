@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journal',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='更新时间'),
+        ),
+    ]
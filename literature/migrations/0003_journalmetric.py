@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0002_journal_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='期刊名称')),
+                ('normalized_name', models.CharField(max_length=255, verbose_name='规范化名称')),
+                ('abbreviation', models.CharField(blank=True, default='', max_length=100, verbose_name='期刊缩写')),
+                ('normalized_abbreviation', models.CharField(blank=True, default='', max_length=100, verbose_name='规范化缩写')),
+                ('issn', models.CharField(blank=True, default='', max_length=9, verbose_name='ISSN')),
+                ('eissn', models.CharField(blank=True, default='', max_length=9, verbose_name='eISSN')),
+                ('publisher', models.CharField(blank=True, default='', max_length=255, verbose_name='出版商')),
+                ('field', models.CharField(blank=True, default='', max_length=100, verbose_name='学科领域')),
+                ('normalized_field', models.CharField(blank=True, default='', max_length=100, verbose_name='规范化领域')),
+                ('year', models.IntegerField(verbose_name='年份')),
+                ('impact_factor', models.FloatField(blank=True, null=True, verbose_name='影响因子')),
+                ('quartile', models.CharField(blank=True, default='', max_length=10, verbose_name='分区')),
+                ('total_cites', models.IntegerField(blank=True, null=True, verbose_name='总被引次数')),
+                ('articles', models.IntegerField(blank=True, null=True, verbose_name='论文数')),
+                ('field_rank', models.IntegerField(blank=True, null=True, verbose_name='领域内排名')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '期刊指标',
+                'verbose_name_plural': '期刊指标',
+                'indexes': [models.Index(fields=['normalized_abbreviation'], name='literature__normali_bd7212_idx'), models.Index(fields=['issn'], name='literature__issn_370fbc_idx'), models.Index(fields=['eissn'], name='literature__eissn_7a5c8c_idx'), models.Index(fields=['normalized_field', 'year', '-impact_factor'], name='journal_metric_field_rank'), models.Index(fields=['year', '-impact_factor'], name='journal_metric_year_rank')],
+                'unique_together': {('normalized_name', 'year')},
+            },
+        ),
+    ]
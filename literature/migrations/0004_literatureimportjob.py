@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('literature', '0003_journalmetric'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='journal',
+            name='name',
+            field=models.CharField(db_index=True, max_length=255, verbose_name='期刊名称'),
+        ),
+        migrations.CreateModel(
+            name='LiteratureImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_format', models.CharField(choices=[('ris', 'RIS'), ('bibtex', 'BibTeX'), ('nlm_xml', 'PubMed/NLM XML'), ('csv', 'CSV')], max_length=20, verbose_name='文件格式')),
+                ('file_path', models.CharField(max_length=500, verbose_name='文件路径')),
+                ('original_name', models.CharField(max_length=255, verbose_name='原始文件名')),
+                ('status', models.CharField(choices=[('pending', '等待中'), ('running', '导入中'), ('completed', '已完成'), ('failed', '失败')], default='pending', max_length=20, verbose_name='状态')),
+                ('processed_count', models.IntegerField(default=0, verbose_name='已处理条数')),
+                ('created_count', models.IntegerField(default=0, verbose_name='新建文献数')),
+                ('duplicate_count', models.IntegerField(default=0, verbose_name='重复文献数')),
+                ('failed_count', models.IntegerField(default=0, verbose_name='无效记录数')),
+                ('error_message', models.TextField(blank=True, default='', verbose_name='错误信息')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='完成时间')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='literature_import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '文献导入任务',
+                'verbose_name_plural': '文献导入任务',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='literature__user_id_3fee4f_idx'), models.Index(fields=['status'], name='literature__status_1bdc60_idx')],
+            },
+        ),
+    ]
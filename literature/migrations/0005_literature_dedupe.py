@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0004_literatureimportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='literature',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='规范化标题|年份|第一作者，见 dedupe_service', max_length=255, verbose_name='查重指纹'),
+        ),
+        migrations.CreateModel(
+            name='LiteratureDuplicate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='相似度')),
+                ('status', models.CharField(choices=[('pending', '待处理'), ('dismissed', '非重复')], default='pending', max_length=20, verbose_name='状态')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('duplicate_of', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='literature.literature', verbose_name='疑似重复于')),
+                ('literature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_candidates', to='literature.literature', verbose_name='文献')),
+            ],
+            options={
+                'verbose_name': '疑似重复文献',
+                'verbose_name_plural': '疑似重复文献',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['status', '-score'], name='literature__status_3fdf68_idx')],
+                'unique_together': {('literature', 'duplicate_of')},
+            },
+        ),
+    ]
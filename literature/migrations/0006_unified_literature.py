@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('literature', '0005_literature_dedupe'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='literature',
+            name='category',
+            field=models.CharField(blank=True, default='', max_length=100, verbose_name='领域分类'),
+        ),
+        migrations.AddField(
+            model_name='literature',
+            name='download_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='下载次数'),
+        ),
+        migrations.AddField(
+            model_name='literature',
+            name='file_path',
+            field=models.FileField(blank=True, null=True, upload_to='literatures/', verbose_name='文件路径'),
+        ),
+        migrations.AddField(
+            model_name='literature',
+            name='legacy_id',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='从 api.Literature 迁移而来的记录，见 migrate_api_literature', null=True, unique=True, verbose_name='旧文献表ID'),
+        ),
+        migrations.AddField(
+            model_name='literature',
+            name='uploaded_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploaded_literatures', to=settings.AUTH_USER_MODEL, verbose_name='上传用户'),
+        ),
+        migrations.AddField(
+            model_name='literature',
+            name='url',
+            field=models.URLField(blank=True, default='', verbose_name='链接'),
+        ),
+        migrations.AddField(
+            model_name='literature',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='浏览次数'),
+        ),
+        migrations.AddIndex(
+            model_name='literature',
+            index=models.Index(fields=['created_at'], name='literature__created_0cbac0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='literature',
+            index=models.Index(fields=['category', 'created_at'], name='literature__categor_f85ab3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='literature',
+            index=models.Index(fields=['pub_year'], name='literature__pub_yea_269cfc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='literature',
+            index=models.Index(fields=['-view_count'], name='literature__view_co_730dd5_idx'),
+        ),
+    ]
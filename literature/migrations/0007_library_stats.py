@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('literature', '0006_unified_literature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LibraryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='文献数')),
+                ('yearly', models.JSONField(default=dict, verbose_name='按加入年份统计')),
+                ('categories', models.JSONField(default=dict, verbose_name='按领域统计')),
+                ('journals', models.JSONField(default=dict, verbose_name='按期刊统计')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='library_stats', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '文献库统计',
+                'verbose_name_plural': '文献库统计',
+            },
+        ),
+    ]
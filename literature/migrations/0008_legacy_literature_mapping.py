@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_mappings(apps, schema_editor):
+    # 之前的迁移只在新建的文献上记录了 legacy_id
+    Literature = apps.get_model('literature', 'Literature')
+    LegacyLiteratureMapping = apps.get_model('literature', 'LegacyLiteratureMapping')
+    LegacyLiteratureMapping.objects.bulk_create([
+        LegacyLiteratureMapping(legacy_id=legacy_id, literature_id=pk)
+        for pk, legacy_id in Literature.objects.filter(legacy_id__isnull=False).values_list('pk', 'legacy_id')
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0007_library_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LegacyLiteratureMapping',
+            fields=[
+                ('legacy_id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='旧文献表ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='迁移时间')),
+                ('literature', models.ForeignKey(blank=True, help_text='为空表示旧记录无效被跳过，或对应文献已被删除', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='legacy_mappings', to='literature.literature', verbose_name='文献')),
+            ],
+            options={
+                'verbose_name': '旧文献迁移记录',
+                'verbose_name_plural': '旧文献迁移记录',
+            },
+        ),
+        migrations.RunPython(backfill_mappings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0008_legacy_literature_mapping'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='literatureimportjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='执行中的任务长时间没有进度视为中断，可重新领取', null=True, verbose_name='最近进度时间'),
+        ),
+    ]
@@ -2,14 +2,49 @@ from django.db import models
 from api.models import User
 
 class Journal(models.Model):
-    name = models.CharField(max_length=255, verbose_name='期刊名称')
+    name = models.CharField(max_length=255, db_index=True, verbose_name='期刊名称')
     impact_factor = models.FloatField(verbose_name='影响因子', null=True, blank=True)
     cas_partition = models.CharField(max_length=50, verbose_name='中科院分区', null=True, blank=True)
     jcr_partition = models.CharField(max_length=50, verbose_name='JCR分区', null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
     
     def __str__(self):
         return self.name
 
+class JournalMetric(models.Model):
+    """期刊指标（JCR 等数据源按年份导入，见 manage.py load_journal_metrics）"""
+    name = models.CharField(max_length=255, verbose_name='期刊名称')
+    normalized_name = models.CharField(max_length=255, verbose_name='规范化名称')
+    abbreviation = models.CharField(max_length=100, blank=True, default='', verbose_name='期刊缩写')
+    normalized_abbreviation = models.CharField(max_length=100, blank=True, default='', verbose_name='规范化缩写')
+    issn = models.CharField(max_length=9, blank=True, default='', verbose_name='ISSN')
+    eissn = models.CharField(max_length=9, blank=True, default='', verbose_name='eISSN')
+    publisher = models.CharField(max_length=255, blank=True, default='', verbose_name='出版商')
+    field = models.CharField(max_length=100, blank=True, default='', verbose_name='学科领域')
+    normalized_field = models.CharField(max_length=100, blank=True, default='', verbose_name='规范化领域')
+    year = models.IntegerField(verbose_name='年份')
+    impact_factor = models.FloatField(null=True, blank=True, verbose_name='影响因子')
+    quartile = models.CharField(max_length=10, blank=True, default='', verbose_name='分区')
+    total_cites = models.IntegerField(null=True, blank=True, verbose_name='总被引次数')
+    articles = models.IntegerField(null=True, blank=True, verbose_name='论文数')
+    field_rank = models.IntegerField(null=True, blank=True, verbose_name='领域内排名')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        verbose_name = '期刊指标'
+        verbose_name_plural = '期刊指标'
+        unique_together = ('normalized_name', 'year')
+        indexes = [
+            models.Index(fields=['normalized_abbreviation']),
+            models.Index(fields=['issn']),
+            models.Index(fields=['eissn']),
+            models.Index(fields=['normalized_field', 'year', '-impact_factor'], name='journal_metric_field_rank'),
+            models.Index(fields=['year', '-impact_factor'], name='journal_metric_year_rank'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.year})'
+
 class Literature(models.Model):
     title = models.CharField(max_length=500, verbose_name='标题')
     abstract = models.TextField(verbose_name='摘要', null=True, blank=True)
@@ -23,12 +58,47 @@ class Literature(models.Model):
     doi = models.CharField(max_length=100, verbose_name='DOI', unique=True, null=True, blank=True)
     pmid = models.CharField(max_length=100, verbose_name='PMID', unique=True, null=True, blank=True)
     keywords = models.TextField(verbose_name='关键词', null=True, blank=True, help_text='多个关键词用分号分隔')
+    url = models.URLField(blank=True, default='', verbose_name='链接')
+    category = models.CharField(max_length=100, blank=True, default='', verbose_name='领域分类')
+    file_path = models.FileField(upload_to='literatures/', null=True, blank=True, verbose_name='文件路径')
+    uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='uploaded_literatures', verbose_name='上传用户')
+    view_count = models.PositiveIntegerField(default=0, verbose_name='浏览次数')
+    download_count = models.PositiveIntegerField(default=0, verbose_name='下载次数')
+    fingerprint = models.CharField(max_length=255, db_index=True, blank=True, default='', editable=False,
+                                   verbose_name='查重指纹', help_text='规范化标题|年份|第一作者，见 dedupe_service')
+    legacy_id = models.BigIntegerField(null=True, blank=True, unique=True, editable=False, verbose_name='旧文献表ID',
+                                       help_text='从 api.Literature 迁移而来的记录，见 migrate_api_literature')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['category', 'created_at']),
+            models.Index(fields=['pub_year']),
+            models.Index(fields=['-view_count']),
+        ]
     
     def __str__(self):
         return self.title
 
+class LegacyLiteratureMapping(models.Model):
+    """旧文献表 api.Literature 的迁移记录（见 legacy_migration_service），每条旧记录一行，最大的旧ID即迁移进度"""
+    legacy_id = models.BigIntegerField(primary_key=True, verbose_name='旧文献表ID')
+    literature = models.ForeignKey(Literature, on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name='legacy_mappings', verbose_name='文献',
+                                   help_text='为空表示旧记录无效被跳过，或对应文献已被删除')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='迁移时间')
+
+    class Meta:
+        verbose_name = '旧文献迁移记录'
+        verbose_name_plural = '旧文献迁移记录'
+
+    def __str__(self):
+        return f'{self.legacy_id} -> {self.literature_id}'
+
+
 class LiteratureUser(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name='用户')
     literature = models.ForeignKey(Literature, on_delete=models.CASCADE, verbose_name='文献')
@@ -43,3 +113,87 @@ class LiteratureUser(models.Model):
         
     def __str__(self):
         return f'{self.user.username} - {self.literature.title}'
+
+
+class LibraryStats(models.Model):
+    """用户文献库统计汇总（见 library_stats_service），每个用户一行"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='library_stats', verbose_name='用户')
+    total = models.PositiveIntegerField(default=0, verbose_name='文献数')
+    yearly = models.JSONField(default=dict, verbose_name='按加入年份统计')
+    categories = models.JSONField(default=dict, verbose_name='按领域统计')
+    journals = models.JSONField(default=dict, verbose_name='按期刊统计')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        verbose_name = '文献库统计'
+        verbose_name_plural = '文献库统计'
+
+    def __str__(self):
+        return f'{self.user.username} - {self.total}'
+
+
+class ImportFormat(models.TextChoices):
+    RIS = 'ris', 'RIS'
+    BIBTEX = 'bibtex', 'BibTeX'
+    NLM_XML = 'nlm_xml', 'PubMed/NLM XML'
+    CSV = 'csv', 'CSV'
+
+class ImportStatus(models.TextChoices):
+    PENDING = 'pending', '等待中'
+    RUNNING = 'running', '导入中'
+    COMPLETED = 'completed', '已完成'
+    FAILED = 'failed', '失败'
+
+class LiteratureImportJob(models.Model):
+    """文献批量导入任务（见 import_service）"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='literature_import_jobs', verbose_name='用户')
+    file_format = models.CharField(max_length=20, choices=ImportFormat.choices, verbose_name='文件格式')
+    file_path = models.CharField(max_length=500, verbose_name='文件路径')
+    original_name = models.CharField(max_length=255, verbose_name='原始文件名')
+    status = models.CharField(max_length=20, choices=ImportStatus.choices, default=ImportStatus.PENDING, verbose_name='状态')
+    processed_count = models.IntegerField(default=0, verbose_name='已处理条数')
+    created_count = models.IntegerField(default=0, verbose_name='新建文献数')
+    duplicate_count = models.IntegerField(default=0, verbose_name='重复文献数')
+    failed_count = models.IntegerField(default=0, verbose_name='无效记录数')
+    error_message = models.TextField(blank=True, default='', verbose_name='错误信息')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='开始时间')
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name='最近进度时间',
+                                        help_text='执行中的任务长时间没有进度视为中断，可重新领取')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='完成时间')
+
+    class Meta:
+        verbose_name = '文献导入任务'
+        verbose_name_plural = '文献导入任务'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f'{self.user.username} - {self.original_name} ({self.status})'
+
+class DuplicateStatus(models.TextChoices):
+    PENDING = 'pending', '待处理'
+    DISMISSED = 'dismissed', '非重复'
+
+class LiteratureDuplicate(models.Model):
+    """疑似重复的文献对（见 dedupe_service），duplicate_of 为较早创建的一条，合并后本记录随被合并文献删除"""
+    literature = models.ForeignKey(Literature, on_delete=models.CASCADE, related_name='duplicate_candidates', verbose_name='文献')
+    duplicate_of = models.ForeignKey(Literature, on_delete=models.CASCADE, related_name='+', verbose_name='疑似重复于')
+    score = models.FloatField(verbose_name='相似度')
+    status = models.CharField(max_length=20, choices=DuplicateStatus.choices, default=DuplicateStatus.PENDING, verbose_name='状态')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+
+    class Meta:
+        verbose_name = '疑似重复文献'
+        verbose_name_plural = '疑似重复文献'
+        unique_together = ('literature', 'duplicate_of')
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['status', '-score']),
+        ]
+
+    def __str__(self):
+        return f'{self.literature_id} ~ {self.duplicate_of_id} ({self.score})'
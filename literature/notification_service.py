@@ -96,6 +96,15 @@ class NotificationManager:
             {'count': count}
         )
     
+    def notify_import_progress(self, user_id: str, job_id: int, processed: int):
+        """通知文献导入进度"""
+        return self.service.send_notification(
+            user_id,
+            'literature_import_progress',
+            f'文献导入中: 已处理 {processed} 条记录',
+            {'job_id': job_id, 'processed': processed}
+        )
+    
     def notify_translation_complete(self, user_id: str, literature_id: int, language: str):
         """通知翻译完成"""
         return self.service.send_notification(
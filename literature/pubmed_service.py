@@ -23,9 +23,9 @@ class PubMedService:
             handle = Entrez.esearch(
                 db="pubmed",
                 term=query,
-                retmax=max_results,
-                retmode="json"
+                retmax=max_results
             )
+            # Entrez.read 只能解析 XML
             result = Entrez.read(handle)
             handle.close()
             return result["IdList"]
@@ -70,84 +70,89 @@ class PubMedService:
             print(f"批量获取文献失败: {e}")
             return []
     
+    def _text(self, element) -> str:
+        """元素的完整文本（包含 <i>、<sup> 等内联标签中的文字）"""
+        if element is None:
+            return ""
+        return "".join(element.itertext()).strip()
+
+    def parse_article(self, article) -> Optional[Dict]:
+        """解析单个 PubmedArticle 元素，供批量解析和流式导入共用"""
+        medline_citation = article.find('MedlineCitation')
+        if medline_citation is None:
+            return None
+
+        article_data = medline_citation.find('Article')
+        if article_data is None:
+            return None
+
+        # 解析作者
+        authors = []
+        for author in article_data.findall('AuthorList/Author'):
+            last_name = author.findtext('LastName')
+            first_name = author.findtext('ForeName')
+            if last_name:
+                authors.append(f"{first_name} {last_name}" if first_name else last_name)
+            elif author.findtext('CollectiveName'):
+                authors.append(author.findtext('CollectiveName'))
+
+        # 解析摘要（结构化摘要有多个 AbstractText）
+        abstract = "\n".join(
+            text for text in (self._text(elem) for elem in article_data.findall('Abstract/AbstractText')) if text
+        )
+
+        # 解析发表日期
+        pub_date = article_data.find('Journal/JournalIssue/PubDate')
+        pub_year = None
+        pub_month = pub_day = None
+        if pub_date is not None:
+            year_text = pub_date.findtext('Year') or pub_date.findtext('MedlineDate') or ""
+            match = re.search(r'\d{4}', year_text)
+            if match:
+                pub_year = int(match.group())
+            pub_month = pub_date.findtext('Month')
+            pub_day = pub_date.findtext('Day')
+
+        # 解析DOI
+        doi = ""
+        for elocation_id in article_data.findall('ELocationID'):
+            if elocation_id.get('EIdType') == 'doi':
+                doi = elocation_id.text or ""
+                break
+        if not doi:
+            for article_id in article.findall('PubmedData/ArticleIdList/ArticleId'):
+                if article_id.get('IdType') == 'doi':
+                    doi = article_id.text or ""
+                    break
+
+        # 解析关键词
+        keywords = [self._text(keyword) for keyword in medline_citation.findall('KeywordList/Keyword')]
+
+        return {
+            'title': self._text(article_data.find('ArticleTitle')),
+            'authors': authors,
+            'abstract': abstract,
+            'journal': article_data.findtext('Journal/Title') or "",
+            'journal_abbreviation': article_data.findtext('Journal/ISOAbbreviation') or "",
+            'pub_year': pub_year,
+            'pub_month': pub_month,
+            'pub_day': pub_day,
+            'volume': article_data.findtext('Journal/JournalIssue/Volume') or "",
+            'issue': article_data.findtext('Journal/JournalIssue/Issue') or "",
+            'pages': article_data.findtext('Pagination/MedlinePgn') or "",
+            'doi': doi,
+            'keywords': [keyword for keyword in keywords if keyword],
+            'pmid': medline_citation.findtext('PMID') or ""
+        }
+
     def parse_pubmed_xml(self, xml_data: str) -> Optional[Dict]:
         """解析PubMed XML数据"""
         try:
             root = ET.fromstring(xml_data)
-            article = root.find('.//PubmedArticle')
+            article = root if root.tag == 'PubmedArticle' else root.find('.//PubmedArticle')
             if article is None:
                 return None
-                
-            medline_citation = article.find('.//MedlineCitation')
-            if medline_citation is None:
-                return None
-                
-            article_data = medline_citation.find('.//Article')
-            if article_data is None:
-                return None
-            
-            # 解析标题
-            title = ""
-            title_elem = article_data.find('.//ArticleTitle')
-            if title_elem is not None and title_elem.text:
-                title = title_elem.text
-            
-            # 解析作者
-            authors = []
-            author_list = article_data.find('.//AuthorList')
-            if author_list is not None:
-                for author in author_list.findall('.//Author'):
-                    last_name = author.find('.//LastName')
-                    first_name = author.find('.//ForeName')
-                    if last_name is not None and last_name.text:
-                        author_name = last_name.text
-                        if first_name is not None and first_name.text:
-                            author_name = f"{first_name.text} {author_name}"
-                        authors.append(author_name)
-            
-            # 解析摘要
-            abstract = ""
-            abstract_elem = article_data.find('.//Abstract/AbstractText')
-            if abstract_elem is not None and abstract_elem.text:
-                abstract = abstract_elem.text
-            
-            # 解析期刊
-            journal = ""
-            journal_elem = article_data.find('.//Journal/Title')
-            if journal_elem is not None and journal_elem.text:
-                journal = journal_elem.text
-            
-            # 解析发表年份
-            pub_year = None
-            pub_date = article_data.find('.//Journal/JournalIssue/PubDate/Year')
-            if pub_date is not None and pub_date.text:
-                pub_year = int(pub_date.text)
-            
-            # 解析DOI
-            doi = ""
-            for elocation_id in article_data.findall('.//ELocationID'):
-                if elocation_id.get('EIdType') == 'doi':
-                    doi = elocation_id.text or ""
-                    break
-            
-            # 解析关键词
-            keywords = []
-            keyword_list = medline_citation.find('.//KeywordList')
-            if keyword_list is not None:
-                for keyword in keyword_list.findall('.//Keyword'):
-                    if keyword.text:
-                        keywords.append(keyword.text)
-            
-            return {
-                'title': title,
-                'authors': authors,
-                'abstract': abstract,
-                'journal': journal,
-                'pub_year': pub_year,
-                'doi': doi,
-                'keywords': keywords,
-                'pmid': medline_citation.find('.//PMID').text if medline_citation.find('.//PMID') is not None else ""
-            }
+            return self.parse_article(article)
             
         except Exception as e:
             print(f"解析PubMed XML失败: {e}")
@@ -157,22 +162,9 @@ class PubMedService:
         """批量解析PubMed XML数据"""
         try:
             root = ET.fromstring(xml_data)
-            articles = root.findall('.//PubmedArticle')
-            
             results = []
-            for article in articles:
-                medline_citation = article.find('.//MedlineCitation')
-                if medline_citation is None:
-                    continue
-                    
-                article_data = medline_citation.find('.//Article')
-                if article_data is None:
-                    continue
-                
-                # 使用与单个解析相同的方法
-                pmid = medline_citation.find('.//PMID').text if medline_citation.find('.//PMID') is not None else ""
-                literature_data = self.parse_pubmed_xml(ET.tostring(article).decode())
-                
+            for article in root.iter('PubmedArticle'):
+                literature_data = self.parse_article(article)
                 if literature_data:
                     results.append(literature_data)
             
@@ -1,7 +1,8 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from .import_service import literature_import_service
 from .pubmed_service import pubmed_service
 from .utils import ApiResponse
 
@@ -171,6 +172,53 @@ class PubMedBatchView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class PubMedImportView(APIView):
+    """PubMed文献导入API
+
+    POST pmids（PMID列表）或 query（检索式，max_results 限制结果数），
+    文献按 PMID 写入文献库（已存在的用 PubMed 数据更新）并加入当前用户的文献库。
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """导入PMID列表或检索结果"""
+        pmids = request.data.get('pmids') or []
+        query = (request.data.get('query') or '').strip()
+        limit = literature_import_service.PUBMED_MAX_RESULTS
+
+        if not pmids and not query:
+            return Response(
+                ApiResponse.error("请提供PMID列表或检索式"),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not isinstance(pmids, list) or len(pmids) > limit:
+            return Response(
+                ApiResponse.error(f"PMID必须为列表，且单次最多导入{limit}篇"),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            max_results = max(int(request.data.get('max_results', 100)), 1)
+        except (TypeError, ValueError):
+            return Response(
+                ApiResponse.error("max_results 格式错误"),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            result = literature_import_service.import_from_pubmed(
+                request.user, pmids=pmids, query=query or None, max_results=max_results
+            )
+        except Exception as e:
+            return Response(
+                ApiResponse.error(f"导入PubMed文献失败: {str(e)}"),
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return Response(
+            ApiResponse.success(result, f"成功导入 {result['linked']} 篇文献"),
+            status=status.HTTP_200_OK
+        )
+
 class PubMedStatsView(APIView):
     """PubMed搜索统计API"""
     permission_classes = [AllowAny]
@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from .models import Journal, Literature, LiteratureUser
+from .models import Journal, Literature, LiteratureUser, LiteratureImportJob
 from api.serializers import UserRegistrationSerializer
+from api.projection import FieldProjectionMixin, project_names
 
 class JournalSerializer(serializers.ModelSerializer):
     class Meta:
@@ -13,13 +14,14 @@ class JournalSerializer(serializers.ModelSerializer):
             'jcr_partition': {'help_text': 'JCR分区'},
         }
 
-class LiteratureSerializer(serializers.ModelSerializer):
+class LiteratureSerializer(FieldProjectionMixin, serializers.ModelSerializer):
     journal_info = JournalSerializer(source='journal', read_only=True)
     
     class Meta:
         model = Literature
-        fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        # 查重指纹、迁移标记和服务器文件路径不对外暴露
+        exclude = ('fingerprint', 'legacy_id', 'file_path')
+        read_only_fields = ('created_at', 'updated_at', 'uploaded_by', 'view_count', 'download_count')
         extra_kwargs = {
             'title': {'help_text': '文献标题'},
             'abstract': {'help_text': '文献摘要'},
@@ -34,13 +36,8 @@ class LiteratureSerializer(serializers.ModelSerializer):
             'pmid': {'help_text': 'PMID'},
             'keywords': {'help_text': '关键词，多个关键词用分号分隔'},
         }
-        
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation['journal_info'] = JournalSerializer(instance.journal).data
-        return representation
 
-class LiteratureUserSerializer(serializers.ModelSerializer):
+class LiteratureUserSerializer(FieldProjectionMixin, serializers.ModelSerializer):
     literature_info = LiteratureSerializer(source='literature', read_only=True)
     user_info = UserRegistrationSerializer(source='user', read_only=True)
     
@@ -54,11 +51,138 @@ class LiteratureUserSerializer(serializers.ModelSerializer):
             'notes': {'help_text': '备注'},
             'is_favorite': {'help_text': '是否收藏'},
         }
-        
-
-        
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation['literature_info'] = LiteratureSerializer(instance.literature).data
-        representation['user_info'] = UserRegistrationSerializer(instance.user).data
-        return representation
\ No newline at end of file
+
+
+class LiteratureImportJobSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = LiteratureImportJob
+        exclude = ('file_path', 'user')
+        read_only_fields = [field.name for field in LiteratureImportJob._meta.fields]
+
+
+class ValuesListSerializer:
+    """基于 values_list() 的轻量只读列表序列化器
+
+    列表接口不经过 ModelSerializer 的逐字段处理：用 values_list() 一次取出
+    所需的列（关联表通过 JOIN，不实例化模型），直接拼装与对应 ModelSerializer 结构相同的字典。
+    FIELDS 中每项为 (输出字段, 查询列, 格式化函数)，?fields= / ?exclude= 裁剪后
+    只查询保留字段需要的列。
+    """
+
+    FIELDS = ()
+
+    def __init__(self, queryset, fields=None, exclude=()):
+        self.queryset = queryset
+        self.names = project_names([name for name, _, _ in self.FIELDS], fields, set(exclude))
+
+    @classmethod
+    def plan(cls, names=None, prefix=''):
+        """返回 (查询列, 每个字段在行中的位置与格式化函数)"""
+        columns, steps = [], []
+        for name, lookups, formatter in cls.FIELDS:
+            if names is not None and name not in names:
+                continue
+            start = len(columns)
+            columns.extend(prefix + lookup for lookup in lookups)
+            steps.append((name, start, len(columns), formatter))
+        return columns, steps
+
+    @staticmethod
+    def make_builder(steps):
+        def build(row):
+            item = {}
+            for name, start, end, formatter in steps:
+                if formatter is None:
+                    item[name] = row[start]
+                else:
+                    item[name] = formatter(row[start:end])
+            return item
+        return build
+
+    @property
+    def data(self):
+        columns, steps = self.plan(self.names)
+        build = self.make_builder(steps)
+        return [build(row) for row in self.queryset.values_list(*columns)]
+
+
+_date_field = serializers.DateField()
+_datetime_field = serializers.DateTimeField()
+
+
+def _date(values):
+    return _date_field.to_representation(values[0]) if values[0] else None
+
+
+def _datetime(values):
+    return _datetime_field.to_representation(values[0]) if values[0] else None
+
+
+def _journal_info(values):
+    journal_id, name, impact_factor, cas_partition, jcr_partition, updated_at = values
+    return {
+        'id': journal_id,
+        'name': name,
+        'impact_factor': impact_factor,
+        'cas_partition': cas_partition,
+        'jcr_partition': jcr_partition,
+        'updated_at': _datetime_field.to_representation(updated_at) if updated_at else None,
+    }
+
+
+def _user_info(values):
+    username, email, nickname = values
+    return {'username': username, 'email': email, 'nickname': nickname}
+
+
+class LiteratureListSerializer(ValuesListSerializer):
+    """文献列表的轻量只读序列化器，结构与 LiteratureSerializer 相同"""
+
+    FIELDS = (
+        ('id', ['id'], None),
+        ('journal_info', [
+            'journal_id', 'journal__name', 'journal__impact_factor',
+            'journal__cas_partition', 'journal__jcr_partition', 'journal__updated_at'
+        ], _journal_info),
+        ('title', ['title'], None),
+        ('abstract', ['abstract'], None),
+        ('authors', ['authors'], None),
+        ('pub_year', ['pub_year'], None),
+        ('pub_date', ['pub_date'], _date),
+        ('volume', ['volume'], None),
+        ('issue', ['issue'], None),
+        ('pages', ['pages'], None),
+        ('doi', ['doi'], None),
+        ('pmid', ['pmid'], None),
+        ('keywords', ['keywords'], None),
+        ('url', ['url'], None),
+        ('category', ['category'], None),
+        ('view_count', ['view_count'], None),
+        ('download_count', ['download_count'], None),
+        ('created_at', ['created_at'], _datetime),
+        ('updated_at', ['updated_at'], _datetime),
+        ('journal', ['journal_id'], None),
+        ('uploaded_by', ['uploaded_by_id'], None),
+    )
+
+
+_literature_columns, _literature_steps = LiteratureListSerializer.plan(prefix='literature__')
+
+
+class LiteratureUserListSerializer(ValuesListSerializer):
+    """用户文献列表的轻量只读序列化器，结构与 LiteratureUserSerializer 相同"""
+
+    FIELDS = (
+        ('id', ['id'], None),
+        ('literature_info', _literature_columns, ValuesListSerializer.make_builder(_literature_steps)),
+        ('user_info', ['user__username', 'user__email', 'user__nickname'], _user_info),
+        ('rating', ['rating'], None),
+        ('notes', ['notes'], None),
+        ('is_favorite', ['is_favorite'], None),
+        ('created_at', ['created_at'], _datetime),
+        ('updated_at', ['updated_at'], _datetime),
+        ('user', ['user_id'], None),
+        ('literature', ['literature_id'], None),
+    )
@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from api.response_cache import response_cache
+
+from .dedupe_service import literature_dedupe_service
+from .library_stats_service import library_stats_service
+from .models import Journal, JournalMetric, Literature, LiteratureUser
+
+
+# 期刊列表、期刊检索和排名的响应缓存随数据变化失效
+response_cache.watch(Journal, JournalMetric)
+
+
+@receiver(pre_save, sender=Literature)
+def update_fingerprint(sender, instance, **kwargs):
+    """保存前重算查重指纹（bulk_create 的调用方需要自己设置）"""
+    fingerprint = literature_dedupe_service.fingerprint(instance.title, instance.authors, instance.pub_year)
+    instance._fingerprint_changed = fingerprint != instance.fingerprint
+    instance.fingerprint = fingerprint
+
+
+@receiver(post_save, sender=Literature)
+def check_duplicates(sender, instance, created, **kwargs):
+    """新增文献或标题、作者、年份变化后检查疑似重复"""
+    if created or getattr(instance, '_fingerprint_changed', False):
+        literature_id = instance.pk
+        transaction.on_commit(lambda: literature_dedupe_service.check([literature_id]))
+
+
+@receiver(pre_save, sender=Literature)
+def track_library_fields(sender, instance, update_fields=None, **kwargs):
+    """记录领域或期刊是否变化，变化后用户文献库统计需要重建"""
+    instance._library_fields_changed = False
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not {'category', 'journal'} & set(update_fields):
+        return
+    old = Literature.objects.filter(pk=instance.pk).values_list('category', 'journal_id').first()
+    instance._library_fields_changed = old is not None and old != (instance.category, instance.journal_id)
+
+
+@receiver(post_save, sender=Literature)
+def invalidate_library_stats(sender, instance, created, **kwargs):
+    if getattr(instance, '_library_fields_changed', False):
+        library_stats_service.invalidate_literature([instance.pk])
+
+
+@receiver(post_save, sender=LiteratureUser)
+def add_to_library_stats(sender, instance, created, **kwargs):
+    """单条加入文献库时增量更新统计（bulk_create 的调用方需要调用 invalidate）"""
+    if created:
+        library_stats_service.apply(instance.user_id, instance.literature_id, instance.created_at, 1)
+
+
+@receiver(post_delete, sender=LiteratureUser)
+def remove_from_library_stats(sender, instance, **kwargs):
+    library_stats_service.apply(instance.user_id, instance.literature_id, instance.created_at, -1)
@@ -1,3 +1,832 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from api.models import User, Literature as LegacyLiterature
+from .dedupe_service import literature_dedupe_service
+from .chunked_upload_service import chunked_upload_service
+from .file_upload_service import file_upload_service
+from .legacy_migration_service import legacy_literature_migration_service
+from .library_stats_service import library_stats_service
+from .journal_metric_service import journal_metric_service
+from .import_parsers import parse_bibtex, parse_csv, parse_nlm_xml, parse_ris
+from .import_service import literature_import_service
+from .pubmed_service import pubmed_service
+from .models import (
+    Journal, JournalMetric, Literature, LiteratureUser, LiteratureImportJob, LiteratureDuplicate, DuplicateStatus,
+    LegacyLiteratureMapping, LibraryStats
+)
+from .serializers import (
+    LiteratureSerializer, LiteratureUserSerializer,
+    LiteratureListSerializer, LiteratureUserListSerializer
+)
+
+
+class ChunkedUploadTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.upload_dir = tempfile.mkdtemp()
+        patcher = mock.patch.object(file_upload_service, 'upload_dir', self.upload_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.upload_dir, True)
+        self.content = b'%PDF-1.4 ' + b'x' * 2500
+
+    def init_upload(self, file_hash=None):
+        response = self.client.post('/api/literature/upload/chunked/', {
+            'filename': 'paper.pdf',
+            'file_size': len(self.content),
+            'file_hash': file_hash if file_hash is not None else hashlib.md5(self.content).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['data']['upload_id']
+
+    def put_chunk(self, upload_id, offset, chunk):
+        return self.client.generic(
+            'PUT', f'/api/literature/upload/chunked/{upload_id}/', chunk,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_chunked_upload_resume_and_complete(self):
+        """测试分片上传、断点查询与完成校验"""
+        upload_id = self.init_upload()
+
+        response = self.put_chunk(upload_id, 0, self.content[:1000])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['offset'], 1000)
+
+        # 偏移量错误时返回当前偏移量，客户端据此续传
+        response = self.put_chunk(upload_id, 0, self.content[:1000])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['data']['offset'], 1000)
+
+        response = self.client.get(f'/api/literature/upload/chunked/{upload_id}/')
+        offset = response.data['data']['offset']
+        self.put_chunk(upload_id, offset, self.content[offset:])
+
+        response = self.client.post(f'/api/literature/upload/chunked/{upload_id}/complete/')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        file_info = response.data['data']
+        self.assertEqual(file_info['file_hash'], hashlib.md5(self.content).hexdigest())
+        with open(file_info['file_path'], 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        response = self.client.get(f'/api/literature/upload/chunked/{upload_id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_complete_rejects_incomplete_or_corrupted_upload(self):
+        """测试未上传完整或哈希不一致时拒绝完成"""
+        upload_id = self.init_upload(file_hash='0' * 32)
+        self.put_chunk(upload_id, 0, self.content[:100])
+
+        response = self.client.post(f'/api/literature/upload/chunked/{upload_id}/complete/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['data']['offset'], 100)
+
+        self.put_chunk(upload_id, 100, self.content[100:])
+        response = self.client.post(f'/api/literature/upload/chunked/{upload_id}/complete/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_session_is_limited_to_its_user(self):
+        """测试登录用户的上传会话不能被其他用户续传、完成或取消"""
+        owner = User.objects.create_user(username='uploader', email='uploader@example.com', password='pass12345')
+        other = User.objects.create_user(username='intruder', email='intruder@example.com', password='pass12345')
+        self.client.force_authenticate(owner)
+        upload_id = self.init_upload()
+
+        self.client.force_authenticate(other)
+        url = f'/api/literature/upload/chunked/{upload_id}/'
+        self.assertEqual(self.put_chunk(upload_id, 0, self.content[:100]).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.post(f'{url}complete/').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(owner)
+        self.put_chunk(upload_id, 0, self.content)
+        response = self.client.post(f'{url}complete/')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(chunked_upload_service.file_owner(response.data['data']['filename']), owner.id)
+
+
+class LiteratureListSerializerTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        journal = Journal.objects.create(name='Nature', impact_factor=64.8, cas_partition='1区', jcr_partition='Q1')
+        for i in range(3):
+            literature = Literature.objects.create(
+                title=f'文献{i}', authors='张三', journal=journal, pub_year=2024,
+                pub_date='2024-01-0%d' % (i + 1), doi=f'10.1000/{i}'
+            )
+            LiteratureUser.objects.create(user=self.user, literature=literature, rating=5)
+
+    def test_fast_path_matches_model_serializer(self):
+        """测试快速路径与 ModelSerializer 输出一致"""
+        literatures = Literature.objects.order_by('pk')
+        self.assertEqual(
+            LiteratureListSerializer(literatures).data,
+            [dict(item) for item in LiteratureSerializer(literatures, many=True).data]
+        )
+        links = LiteratureUser.objects.order_by('pk')
+        expected = LiteratureUserSerializer(links, many=True).data
+        for item in expected:
+            item['literature_info'] = dict(item['literature_info'])
+        self.assertEqual(LiteratureUserListSerializer(links).data, [dict(item) for item in expected])
+
+    def test_list_endpoints_use_single_query(self):
+        """测试列表接口只执行一次数据查询"""
+        # 条件请求校验器 + 列表数据
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/literature/literatures/')
+        self.assertEqual(len(response.data['data']), 3)
+        self.assertEqual(response.data['data'][0]['journal_info']['name'], 'Nature')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/literature/literature-users/')
+        self.assertEqual(response.data['data'][0]['user_info']['username'], 'reader')
+
+    def test_list_projection(self):
+        """测试文献列表 ?fields= / ?exclude= 只查询保留字段的列"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/literature/literatures/', {'fields': 'id,title,journal_info'})
+        self.assertEqual(set(response.data['data'][0]), {'id', 'title', 'journal_info'})
+        self.assertNotIn('abstract', context[0]['sql'])
+
+        response = self.client.get('/api/literature/literature-users/', {'exclude': 'literature_info,user_info'})
+        self.assertNotIn('literature_info', response.data['data'][0])
+        self.assertEqual(response.data['data'][0]['rating'], 5)
+
+    def test_conditional_get(self):
+        """测试期刊和文献列表的 ETag，Last-Modified 只用于详情"""
+        response = self.client.get('/api/literature/journals/')
+        # 删除行不改变 max(updated_at)，列表只依靠包含行数的 ETag
+        self.assertNotIn('Last-Modified', response)
+        future = http_date(time.time() + 3600)
+        self.assertEqual(
+            self.client.get('/api/literature/journals/', HTTP_IF_MODIFIED_SINCE=future).status_code, status.HTTP_200_OK
+        )
+        detail_url = f'/api/literature/literatures/{Literature.objects.first().pk}/'
+        self.assertIn('Last-Modified', self.client.get(detail_url))
+        response = self.client.get(detail_url, HTTP_IF_MODIFIED_SINCE=future)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get('/api/literature/journals/')
+        response = self.client.get('/api/literature/journals/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+        etag = self.client.get('/api/literature/literatures/')['ETag']
+        self.assertNotEqual(self.client.get('/api/literature/literatures/', {'page': 2})['ETag'], etag)
+        Journal.objects.update(name='Nature Genetics', updated_at=timezone.now() + timedelta(seconds=1))
+        response = self.client.get('/api/literature/literatures/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'][0]['journal_info']['name'], 'Nature Genetics')
+
+    def test_journal_list_response_cache(self):
+        """测试期刊列表的响应缓存：命中时只剩校验器查询，期刊保存后失效"""
+        self.client.get('/api/literature/journals/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/literature/journals/')
+        self.assertEqual(response.data['data'][0]['name'], 'Nature')
+
+        journal = Journal.objects.get()
+        journal.name = 'Nature Genetics'
+        journal.save()
+        response = self.client.get('/api/literature/journals/')
+        self.assertEqual(response.data['data'][0]['name'], 'Nature Genetics')
+
+
+JOURNAL_METRICS_CSV = """Full Journal Title,JCR Abbreviation,ISSN,eISSN,Category,Journal Impact Factor,JIF Quartile,Total Citations,Citable Items
+Nature,NATURE,0028-0836,1476-4687,Multidisciplinary,64.8,Q1,"800,000",850
+Nature Medicine,NAT MED,1078-8956,1546-170X,Medicine,87.2,Q1,"120,000",300
+Nature Reviews Cancer,NAT REV CANCER,1474-175X,1474-1768,Oncology,78.5,Q1,"60,000",120
+The Lancet,LANCET,0140-6736,1474-547X,Medicine,168.9,Q1,"400,000",500
+Journal of Obscure Results,J OBSCURE RES,,,Medicine,N/A,,,
+"""
+
+
+class JournalMetricTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='metric', email='metric@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            result = journal_metric_service.load_csv(io.StringIO(JOURNAL_METRICS_CSV), year=2023)
+        self.assertEqual((result['loaded'], result['skipped']), (5, 0))
+
+    def test_resolve(self):
+        """测试按名称、缩写、ISSN 和近似名称解析期刊"""
+        resolve = journal_metric_service.resolve
+        self.assertEqual(resolve('nature medicine').name, 'Nature Medicine')
+        self.assertEqual(resolve('Nat. Med.').name, 'Nature Medicine')
+        self.assertEqual(resolve('1546170x').name, 'Nature Medicine')
+        self.assertEqual(resolve('Lancet').name, 'The Lancet')
+        self.assertEqual(resolve('Nature Medcine').name, 'Nature Medicine')
+        # 不再按子串把其他期刊误判为 Nature
+        self.assertIsNone(resolve('Nature Reviews Immunology'))
+        self.assertIsNone(resolve('Nature', year=2022))
+
+    def test_rankings_and_reload(self):
+        """测试领域排名和重复导入覆盖"""
+        ranked = journal_metric_service.rankings('medicine')
+        self.assertEqual([metric.name for metric in ranked], ['The Lancet', 'Nature Medicine'])
+        self.assertEqual([metric.field_rank for metric in ranked], [1, 2])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            journal_metric_service.load_rows([
+                {'name': 'Nature Medicine', 'field': 'Medicine', 'impact_factor': '200'}
+            ], year=2023)
+        self.assertEqual(JournalMetric.objects.filter(year=2023).count(), 5)
+        ranked = journal_metric_service.rankings('Medicine', year=2023)
+        self.assertEqual([metric.name for metric in ranked], ['Nature Medicine', 'The Lancet'])
+
+    def test_api(self):
+        """测试期刊检索、影响因子和排名接口，重新导入后缓存失效"""
+        response = self.client.get('/api/journals/search_journal/', {'query': 'nature'})
+        self.assertEqual(response.data['results'][0]['name'], 'Nature')
+        self.assertEqual(response.data['count'], 3)
+
+        response = self.client.get('/api/journals/get_impact_factor/', {'journal': 'NAT MED', 'year': 2023})
+        self.assertEqual(response.data['impact_factor'], 87.2)
+        self.assertEqual(response.data['cites_per_article'], 400.0)
+
+        response = self.client.get('/api/journals/get_journal_rankings/', {'field': 'medicine'})
+        self.assertEqual([item['name'] for item in response.data['rankings']], ['The Lancet', 'Nature Medicine'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            journal_metric_service.load_rows(
+                [{'name': 'Nature Medicine', 'abbreviation': 'NAT MED', 'impact_factor': '90.1'}], year=2023
+            )
+        response = self.client.get('/api/journals/get_impact_factor/', {'journal': 'NAT MED', 'year': 2023})
+        self.assertEqual(response.data['impact_factor'], 90.1)
+
+    def test_batch_query(self):
+        """测试批量查询：精确匹配一次查询完成，重复查询全部命中缓存"""
+        journals = ['Nature', 'nat. med.', '0140-6736', 'Nature Medcine', 'Unknown Journal'] * 100
+        with self.assertNumQueries(5):
+            # 一次精确匹配的 IN 查询，两个不同的未命中名称各两次模糊匹配查询
+            response = self.client.post(
+                '/api/journals/batch_query/', {'journals': journals, 'year': 2023}, format='json'
+            )
+        self.assertEqual(response.data['count'], 500)
+        results = response.data['results']
+        self.assertEqual([item['journal'] for item in results[:5]],
+                         ['Nature', 'Nature Medicine', 'The Lancet', 'Nature Medicine', 'Unknown Journal'])
+        self.assertIn('error', results[4])
+        self.assertEqual(results[1]['query'], 'nat. med.')
+
+        with self.assertNumQueries(0):
+            self.client.post('/api/journals/batch_query/', {'journals': journals, 'year': 2023}, format='json')
+
+    def test_batch_query_does_not_cache_names_over_fuzzy_budget(self):
+        """测试超出模糊匹配名额的名称不被缓存为未找到"""
+        def batch(journals):
+            response = self.client.post('/api/journals/batch_query/', {'journals': journals, 'year': 2023}, format='json')
+            return response.data['results']
+
+        with mock.patch.object(journal_metric_service, 'BATCH_FUZZY_LIMIT', 1):
+            results = batch(['Unknown Journal', 'Nature Medcine'])
+        self.assertIn('error', results[1])
+        self.assertEqual(batch(['Nature Medcine'])[0]['journal'], 'Nature Medicine')
+
+
+RIS_SAMPLE = """TY  - JOUR
+TI  - Deep learning for protein
+      structure prediction
+AU  - Smith, John
+AU  - Wang, Li
+JO  - Nat Med
+T2  - Nature Medicine
+PY  - 2023/05/17/
+VL  - 29
+SP  - 100
+EP  - 110
+DO  - https://doi.org/10.1000/ABC
+KW  - protein
+ER  - 
+TY  - JOUR
+TI  - No year record
+ER  - 
+"""
+
+BIBTEX_SAMPLE = """@comment{ignored}
+@article{smith2023,
+  title = {Deep learning for {protein} structure prediction},
+  author = {Smith, John and Li Wang},
+  journal = "Nature Medicine",
+  year = 2023,
+  pages = {100--110},
+  doi = {10.1000/abc},
+}
+@article(lee2022, title={Another (short) study}, author={Lee, Ann}, journal={Cell}, year={2022})
+"""
+
+NLM_XML_SAMPLE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<PubmedArticleSet>
+<PubmedArticle><MedlineCitation><PMID>123456</PMID><Article>
+<Journal><JournalIssue><Volume>12</Volume><PubDate><Year>2021</Year><Month>Mar</Month><Day>5</Day></PubDate></JournalIssue>
+<Title>Cell</Title><ISOAbbreviation>Cell</ISOAbbreviation></Journal>
+<ArticleTitle>Single-cell <i>atlas</i> of the lung.</ArticleTitle>
+<Pagination><MedlinePgn>1-9</MedlinePgn></Pagination>
+<Abstract><AbstractText Label="BACKGROUND">First.</AbstractText><AbstractText>Second.</AbstractText></Abstract>
+<AuthorList><Author><LastName>Lee</LastName><ForeName>Ann</ForeName></Author></AuthorList>
+</Article></MedlineCitation></PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+class LiteratureImportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='importer', email='importer@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.upload_dir = tempfile.mkdtemp()
+        patcher = mock.patch.object(file_upload_service, 'upload_dir', self.upload_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.upload_dir, True)
+
+    def test_parsers(self):
+        """测试四种格式解析为统一记录"""
+        ris = list(parse_ris(io.StringIO(RIS_SAMPLE)))
+        self.assertEqual(ris[0]['title'], 'Deep learning for protein structure prediction')
+        self.assertEqual(ris[0]['authors'], ['Smith, John', 'Wang, Li'])
+        self.assertEqual((ris[0]['journal'], ris[0]['pages']), ('Nature Medicine', '100-110'))
+
+        bib = list(parse_bibtex(io.StringIO(BIBTEX_SAMPLE)))
+        self.assertEqual(len(bib), 2)
+        self.assertEqual(bib[0]['title'], 'Deep learning for protein structure prediction')
+        self.assertEqual(bib[0]['authors'], ['John Smith', 'Li Wang'])
+        self.assertEqual((bib[0]['pages'], bib[1]['title']), ('100-110', 'Another (short) study'))
+
+        xml = list(parse_nlm_xml(io.BytesIO(NLM_XML_SAMPLE)))
+        self.assertEqual(xml[0]['title'], 'Single-cell atlas of the lung.')
+        self.assertEqual((xml[0]['pmid'], xml[0]['abstract']), ('123456', 'First.\nSecond.'))
+
+        rows = list(parse_csv(io.StringIO('Title,Authors,Year,DOI\nPaper,"Lee A; Kim B",2020,10.1/x\n')))
+        self.assertEqual(rows[0]['authors'], ['Lee A', 'Kim B'])
+
+    def test_import_records_dedupes(self):
+        """测试按 doi/pmid 去重、期刊批量创建，并加入用户文献库"""
+        journal = Journal.objects.create(name='Cell')
+        existing = Literature.objects.create(title='已有文献', authors='Lee', journal=journal, pub_year=2021,
+                                             pmid='123456')
+        records = list(parse_ris(io.StringIO(RIS_SAMPLE))) + list(parse_bibtex(io.StringIO(BIBTEX_SAMPLE))) \
+            + list(parse_nlm_xml(io.BytesIO(NLM_XML_SAMPLE)))
+
+        with mock.patch.object(literature_import_service, 'CHUNK_SIZE', 3):
+            totals = literature_import_service.import_records(records, self.user)
+
+        self.assertEqual(totals, {'processed': 5, 'created': 2, 'duplicates': 2, 'failed': 1})
+        created = Literature.objects.get(doi='10.1000/abc')
+        self.assertEqual((created.pub_date.isoformat(), created.journal.name), ('2023-05-17', 'Nature Medicine'))
+        self.assertEqual(Journal.objects.filter(name='Cell').count(), 1)
+        self.assertEqual(
+            set(LiteratureUser.objects.filter(user=self.user).values_list('literature__title', flat=True)),
+            {'Deep learning for protein structure prediction', 'Another (short) study', existing.title}
+        )
+
+    def test_pubmed_import_upserts(self):
+        """测试 PubMed 导入按 PMID 批量更新/创建，并认领同 DOI 的已有文献"""
+        journal = Journal.objects.create(name='Cell')
+        stale = Literature.objects.create(title='旧标题', authors='Lee', journal=journal, pub_year=2020, pmid='1',
+                                          abstract='已有摘要', volume='9', doi='10.1/keep')
+        no_doi = Literature.objects.create(title='没有DOI', authors='Park', journal=journal, pub_year=2020, pmid='3')
+        by_doi = Literature.objects.create(title='RIS导入', authors='Kim', journal=journal, pub_year=2021,
+                                           doi='10.1/b')
+
+        def fetch(pmids):
+            return [{'pmid': pmid, 'title': f'Article {pmid}', 'authors': ['A B'], 'journal': 'Cell',
+                     'pub_year': '2022', 'pub_month': 'Mar', 'doi': {'2': '10.1/b', '3': '10.1/c'}.get(pmid, '')}
+                    for pmid in pmids]
+
+        pmids = [str(pmid) for pmid in range(1, 251)]
+        with mock.patch.object(pubmed_service, 'search_literatures', return_value=pmids) as search, \
+                mock.patch.object(pubmed_service, 'fetch_literatures_batch', side_effect=fetch) as fetch_batch:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/api/literature/pubmed/import/',
+                                            {'query': 'lung', 'max_results': 250}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        search.assert_called_once_with('lung', 250)
+        self.assertEqual(fetch_batch.call_count, 2)
+        self.assertEqual(response.data['data'], {'requested': 250, 'fetched': 250, 'created': 247,
+                                                 'updated': 3, 'linked': 250})
+        # 期刊、PMID、DOI、认领、upsert、补 DOI、回查主键、用户文献库、两次统计汇总失效，与结果数无关
+        # （SQLite 单条语句的参数个数有限，upsert 和用户文献库各拆成几条 INSERT）
+        self.assertLessEqual(len(queries), 18)
+
+        stale.refresh_from_db()
+        by_doi.refresh_from_db()
+        self.assertEqual((stale.title, stale.pub_date.isoformat()), ('Article 1', '2022-03-01'))
+        # PubMed 没有返回的字段不覆盖已有值，DOI 只补不改
+        self.assertEqual((stale.abstract, stale.volume, stale.doi), ('已有摘要', '9', '10.1/keep'))
+        no_doi.refresh_from_db()
+        self.assertEqual(no_doi.doi, '10.1/c')
+        self.assertEqual((by_doi.pmid, by_doi.title), ('2', 'Article 2'))
+        self.assertEqual(Literature.objects.count(), 250)
+        self.assertEqual(LiteratureUser.objects.filter(user=self.user).count(), 250)
+
+        response = self.client.post('/api/literature/pubmed/import/', {'pmids': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with mock.patch.object(pubmed_service, 'search_literatures', return_value=['1']) as search, \
+                mock.patch.object(pubmed_service, 'fetch_literatures_batch', side_effect=fetch):
+            response = self.client.post('/api/literature/pubmed/import/',
+                                        {'query': 'lung', 'max_results': -5}, format='json')
+        search.assert_called_once_with('lung', 1)
+        self.assertEqual(response.data['data']['requested'], 1)
+
+    @override_settings(LITERATURE_IMPORT_ASYNC=False)
+    def test_import_job_api(self):
+        """测试上传文件创建导入任务并查询进度"""
+        upload = SimpleUploadedFile('library.ris', RIS_SAMPLE.encode('utf-8'))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/literature/imports/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        response = self.client.get(f"/api/literature/imports/{response.data['data']['id']}/")
+        job = response.data['data']
+        self.assertEqual((job['status'], job['created_count'], job['failed_count']), ('completed', 1, 1))
+        self.assertFalse(os.listdir(os.path.join(self.upload_dir, 'imports')))
+
+        response = self.client.post(
+            '/api/literature/imports/', {'file': SimpleUploadedFile('library.docx', b'x')}, format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(LITERATURE_IMPORT_ASYNC=False)
+    def test_import_chunked_upload_requires_owner(self):
+        """测试分片上传导入文件后按文件名导入：只能导入自己上传的文件，导入时复制而不移走原文件"""
+        content = RIS_SAMPLE.encode('utf-8')
+        response = self.client.post('/api/literature/upload/chunked/', {
+            'filename': 'library.ris', 'file_size': len(content), 'type': 'import',
+            'file_hash': hashlib.md5(content).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        url = f"/api/literature/upload/chunked/{response.data['data']['upload_id']}/"
+        response = self.client.generic('PUT', url, content, content_type='application/offset+octet-stream',
+                                       HTTP_UPLOAD_OFFSET='0')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(f'{url}complete/')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        filename = response.data['data']['filename']
+
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        self.client.force_authenticate(other)
+        response = self.client.post('/api/literature/imports/', {'filename': filename}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/literature/imports/', {
+                'filename': f'../{filename}', 'original_name': 'library.ris'
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = LiteratureImportJob.objects.get()
+        self.assertEqual((job.status, job.created_count, job.original_name), ('completed', 1, 'library.ris'))
+        self.assertTrue(os.path.exists(os.path.join(self.upload_dir, filename)))
+
+        response = self.client.post('/api/literature/upload/chunked/', {
+            'filename': 'library.txt', 'file_size': 10, 'type': 'import'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_run_pending_reclaims_stale_running_jobs(self):
+        """测试长时间没有进度的执行中任务被重新领取"""
+        paths = []
+        for name in ('stale.ris', 'active.ris'):
+            paths.append(os.path.join(self.upload_dir, name))
+            with open(paths[-1], 'w', encoding='utf-8') as file:
+                file.write(RIS_SAMPLE)
+        stale_at = timezone.now() - timedelta(minutes=literature_import_service.STALE_JOB_MINUTES + 1)
+        stale = LiteratureImportJob.objects.create(user=self.user, file_format='ris', file_path=paths[0],
+                                                   status='running', started_at=stale_at, heartbeat_at=stale_at)
+        active = LiteratureImportJob.objects.create(user=self.user, file_format='ris', file_path=paths[1],
+                                                    status='running', started_at=timezone.now(),
+                                                    heartbeat_at=timezone.now())
+        self.assertEqual(literature_import_service.run_pending(), 1)
+        stale.refresh_from_db()
+        active.refresh_from_db()
+        self.assertEqual((stale.status, stale.created_count), ('completed', 1))
+        self.assertEqual(active.status, 'running')
+
+
+class LiteratureExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='exporter', email='exporter@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        journal = Journal.objects.create(name='Nature Medicine')
+        for index in range(3):
+            literature = Literature.objects.create(
+                title=f'Paper {index}', authors='John Smith, Li Wang', journal=journal, pub_year=2020 + index,
+                pages='100-110', doi=f'10.1000/{index}', pmid=str(1000 + index), keywords='AI; {protein}',
+                abstract='Line one.\nLine two.'
+            )
+            LiteratureUser.objects.create(user=self.user, literature=literature, is_favorite=index == 0)
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        LiteratureUser.objects.create(user=other, literature=Literature.objects.create(
+            title='Other', authors='X', journal=journal, pub_year=2020
+        ))
+
+    def export(self, **params):
+        response = self.client.get('/api/literature/literature-users/export/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_export_formats_round_trip(self):
+        """测试导出的 CSV / RIS / BibTeX 可以被导入解析器读回"""
+        content = self.export(export_format='csv', ordering='created_at').decode('utf-8-sig')
+        rows = list(parse_csv(io.StringIO(content)))
+        self.assertEqual([row['title'] for row in rows], ['Paper 0', 'Paper 1', 'Paper 2'])
+        self.assertEqual((rows[0]['authors'], rows[0]['keywords']), (['John Smith', 'Li Wang'], ['AI', '{protein}']))
+
+        ris = list(parse_ris(io.StringIO(self.export(export_format='ris').decode('utf-8'))))
+        self.assertEqual(len(ris), 3)
+        self.assertEqual((ris[0]['pages'], ris[0]['abstract']), ('100-110', 'Line one. Line two.'))
+
+        bib = list(parse_bibtex(io.StringIO(self.export(export_format='bibtex', is_favorite='true').decode('utf-8'))))
+        self.assertEqual(len(bib), 1)
+        self.assertEqual((bib[0]['title'], bib[0]['pages'], bib[0]['pmid']), ('Paper 0', '100-110', '1000'))
+
+    def test_export_jsonl_gzip(self):
+        """测试 JSONL 导出和 gzip 压缩"""
+        content = gzip.decompress(self.export(export_format='jsonl', gzip='true'))
+        rows = [json.loads(line) for line in content.decode('utf-8').splitlines()]
+        self.assertEqual({row['title'] for row in rows}, {'Paper 0', 'Paper 1', 'Paper 2'})
+        self.assertEqual(rows[0]['authors'], ['John Smith', 'Li Wang'])
+
+        response = self.client.get('/api/literature/literature-users/export/', {'export_format': 'docx'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LiteratureDedupeTest(TestCase):
+    def setUp(self):
+        self.journal = Journal.objects.create(name='Nature')
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com', password='pass12345')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com', password='pass12345')
+
+    def create(self, title, authors, pub_year, **fields):
+        return Literature.objects.create(title=title, authors=authors, journal=self.journal, pub_year=pub_year, **fields)
+
+    def test_incremental_check_and_merge(self):
+        """测试新增文献时发现疑似重复，合并后用户文献库记录转移"""
+        original = self.create('Deep learning for protein structure prediction', 'John Smith, Li Wang', 2023,
+                               doi='10.1000/abc')
+        self.create('Protein folding in the cell membrane', 'John Smith', 2023)
+        LiteratureUser.objects.create(user=self.alice, literature=original, notes='原始')
+        with self.captureOnCommitCallbacks(execute=True):
+            duplicate = self.create('Deep Learning for Protein-Structure Prediction.', 'Smith J', 2024, pmid='99')
+        LiteratureUser.objects.create(user=self.alice, literature=duplicate, rating=5, notes='预印本')
+        LiteratureUser.objects.create(user=self.bob, literature=duplicate, is_favorite=True)
+
+        pair = LiteratureDuplicate.objects.get()
+        self.assertEqual((pair.literature_id, pair.duplicate_of_id), (duplicate.pk, original.pk))
+        self.assertGreaterEqual(pair.score, literature_dedupe_service.THRESHOLD)
+
+        result = literature_dedupe_service.merge(original.pk, duplicate.pk)
+        self.assertEqual((result['moved_users'], result['filled_fields']), (2, ['pmid']))
+        self.assertFalse(Literature.objects.filter(pk=duplicate.pk).exists())
+        self.assertEqual(Literature.objects.get(pk=original.pk).pmid, '99')
+        alice_row = LiteratureUser.objects.get(user=self.alice)
+        self.assertEqual((alice_row.literature_id, alice_row.rating, alice_row.notes), (original.pk, 5, '原始\n\n预印本'))
+        self.assertTrue(LiteratureUser.objects.get(user=self.bob, literature=original).is_favorite)
+        self.assertFalse(LiteratureDuplicate.objects.exists())
+
+    def test_merge_keeps_migrated_fields(self):
+        """测试合并迁移来的重复文献时保留文件、上传者、分类和计数，旧文献ID指向保留的文献"""
+        original = self.create('Deep learning for protein structure prediction', 'John Smith', 2023,
+                               doi='10.1000/abc', view_count=3)
+        duplicate = self.create('Deep Learning for Protein-Structure Prediction.', 'Smith J', 2023,
+                                legacy_id=7, url='https://example.com/paper', category='生物信息',
+                                file_path='literatures/paper.pdf', uploaded_by=self.alice,
+                                view_count=5, download_count=2)
+        LegacyLiteratureMapping.objects.create(legacy_id=7, literature=duplicate)
+
+        result = literature_dedupe_service.merge(original.pk, duplicate.pk)
+        self.assertEqual(result['filled_fields'], ['url', 'category', 'file_path', 'uploaded_by', 'legacy_id'])
+        original.refresh_from_db()
+        self.assertEqual(
+            (original.url, original.category, original.file_path.name, original.uploaded_by_id, original.legacy_id),
+            ('https://example.com/paper', '生物信息', 'literatures/paper.pdf', self.alice.pk, 7)
+        )
+        self.assertEqual((original.view_count, original.download_count), (8, 2))
+        self.assertEqual(LegacyLiteratureMapping.objects.get(legacy_id=7).literature_id, original.pk)
+
+    def test_batch_check_reads_each_block_once(self):
+        """测试批量检查按块读取邻居，查询数与块数有关而与文献数无关"""
+        title = 'Single-cell atlas of the human lung in health and disease'
+        literatures = Literature.objects.bulk_create([
+            Literature(title=f'{title} part {i}', authors='Ann Lee', journal=self.journal, pub_year=2022,
+                       fingerprint=literature_dedupe_service.fingerprint(f'{title} part {i}', 'Ann Lee', 2022))
+            for i in range(20)
+        ] + [
+            Literature(title='Protein folding in the cell membrane', authors='Bo Chen', journal=self.journal,
+                       pub_year=2022,
+                       fingerprint=literature_dedupe_service.fingerprint('Protein folding in the cell membrane',
+                                                                         'Bo Chen', 2022))
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            found = literature_dedupe_service.check([literature.pk for literature in literatures])
+        # 读取文献一次，两个块各两次（写入疑似重复对在 SQLite 上按参数上限拆成几条）
+        self.assertEqual(sum(query['sql'].startswith('SELECT') for query in queries.captured_queries), 5)
+        self.assertGreater(found, 0)
+        self.assertFalse(LiteratureDuplicate.objects.filter(
+            literature__title__startswith='Protein').exists())
+
+    def test_scan_and_merge_pending(self):
+        """测试全量扫描补算指纹、跳过已标记非重复的文献对并自动合并"""
+        title = 'Single-cell atlas of the human lung in health and disease'
+        Literature.objects.bulk_create([
+            Literature(title=title, authors='Ann Lee', journal=self.journal, pub_year=2022),
+            Literature(title=title + '.', authors='Lee A', journal=self.journal, pub_year=2022),
+            Literature(title=title, authors='Ann Lee', journal=self.journal, pub_year=2015),
+            Literature(title='Errata', authors='Ann Lee', journal=self.journal, pub_year=2022),
+            Literature(title='Single-cell atlas of the mouse brain', authors='Bo Chen', journal=self.journal,
+                       pub_year=2022),
+            Literature(title=title, authors='Zed Zhou', journal=self.journal, pub_year=2022,
+                       doi='10.1000/other'),
+        ])
+        first, second = Literature.objects.order_by('pk')[:2]
+        LiteratureDuplicate.objects.create(literature=second, duplicate_of=first, score=0.99,
+                                           status=DuplicateStatus.DISMISSED)
+
+        with mock.patch.object(literature_dedupe_service, 'WINDOW', 3):
+            result = literature_dedupe_service.scan()
+        self.assertEqual(result['scanned'], 6)
+        self.assertFalse(Literature.objects.filter(fingerprint='').exists())
+        self.assertEqual(LiteratureDuplicate.objects.get(literature=second).status, DuplicateStatus.DISMISSED)
+        # 年份相差太远、作者不同的同名文献不算重复
+        self.assertEqual(LiteratureDuplicate.objects.filter(status=DuplicateStatus.PENDING).count(), 0)
+
+        LiteratureDuplicate.objects.all().update(status=DuplicateStatus.PENDING)
+        self.assertEqual(literature_dedupe_service.merge_pending(0.95), 1)
+        self.assertEqual(Literature.objects.count(), 5)
+
+
+class LegacyLiteratureMigrationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='uploader', email='uploader@example.com', password='pass12345')
+        self.existing = Literature.objects.create(
+            title='Deep learning for protein structure prediction', authors='John Smith',
+            journal=Journal.objects.create(name='Nature'), pub_year=2023, doi='10.1000/abc'
+        )
+        self.legacy = [
+            LegacyLiterature.objects.create(
+                title='旧表文献', authors='张三, 李四', journal='中国科学', category='生物信息',
+                publication_date=date(2022, 3, 1), uploaded_by=self.user, view_count=7, download_count=2
+            ),
+            LegacyLiterature.objects.create(
+                title='Deep learning for protein structure prediction', authors='John Smith', doi='DOI:10.1000/ABC',
+                category='人工智能', uploaded_by=self.user, view_count=5, download_count=1
+            ),
+            LegacyLiterature.objects.create(title='', authors='无标题', category='其他', uploaded_by=self.user),
+        ]
+        old = timezone.now() - timedelta(days=400)
+        LegacyLiterature.objects.filter(pk=self.legacy[0].pk).update(created_at=old)
+
+    def test_migrate_is_chunked_and_resumable(self):
+        """测试分块迁移、按 DOI 合并、保留上传时间，中断后继续且不重复"""
+        totals = legacy_literature_migration_service.migrate(chunk_size=1, limit=1)
+        self.assertEqual(totals, {'migrated': 1, 'merged': 0, 'skipped': 0})
+
+        totals = legacy_literature_migration_service.migrate(chunk_size=1)
+        self.assertEqual(totals, {'migrated': 0, 'merged': 1, 'skipped': 1})
+        self.assertEqual(legacy_literature_migration_service.migrate(), {'migrated': 0, 'merged': 0, 'skipped': 0})
+        self.assertEqual(legacy_literature_migration_service.pending_count(), 0)
+
+        migrated = Literature.objects.get(legacy_id=self.legacy[0].pk)
+        self.assertEqual((migrated.journal.name, migrated.pub_year, migrated.category), ('中国科学', 2022, '生物信息'))
+        self.assertLess(migrated.created_at, timezone.now() - timedelta(days=399))
+        self.existing.refresh_from_db()
+        self.assertEqual((self.existing.legacy_id, self.existing.view_count, self.existing.category),
+                         (self.legacy[1].pk, 5, '人工智能'))
+        self.assertEqual(Literature.objects.count(), 2)
+        self.assertEqual(LiteratureUser.objects.filter(user=self.user).count(), 2)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/statistics/', {}, format='json')
+        data = response.data['data']
+        self.assertEqual((data['totalLiterature'], data['totalViews']), (1, 5))
+        self.assertEqual(sum(day['count'] for day in data['weeklyUploads']), 1)
+
+    def test_doi_duplicates_across_chunks_are_merged(self):
+        """测试 DOI 相同的旧记录分在不同块时也合并计数并关联上传者"""
+        other = User.objects.create_user(username='second', email='second@example.com', password='pass12345')
+        LegacyLiterature.objects.all().delete()
+        first = LegacyLiterature.objects.create(title='同一篇文献', authors='张三', doi='10.1000/dup',
+                                                uploaded_by=self.user, view_count=5)
+        LegacyLiterature.objects.create(title='同一篇文献', authors='张三', doi='10.1000/dup',
+                                        uploaded_by=other, view_count=7)
+
+        totals = legacy_literature_migration_service.migrate(chunk_size=1)
+        self.assertEqual(totals, {'migrated': 1, 'merged': 1, 'skipped': 0})
+        self.assertEqual(legacy_literature_migration_service.migrate(), {'migrated': 0, 'merged': 0, 'skipped': 0})
+        literature = Literature.objects.get(doi='10.1000/dup')
+        self.assertEqual((literature.legacy_id, literature.view_count), (first.pk, 12))
+        self.assertEqual(set(literature.literatureuser_set.values_list('user__username', flat=True)),
+                         {'uploader', 'second'})
+
+
+class LibraryStatsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='pass12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        nature, cell = Journal.objects.create(name='Nature'), Journal.objects.create(name='Cell')
+        self.literatures = [
+            Literature.objects.create(title=f'Library paper {i}', authors='Zhang San', pub_year=2020,
+                                      journal=(nature, cell)[i % 2], category=('', '基因组学')[i % 2])
+            for i in range(4)
+        ]
+        for literature in self.literatures[:3]:
+            LiteratureUser.objects.create(user=self.user, literature=literature)
+
+    def dashboard(self):
+        response = self.client.get('/api/research/charts/statistics_data/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['data']
+
+    def assertStatsCurrent(self):
+        stats = LibraryStats.objects.get(user=self.user)
+        computed = library_stats_service.compute(self.user.pk)
+        self.assertEqual((stats.total, stats.yearly, stats.categories, stats.journals),
+                         (computed['total'], computed['yearly'], computed['categories'], computed['journals']))
+
+    def test_dashboard_reads_summary(self):
+        """测试统计汇总按需重建，之后只读一行"""
+        data = self.dashboard()
+        year = str(timezone.now().year)
+        self.assertEqual(data['yearly_data'], [{'x': year, 'y': 3}])
+        self.assertEqual(data['field_data'], [{'x': '未分类', 'y': 2}, {'x': '基因组学', 'y': 1}])
+        self.assertEqual(data['journal_data'], [{'x': 'Nature', 'y': 2}, {'x': 'Cell', 'y': 1}])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.dashboard(), data)
+        self.assertLessEqual(len(queries), 2)
+
+    def test_summary_follows_library_changes(self):
+        """测试加入、移除、修改文献和批量导入后统计保持正确"""
+        library_stats_service.get(self.user.pk)
+
+        LiteratureUser.objects.create(user=self.user, literature=self.literatures[3])
+        self.assertStatsCurrent()
+        LiteratureUser.objects.filter(literature=self.literatures[0]).delete()
+        self.assertStatsCurrent()
+        self.literatures[2].delete()
+        self.assertStatsCurrent()
+
+        # 修改领域后汇总失效，下次读取重建
+        self.literatures[1].category = '免疫学'
+        self.literatures[1].save()
+        self.assertFalse(LibraryStats.objects.filter(user=self.user).exists())
+        self.assertIn({'x': '免疫学', 'y': 1}, self.dashboard()['field_data'])
+        self.assertStatsCurrent()
+
+        literature_import_service.upsert_pubmed_records([
+            {'pmid': '123', 'title': 'Imported paper', 'authors': 'Li Si', 'journal': 'Science', 'pub_year': 2021}
+        ], self.user)
+        self.assertIn({'x': 'Science', 'y': 1}, self.dashboard()['journal_data'])
+        self.assertStatsCurrent()
+
+    def test_bulk_updates_invalidate_other_users(self):
+        """测试 PubMed 更新和旧表合并修改已有文献后，收藏了它的其他用户统计也重建"""
+        reader = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        Literature.objects.filter(pk=self.literatures[1].pk).update(pmid='321')
+        Literature.objects.filter(pk=self.literatures[2].pk).update(doi='10.1000/merged')
+        for literature in self.literatures[1:3]:
+            LiteratureUser.objects.create(user=reader, literature=literature)
+
+        library_stats_service.get(reader.pk)
+        literature_import_service.upsert_pubmed_records([
+            {'pmid': '321', 'title': 'Library paper 1', 'authors': 'Zhang San', 'journal': 'Science', 'pub_year': 2020}
+        ], self.user)
+        self.assertFalse(LibraryStats.objects.filter(user=reader).exists())
+        self.assertIn('Science', library_stats_service.get(reader.pk).journals)
+
+        LegacyLiterature.objects.create(title='Library paper 2', authors='Zhang San', doi='10.1000/merged',
+                                        category='免疫学', uploaded_by=self.user)
+        legacy_literature_migration_service.migrate()
+        self.assertIn('免疫学', library_stats_service.get(reader.pk).categories)
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import JournalListCreateView, JournalRetrieveUpdateDestroyView, LiteratureListCreateView, LiteratureRetrieveUpdateDestroyView, LiteratureUserListCreateView, LiteratureUserRetrieveUpdateDestroyView
-from .pubmed_views import PubMedSearchView, PubMedDetailView, PubMedBatchView, PubMedStatsView
+from .views import JournalListCreateView, JournalRetrieveUpdateDestroyView, LiteratureListCreateView, LiteratureRetrieveUpdateDestroyView, LiteratureUserListCreateView, LiteratureUserExportView, LiteratureUserRetrieveUpdateDestroyView
+from .pubmed_views import PubMedSearchView, PubMedDetailView, PubMedBatchView, PubMedImportView, PubMedStatsView
 from .translation_views import TranslationView, LiteratureTranslationView, BatchTranslationView, TranslationConfigView
-from .file_upload_views import FileUploadView, FileListView, FileDeleteView, FileUploadConfigView
+from .file_upload_views import FileUploadView, FileListView, FileDeleteView, FileUploadConfigView, ChunkedUploadInitView, ChunkedUploadView, ChunkedUploadCompleteView
 from .notification_views import NotificationListView, NotificationReadView, NotificationUnreadCountView, NotificationTestView
+from .import_views import LiteratureImportView, LiteratureImportDetailView
 
 urlpatterns = [
     path('journals/', JournalListCreateView.as_view(), name='journal-list-create'),
@@ -11,12 +12,18 @@ urlpatterns = [
     path('literatures/', LiteratureListCreateView.as_view(), name='literature-list-create'),
     path('literatures/<int:pk>/', LiteratureRetrieveUpdateDestroyView.as_view(), name='literature-detail'),
     path('literature-users/', LiteratureUserListCreateView.as_view(), name='literature-user-list-create'),
+    path('literature-users/export/', LiteratureUserExportView.as_view(), name='literature-user-export'),
     path('literature-users/<int:pk>/', LiteratureUserRetrieveUpdateDestroyView.as_view(), name='literature-user-detail'),
     
+    # Bulk Import API
+    path('imports/', LiteratureImportView.as_view(), name='literature-import'),
+    path('imports/<int:pk>/', LiteratureImportDetailView.as_view(), name='literature-import-detail'),
+    
     # PubMed API
     path('pubmed/search/', PubMedSearchView.as_view(), name='pubmed-search'),
     path('pubmed/detail/<str:pmid>/', PubMedDetailView.as_view(), name='pubmed-detail'),
     path('pubmed/batch/', PubMedBatchView.as_view(), name='pubmed-batch'),
+    path('pubmed/import/', PubMedImportView.as_view(), name='pubmed-import'),
     path('pubmed/stats/', PubMedStatsView.as_view(), name='pubmed-stats'),
     
     # Translation API
@@ -30,6 +37,9 @@ urlpatterns = [
     path('upload/files/', FileListView.as_view(), name='file-list'),
     path('upload/files/<str:filename>/', FileDeleteView.as_view(), name='file-delete'),
     path('upload/config/', FileUploadConfigView.as_view(), name='file-upload-config'),
+    path('upload/chunked/', ChunkedUploadInitView.as_view(), name='chunked-upload-init'),
+    path('upload/chunked/<str:upload_id>/', ChunkedUploadView.as_view(), name='chunked-upload'),
+    path('upload/chunked/<str:upload_id>/complete/', ChunkedUploadCompleteView.as_view(), name='chunked-upload-complete'),
     
     # Notification API
     path('notifications/', NotificationListView.as_view(), name='notification-list'),
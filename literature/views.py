@@ -2,11 +2,20 @@ from rest_framework import generics, status
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.db.models import Max
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from .models import Journal, Literature, LiteratureUser
-from .serializers import JournalSerializer, LiteratureSerializer, LiteratureUserSerializer
+from .serializers import (
+    JournalSerializer, LiteratureSerializer, LiteratureUserSerializer,
+    LiteratureListSerializer, LiteratureUserListSerializer
+)
 from api.utils import ApiResponse
+from api.projection import parse_projection
+from api.conditional import ConditionalGetMixin
+from api.response_cache import response_cache
+from .export_service import literature_export_service
 
 # Journal views
 @extend_schema_view(
@@ -21,7 +30,7 @@ from api.utils import ApiResponse
         description='创建一个新的期刊记录'
     )
 )
-class JournalListCreateView(generics.ListCreateAPIView):
+class JournalListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     期刊列表接口
 
@@ -31,6 +40,7 @@ class JournalListCreateView(generics.ListCreateAPIView):
     queryset = Journal.objects.all()
     serializer_class = JournalSerializer
 
+    @response_cache.cached(models=[Journal], scope='public')
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         serializer = self.get_serializer(queryset, many=True)
@@ -64,7 +74,7 @@ class JournalListCreateView(generics.ListCreateAPIView):
         description='删除指定的期刊记录'
     )
 )
-class JournalRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class JournalRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     期刊详情接口
 
@@ -107,7 +117,7 @@ class JournalRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         description='创建一个新的文献记录'
     )
 )
-class LiteratureListCreateView(generics.ListCreateAPIView):
+class LiteratureListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     文献列表接口
 
@@ -122,15 +132,22 @@ class LiteratureListCreateView(generics.ListCreateAPIView):
     ordering_fields = ['pub_year', 'created_at', 'updated_at']
     ordering = ['-created_at']
 
+    def get_conditional_aggregates(self, is_detail):
+        aggregates = super().get_conditional_aggregates(is_detail)
+        aggregates['journal_modified'] = Max('journal__updated_at')
+        return aggregates
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
+        # 列表走 values_list() 快速路径，不实例化模型，只查询 ?fields= 需要的列
+        fields, exclude = parse_projection(request)
+        serializer = LiteratureListSerializer(queryset, fields, exclude)
         return ApiResponse.success(serializer.data, "获取文献列表成功")
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        serializer.save(uploaded_by=request.user if request.user.is_authenticated else None)
         return ApiResponse.created(serializer.data, "文献创建成功")
 
 @extend_schema_view(
@@ -155,7 +172,7 @@ class LiteratureListCreateView(generics.ListCreateAPIView):
         description='删除指定的文献记录'
     )
 )
-class LiteratureRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class LiteratureRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     文献详情接口
 
@@ -164,9 +181,14 @@ class LiteratureRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView)
     PATCH  /api/literature/literatures/{id}/    部分更新文献
     DELETE /api/literature/literatures/{id}/    删除文献
     """
-    queryset = Literature.objects.all()
+    queryset = Literature.objects.select_related('journal')
     serializer_class = LiteratureSerializer
 
+    def get_conditional_aggregates(self, is_detail):
+        aggregates = super().get_conditional_aggregates(is_detail)
+        aggregates['journal_modified'] = Max('journal__updated_at')
+        return aggregates
+
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -214,11 +236,12 @@ class LiteratureUserListCreateView(generics.ListCreateAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return LiteratureUser.objects.filter(user=self.request.user)
+        return LiteratureUser.objects.filter(user=self.request.user).select_related('literature__journal', 'user')
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
+        fields, exclude = parse_projection(request)
+        serializer = LiteratureUserListSerializer(queryset, fields, exclude)
         return ApiResponse.success(serializer.data, "获取用户文献列表成功")
 
     def create(self, request, *args, **kwargs):
@@ -227,6 +250,48 @@ class LiteratureUserListCreateView(generics.ListCreateAPIView):
         serializer.save(user=request.user)
         return ApiResponse.created(serializer.data, "用户文献关联创建成功")
 
+@extend_schema(
+    operation_id='导出用户文献库',
+    summary='导出用户文献库',
+    description='以 CSV / RIS / BibTeX / JSONL 流式导出当前用户的文献库，gzip=true 时输出 gzip 压缩文件'
+)
+class LiteratureUserExportView(generics.GenericAPIView):
+    """
+    用户文献库导出接口
+
+    GET    /api/literature/literature-users/export/?export_format=csv&gzip=true
+
+    支持与列表接口相同的筛选、搜索和排序参数。
+    （格式参数不用 format，避免与 DRF 的 URL 格式后缀冲突）
+    """
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['literature__journal', 'rating', 'is_favorite']
+    search_fields = ['literature__title', 'literature__authors', 'notes']
+    ordering_fields = ['created_at', 'updated_at', 'rating']
+    ordering = ['-created_at']
+
+    def get_queryset(self):
+        return LiteratureUser.objects.filter(user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'csv').lower()
+        compress = request.query_params.get('gzip', '').lower() in ('1', 'true', 'yes')
+        if export_format not in literature_export_service.FORMATS:
+            return ApiResponse.error(
+                f"不支持的导出格式，可选：{', '.join(literature_export_service.FORMATS)}",
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            literature_export_service.stream(queryset, export_format, compress),
+            content_type=literature_export_service.content_type(export_format, compress)
+        )
+        filename = literature_export_service.filename(export_format, compress)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
 @extend_schema_view(
     get=extend_schema(
         operation_id='获取用户文献详情',
@@ -262,7 +327,7 @@ class LiteratureUserRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIV
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return LiteratureUser.objects.filter(user=self.request.user)
+        return LiteratureUser.objects.filter(user=self.request.user).select_related('literature__journal', 'user')
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()